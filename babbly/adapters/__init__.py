@@ -1,3 +1,3 @@
-from .base import BabblyAdapter
+from .base import AdapterReport, BabblyAdapter
 
-__all__ = ["BabblyAdapter"]
+__all__ = ["AdapterReport", "BabblyAdapter"]
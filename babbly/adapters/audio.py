@@ -0,0 +1,42 @@
+from typing import Callable, Iterable, Optional
+
+from babbly.adapters.base import BabblyAdapter
+from babbly.audio.ring import AudioQueueStats
+from babbly.core import Observation
+
+
+class AudioHealthAdapter(BabblyAdapter):
+    """Report Babbly's own microphone queue as a situation source.
+
+    Queue drops and device xruns mean recognition ran on incomplete audio, so
+    any increase since the previous collection is reported as a warning.
+    """
+
+    name = "audio"
+
+    def __init__(self, stats_provider: Callable[[], Optional[AudioQueueStats]]):
+        self.stats_provider = stats_provider
+        self._last: Optional[AudioQueueStats] = None
+
+    def observations(self) -> Iterable[Observation]:
+        stats = self.stats_provider()
+        if stats is None:
+            return []
+        last, self._last = self._last, stats
+        dropped = stats.overflows - (last.overflows if last else 0)
+        xruns = stats.xruns - (last.xruns if last else 0)
+        if dropped > 0 or xruns > 0:
+            summary = f"microphone lost audio: {dropped} chunks dropped, {xruns} xruns"
+            severity = "warning"
+        else:
+            summary = f"microphone queue {stats.depth}/{stats.capacity} chunks"
+            severity = "info"
+        return [
+            Observation(
+                source=self.name,
+                category="audio.capture",
+                summary=summary,
+                severity=severity,
+                data={**stats.to_dict(), "new_overflows": dropped, "new_xruns": xruns},
+            )
+        ]
@@ -1,6 +1,6 @@
-from typing import Callable, Iterable, Mapping, Optional
+from typing import Callable, Iterable, List, Mapping, Optional
 
-from babbly.adapters.base import BabblyAdapter
+from babbly.adapters.base import AdapterReport, BabblyAdapter
 from babbly.core import Observation, Recommendation
 
 
@@ -20,8 +20,21 @@ class AzazelAdapter(BabblyAdapter):
         payload = self.status_provider()
         return payload if isinstance(payload, Mapping) else {}
 
-    def observations(self) -> Iterable[Observation]:
+    def collect(self) -> AdapterReport:
+        """Translate one status fetch into observations and recommendations."""
         payload = self._payload()
+        return AdapterReport(
+            observations=tuple(self._observations_from(payload)),
+            recommendations=tuple(self._recommendations_from(payload)),
+        )
+
+    def observations(self) -> Iterable[Observation]:
+        return self._observations_from(self._payload())
+
+    def recommendations(self) -> Iterable[Recommendation]:
+        return self._recommendations_from(self._payload())
+
+    def _observations_from(self, payload: Mapping[str, object]) -> List[Observation]:
         observations = []
 
         system = str(payload.get("system", "azazel"))
@@ -55,8 +68,7 @@ class AzazelAdapter(BabblyAdapter):
             )
         return observations
 
-    def recommendations(self) -> Iterable[Recommendation]:
-        payload = self._payload()
+    def _recommendations_from(self, payload: Mapping[str, object]) -> List[Recommendation]:
         system = str(payload.get("system", "azazel"))
         recommendations = []
         for item in payload.get("recommendations", []) or []:
@@ -193,9 +193,9 @@ def translate_edge_state(payload: Mapping[str, object]) -> Dict[str, object]:
 class AzazelEdgeStatusProvider:
     """Bounded, cached GET provider for Azazel-Edge ``/api/state``.
 
-    Repeated calls inside one SituationEngine collection are served from a short
-    monotonic TTL cache, preventing the observation and recommendation passes
-    from issuing duplicate HTTP requests.
+    ``AzazelAdapter.collect()`` issues one call per SituationEngine collection.
+    A short monotonic TTL cache additionally deduplicates callers that still ask
+    for observations and recommendations separately.
     """
 
     def __init__(
@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Iterable, Tuple
 
 from babbly.core import Observation, Recommendation
 
 
+@dataclass(frozen=True)
+class AdapterReport:
+    """One adapter's output for a single collection cycle."""
+
+    observations: Tuple[Observation, ...] = ()
+    recommendations: Tuple[Recommendation, ...] = ()
+    health: str = "online"
+
+
 class BabblyAdapter(ABC):
     """Read-only/advisory integration boundary for external systems.
 
@@ -19,3 +29,15 @@ class BabblyAdapter(ABC):
 
     def recommendations(self) -> Iterable[Recommendation]:
         return ()
+
+    def collect(self) -> AdapterReport:
+        """Return observations, recommendations and health in one pass.
+
+        The default asks ``observations()`` and ``recommendations()`` in turn.
+        Adapters backed by a remote source override this so one collection
+        cycle costs exactly one fetch.
+        """
+        return AdapterReport(
+            observations=tuple(self.observations()),
+            recommendations=tuple(self.recommendations()),
+        )
@@ -5,12 +5,14 @@ from __future__ import annotations
 import logging
 import os
 from pathlib import Path
-from typing import Mapping
+from typing import Mapping, Optional
 
+from babbly.adapters.audio import AudioHealthAdapter
 from babbly.adapters.azazel import AzazelAdapter
 from babbly.adapters.azazel_edge_action import AzazelEdgeActionExecutor
 from babbly.adapters.azazel_edge_transport import AzazelEdgeStatusProvider
 from babbly.core.engine import SituationEngine
+from babbly.core.poller import SituationPoller
 from babbly.core.request import RiskClass
 
 
@@ -33,14 +35,18 @@ def _load_edge_token(config: Mapping[str, object]) -> str:
     return ""
 
 
-def create_situation_engine(config: Mapping[str, object]) -> SituationEngine:
+def create_situation_engine(config: Mapping[str, object], asr=None) -> SituationEngine:
     """Build Babbly's optional read-only situation integrations.
 
     Integrations default to disabled so standalone Babbly behavior is unchanged.
     Configuration errors never grant authority or create a write path; the
-    affected adapter simply remains unavailable.
+    affected adapter simply remains unavailable. ``asr`` supplies the
+    microphone queue for the audio health adapter.
     """
     adapters = []
+    audio_health = create_audio_health_adapter(config, asr) if asr is not None else None
+    if audio_health is not None:
+        adapters.append(audio_health)
     if bool(config.get("AZAZEL_EDGE_ENABLED", False)):
         try:
             provider = AzazelEdgeStatusProvider(
@@ -54,7 +60,49 @@ def create_situation_engine(config: Mapping[str, object]) -> SituationEngine:
         except (TypeError, ValueError) as exc:
             logger.warning("Azazel-Edge adapter configuration rejected: %s", exc)
 
-    return SituationEngine(adapters)
+    try:
+        max_workers = int(config.get("SITUATION_MAX_WORKERS", 0) or 0)
+        return SituationEngine(
+            adapters,
+            max_workers=max_workers if max_workers > 0 else None,
+            collection_timeout_sec=config.get("SITUATION_COLLECT_TIMEOUT_SEC"),
+            adapter_timeout_sec=config.get("SITUATION_ADAPTER_TIMEOUT_SEC"),
+        )
+    except (TypeError, ValueError) as exc:
+        logger.warning("Situation collection configuration rejected; collecting serially: %s", exc)
+        return SituationEngine(adapters)
+
+
+def create_audio_health_adapter(config: Mapping[str, object], asr) -> Optional[AudioHealthAdapter]:
+    """Report the ASR microphone queue when ``AUDIO_HEALTH_ADAPTER`` is on.
+
+    Returns None when disabled or when the backend exposes no queue stats.
+    """
+    if not bool(config.get("AUDIO_HEALTH_ADAPTER", False)):
+        return None
+    stats = getattr(asr, "audio_stats", None)
+    if stats is None:
+        logger.warning("Audio health adapter enabled but the ASR backend reports no queue stats")
+        return None
+    return AudioHealthAdapter(stats)
+
+
+def create_situation_poller(config: Mapping[str, object], engine: SituationEngine) -> Optional[SituationPoller]:
+    """Wrap the engine in a background poller when a cadence is configured.
+
+    With ``SITUATION_POLL_INTERVAL_SEC`` above zero every surface reads one
+    shared, periodically refreshed snapshot, so upstream load does not grow
+    with the number of attached surfaces. Returns None (synchronous collection
+    per read) when unset. The caller starts and stops the poller.
+    """
+    try:
+        interval = float(config.get("SITUATION_POLL_INTERVAL_SEC", 0) or 0)
+    except (TypeError, ValueError) as exc:
+        logger.warning("Situation poll interval rejected; collecting per read: %s", exc)
+        return None
+    if interval <= 0:
+        return None
+    return SituationPoller(engine, interval_sec=interval)
 
 
 def parse_write_actions(config: Mapping[str, object]) -> dict:
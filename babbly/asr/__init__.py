@@ -1,11 +1,11 @@
-from .types import ASRResult
+from .types import ASRAlternative, ASRResult, ASRWord
 
 
-def create_asr(config):
+def create_asr(config, capture=None, offline=False, grammar=None):
     """Create the configured ASR backend without importing ML/audio stacks at package import time."""
     from .factory import create_asr as _create_asr
 
-    return _create_asr(config)
+    return _create_asr(config, capture=capture, offline=offline, grammar=grammar)
 
 
-__all__ = ["ASRResult", "create_asr"]
+__all__ = ["ASRAlternative", "ASRResult", "ASRWord", "create_asr"]
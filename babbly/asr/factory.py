@@ -1,12 +1,33 @@
 from babbly.asr.faster_whisper_backend import FasterWhisperASR
+from babbly.asr.tiers import parse_whisper_tiers
 from babbly.asr.vosk_backend import VoskASR
 
 
-def create_asr(config):
+def create_asr(config, capture=None, offline=False, grammar=None):
+    """Build the configured backend.
+
+    ``offline`` skips microphone setup for backends that open one at
+    construction; the result is only usable through ``transcribe_pcm16``.
+    ``grammar`` (a ``VoskGrammar``) constrains Vosk per dialogue state; other
+    backends ignore it.
+    """
     backend = str(config.get("ASR_BACKEND", "vosk")).strip().lower()
 
     if backend == "vosk":
-        return VoskASR(config.get("MODEL_PATH"))
+        return VoskASR(
+            config.get("MODEL_PATH"),
+            preroll_ms=float(config.get("VOSK_PREROLL_MS", 0.0) or 0.0),
+            capture=capture,
+            microphone=not offline,
+            grammar=grammar,
+            drop_policy=str(config.get("VOSK_QUEUE_DROP_POLICY") or "oldest"),
+            max_seconds=float(config.get("VOSK_QUEUE_MAX_SECONDS", 30.0) or 30.0),
+            vad_rms_threshold=float(config.get("ASR_RMS_THRESHOLD", 0.012)),
+            vad_silence_seconds=float(config.get("ASR_SILENCE_SECONDS", 0.8)),
+            vad_max_seconds=float(config.get("ASR_MAX_SECONDS", 12.0)),
+            alternatives=int(config.get("ASR_ALTERNATIVES", 1) or 1),
+            word_confidence=bool(config.get("VOSK_WORD_CONFIDENCE", False)),
+        )
 
     if backend in {"faster-whisper", "whisper"}:
         return FasterWhisperASR(
@@ -17,6 +38,11 @@ def create_asr(config):
             silence_seconds=float(config.get("ASR_SILENCE_SECONDS", 0.8)),
             max_seconds=float(config.get("ASR_MAX_SECONDS", 12.0)),
             rms_threshold=float(config.get("ASR_RMS_THRESHOLD", 0.012)),
+            capture=capture,
+            preroll_ms=float(config.get("AUDIO_PREROLL_MS", 0.0) or 0.0) if capture is not None else 0.0,
+            tiers=parse_whisper_tiers(config),
+            warm_up=bool(config.get("WHISPER_WARMUP", True)),
+            alternatives=int(config.get("ASR_ALTERNATIVES", 1) or 1),
         )
 
     raise ValueError(f"Unsupported ASR_BACKEND: {backend}")
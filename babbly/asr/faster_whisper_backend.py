@@ -1,19 +1,33 @@
+import logging
 import math
 import time
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
-import sounddevice as sd
 
-from babbly.asr.types import ASRResult
+from babbly.asr.tiers import DEFAULT_TIER, WhisperTier
+from babbly.asr.types import ASRAlternative, ASRResult
+from babbly.core.latency import LatencyStats
 from babbly.wake.vad import EnergyVad, VadEvent
 
 
+logger = logging.getLogger(__name__)
+
+
 class FasterWhisperASR:
     """Offline utterance ASR using faster-whisper.
 
     Audio capture is bounded by silence detection so the backend can be used as
     a drop-in replacement for the legacy one-utterance Vosk path.
+
+    Models stay loaded for the life of the process. With ``tiers`` each dialogue
+    state (wake, confirm, command) can use its own model and beam size; tiers
+    that name the same model share one loaded instance. Every model is warmed
+    on silence at startup so the operator never waits for the first decode.
+
+    With ``alternatives`` above one, ``command`` utterances are decoded by one
+    beam search that keeps that many hypotheses (``ASRResult.alternatives``);
+    other states stay 1-best.
     """
 
     def __init__(
@@ -26,7 +40,16 @@ class FasterWhisperASR:
         silence_seconds: float = 0.8,
         max_seconds: float = 12.0,
         rms_threshold: float = 0.012,
+        capture=None,
+        preroll_ms: float = 0.0,
+        tiers: Optional[Sequence[WhisperTier]] = None,
+        warm_up: bool = True,
+        alternatives: int = 1,
     ):
+        if capture is not None and int(capture.sample_rate) != int(sample_rate):
+            raise ValueError(
+                f"faster-whisper needs {sample_rate} Hz audio; shared capture runs at {capture.sample_rate} Hz"
+            )
         try:
             from faster_whisper import WhisperModel
         except ImportError as exc:
@@ -34,15 +57,75 @@ class FasterWhisperASR:
                 "faster-whisper backend requested but faster-whisper is not installed"
             ) from exc
 
-        self.model = WhisperModel(model_name, device=device, compute_type=compute_type)
+        tiers = tuple(tiers) if tiers else (WhisperTier(DEFAULT_TIER, model_name, beam_size=5),)
+        self.tiers: Dict[str, WhisperTier] = {tier.name: tier for tier in tiers}
+        self.default_tier = DEFAULT_TIER if DEFAULT_TIER in self.tiers else tiers[0].name
+        loaded: Dict[str, object] = {}
+        for tier in tiers:
+            if tier.model not in loaded:
+                loaded[tier.model] = WhisperModel(tier.model, device=device, compute_type=compute_type)
+        self._models = {tier.name: loaded[tier.model] for tier in tiers}
+        self.model = self._models[self.default_tier]
+        self.latency: Dict[str, LatencyStats] = {name: LatencyStats() for name in self.tiers}
+        self.warmup_seconds: Dict[str, float] = {}
         self.language = language
         self.sample_rate = sample_rate
         self.silence_seconds = silence_seconds
         self.max_seconds = max_seconds
         self.rms_threshold = rms_threshold
+        # Optional shared AudioCaptureBus. preroll_ms of audio captured before
+        # listen() (e.g. during the wake acknowledgement) is included.
+        self.capture = capture
+        self.preroll_ms = max(0.0, float(preroll_ms))
+        self.alternatives = max(1, int(alternatives or 1))
+        self._tokenizers: Dict[str, object] = {}
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self, seconds: float = 1.0) -> Dict[str, float]:
+        """Decode silence once per loaded model to pay one-time setup now."""
+        silence = np.zeros(int(self.sample_rate * seconds), dtype=np.float32)
+        warmed = set()
+        for name, tier in self.tiers.items():
+            if tier.model in warmed:
+                continue
+            warmed.add(tier.model)
+            started = time.perf_counter()
+            # vad_filter would drop the silence and skip the decoder entirely.
+            segments, _info = self._models[name].transcribe(
+                silence, language=self.language, beam_size=tier.beam_size, vad_filter=False
+            )
+            list(segments)
+            self.warmup_seconds[tier.model] = time.perf_counter() - started
+            logger.info("Whisper model %s warmed in %.2fs", tier.model, self.warmup_seconds[tier.model])
+        return dict(self.warmup_seconds)
+
+    def tier_for(self, state: str) -> str:
+        state = str(state or "").strip().lower()
+        return state if state in self.tiers else self.default_tier
+
+    def _blocks(self, block_size: int) -> Iterator[np.ndarray]:
+        if self.capture is not None:
+            with self.capture.subscribe(preroll_ms=self.preroll_ms) as frames:
+                for frame in frames:
+                    yield frame.samples
+            return
+        import sounddevice as sd
+
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=block_size,
+        ) as stream:
+            while True:
+                data, _overflowed = stream.read(block_size)
+                yield np.asarray(data[:, 0], dtype=np.float32)
 
     def _capture_utterance(self) -> np.ndarray:
         block_seconds = 0.1
+        if self.capture is not None:
+            block_seconds = self.capture.block_size / float(self.capture.sample_rate)
         block_size = int(self.sample_rate * block_seconds)
         silent_blocks_required = max(1, int(self.silence_seconds / block_seconds))
         max_blocks = max(1, int(self.max_seconds / block_seconds))
@@ -56,25 +139,24 @@ class FasterWhisperASR:
             hangover_frames=silent_blocks_required,
         )
 
-        with sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype="float32",
-            blocksize=block_size,
-        ) as stream:
-            for _ in range(max_blocks):
-                data, _overflowed = stream.read(block_size)
-                mono = np.asarray(data[:, 0], dtype=np.float32)
+        blocks = self._blocks(block_size)
+        try:
+            for _, mono in zip(range(max_blocks), blocks):
                 rms = float(np.sqrt(np.mean(np.square(mono)))) if mono.size else 0.0
 
                 event = vad.observe_rms(rms)
                 if event is VadEvent.SILENCE:
-                    time.sleep(0.01)
+                    if self.capture is None:
+                        time.sleep(0.01)
                     continue
 
-                chunks.append(mono.copy())
+                # Each block is a fresh (or shared read-only) array, and
+                # concatenate copies below, so no per-block copy is needed.
+                chunks.append(mono)
                 if event is VadEvent.SPEECH_END:
                     break
+        finally:
+            blocks.close()
 
         if not chunks:
             return np.array([], dtype=np.float32)
@@ -92,18 +174,97 @@ class FasterWhisperASR:
         return sum(scores) / len(scores)
 
     def listen(self) -> ASRResult:
+        return self.listen_for(self.default_tier)
+
+    def listen_for(self, state: str) -> ASRResult:
+        """Capture one utterance and transcribe it with the tier for ``state``."""
         audio = self._capture_utterance()
         if audio.size == 0:
             return ASRResult(text="", confidence=None, backend="faster-whisper")
+        return self._transcribe(audio, state)
+
+    def capture_pcm16(self) -> Tuple[bytes, int]:
+        """Capture one utterance as mono int16 PCM without transcribing it."""
+        audio = self._capture_utterance()
+        return (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16).tobytes(), self.sample_rate
 
-        segments_iter, _info = self.model.transcribe(
+    def transcribe_pcm16(self, pcm: bytes, sample_rate: int, state: str = DEFAULT_TIER) -> ASRResult:
+        """Transcribe one complete mono int16 utterance without a sound device."""
+        if int(sample_rate) != int(self.sample_rate):
+            raise ValueError(f"faster-whisper needs {self.sample_rate} Hz audio, got {sample_rate} Hz")
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return self._transcribe(audio, state)
+
+    def _tokenizer(self, name: str):
+        if name not in self._tokenizers:
+            from faster_whisper.tokenizer import Tokenizer
+
+            model = self._models[name]
+            self._tokenizers[name] = Tokenizer(
+                model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=self.language
+            )
+        return self._tokenizers[name]
+
+    def _nbest(self, audio: np.ndarray, name: str) -> ASRResult:
+        """Decode one window of at most 30 s keeping ``alternatives`` hypotheses.
+
+        Uses the ctranslate2 model under faster-whisper directly, because
+        ``transcribe`` only returns the best beam. Scores are length-normalized
+        token log-probabilities, like a segment's ``avg_logprob``.
+        """
+        model = self._models[name]
+        extractor = model.feature_extractor
+        features = extractor(audio)[:, : extractor.nb_max_frames]
+        if features.shape[-1] < extractor.nb_max_frames:
+            features = np.pad(features, ((0, 0), (0, extractor.nb_max_frames - features.shape[-1])))
+        tokenizer = self._tokenizer(name)
+        prompt = list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+        result = model.model.generate(
+            model.encode(features),
+            [prompt],
+            beam_size=max(self.alternatives, self.tiers[name].beam_size),
+            num_hypotheses=self.alternatives,
+            return_scores=True,
+        )[0]
+        hypotheses = []
+        for ids, score in zip(result.sequences_ids, result.scores):
+            text = tokenizer.decode([token for token in ids if token < tokenizer.eot]).strip()
+            hypotheses.append(ASRAlternative(text, float(score)))
+        if not hypotheses:
+            return ASRResult(text="", confidence=None, backend="faster-whisper")
+        return ASRResult(
+            text=hypotheses[0].text,
+            confidence=max(0.0, min(1.0, math.exp(hypotheses[0].score))),
+            backend="faster-whisper",
+            alternatives=tuple(hypotheses) if len(hypotheses) > 1 else (),
+        )
+
+    def _transcribe(self, audio: np.ndarray, state: str) -> ASRResult:
+        name = self.tier_for(state)
+        tier = self.tiers[name]
+        started = time.perf_counter()
+        if self.alternatives > 1 and str(state or "").strip().lower() == DEFAULT_TIER and audio.size <= 30 * self.sample_rate:
+            try:
+                result = self._nbest(audio, name)
+            except Exception as exc:  # faster-whisper internals differ across releases
+                logger.warning("Whisper N-best decoding unavailable, using 1-best: %s", exc)
+                self.alternatives = 1
+            else:
+                self.latency[name].record((time.perf_counter() - started) * 1000.0)
+                return result
+        segments_iter, _info = self._models[name].transcribe(
             audio,
             language=self.language,
-            beam_size=5,
+            beam_size=tier.beam_size,
             vad_filter=True,
             condition_on_previous_text=False,
         )
         segments = list(segments_iter)
+        self.latency[name].record((time.perf_counter() - started) * 1000.0)
         text = "".join(segment.text for segment in segments).strip()
         confidence = self._segment_confidence(segments)
         return ASRResult(text=text, confidence=confidence, backend="faster-whisper")
+
+    def latency_summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Per-tier transcription latency (capture time excluded)."""
+        return {name: stats.to_dict() for name, stats in self.latency.items()}
@@ -0,0 +1,158 @@
+"""Per-dialogue-state Vosk grammars built from the active vocabulary.
+
+Command mode and confirmations only need a few hundred words: the resolver's
+intent terms, the spoken alias forms, every registry search key (names,
+VoiceAliases, phonetic codes), the yes/no answers and the particles that join
+them. Decoding against that grammar instead of the open vocabulary is
+cheaper on the Pi and cannot produce words the intent layer would never
+match. Anything else decodes as ``[unk]``, which resolves to ``unknown`` and
+fails closed.
+
+Grammars are rebuilt lazily when ``RegistryService.generation`` changes, so a
+registry edit or the reload intent is picked up by the next utterance.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from babbly.modules.phonetic import PHONETIC_CODES
+from babbly.nlu.japanese import CONFIRM_NO, CONFIRM_YES
+
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_WORD = "[unk]"
+
+# Particles and verb endings that join command terms in natural requests
+# ("ネットワークをスキャンしてください").
+FUNCTION_WORDS: Tuple[str, ...] = (
+    "を", "の", "に", "は", "が", "で", "と", "も",
+    "して", "し", "て", "ください", "お願い", "します", "する", "です",
+)
+
+
+class VoskGrammar:
+    """Phrase lists for the states in ``states``; other states stay open."""
+
+    def __init__(
+        self,
+        *,
+        resolver,
+        registry=None,
+        wake_phrases: Iterable[str] = (),
+        extra_phrases: Iterable[str] = (),
+        states: Iterable[str] = ("confirm", "command"),
+        segment: Optional[Callable[[str], Sequence[str]]] = None,
+    ):
+        self.resolver = resolver
+        self.registry = registry
+        self.wake_phrases = tuple(phrase for phrase in wake_phrases if phrase)
+        self.extra_phrases = tuple(phrase for phrase in extra_phrases if phrase)
+        self.states = frozenset(str(state).strip().lower() for state in states)
+        self._segment = segment
+        self._cache: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return int(getattr(self.registry, "generation", 0))
+
+    def phrases(self, state: str) -> Optional[Tuple[str, ...]]:
+        """Grammar for ``state``, or None to decode it with the open vocabulary."""
+        if state not in self.states:
+            return None
+        version = self.version
+        with self._lock:
+            cached = self._cache.get(state)
+            if cached is None or cached[0] != version:
+                cached = (version, self._build(state))
+                self._cache[state] = cached
+                logger.info("Vosk grammar for %s: %d phrases (registry generation %d)", state, len(cached[1]), version)
+            return cached[1]
+
+    def _terms(self, state: str) -> Iterable[str]:
+        if state == "wake":
+            yield from self.wake_phrases
+            # Without them "プログラムを終了して" decodes as the bare phrase.
+            yield from FUNCTION_WORDS
+            return
+        yield from CONFIRM_YES
+        yield from CONFIRM_NO
+        if state == "confirm":
+            return
+        yield from FUNCTION_WORDS
+        yield from self.extra_phrases
+        yield from self.resolver.aliases
+        for _intent, options in self.resolver.rules:
+            for terms in options:
+                yield from terms
+                yield "".join(terms)
+        for codes in PHONETIC_CODES.values():
+            yield from codes
+        if self.registry is not None:
+            for manager in (self.registry.commands, self.registry.targets, self.registry.operations):
+                yield from (str(key) for key in manager.get_search_dict())
+
+    def _build(self, state: str) -> Tuple[str, ...]:
+        phrases = []
+        for term in self._terms(state):
+            term = str(term).strip()
+            if not term:
+                continue
+            phrases.append(term)
+            if self._segment is not None:
+                words = [word for word in self._segment(term) if word.strip()]
+                if len(words) > 1:
+                    # The model's lexicon holds morphemes; a compound it does
+                    # not list is still reachable word by word.
+                    phrases.append(" ".join(words))
+        phrases.append(UNKNOWN_WORD)
+        return tuple(dict.fromkeys(phrases))
+
+
+def create_vosk_grammar(
+    config: Mapping[str, object],
+    *,
+    resolver=None,
+    registry=None,
+    extra_phrases: Iterable[str] = (),
+) -> Optional[VoskGrammar]:
+    """Build the grammar when ``VOSK_GRAMMAR`` is on; None keeps open decoding.
+
+    Without a ``resolver`` / ``registry`` they are built from the config, as
+    the offline replay tools do.
+    """
+    if not bool(config.get("VOSK_GRAMMAR", False)):
+        return None
+    states = config.get("VOSK_GRAMMAR_STATES") or ("confirm", "command")
+    if isinstance(states, str):
+        states = [states]
+    if resolver is None:
+        from babbly.nlu.japanese import IntentResolver
+        from babbly.nlu.vocabulary import build_aliases
+
+        resolver = IntentResolver(build_aliases(*config.get("DOMAIN_VOCABULARY", ["core", "kali"])))
+    if registry is None and config.get("COMMANDS_PATH"):
+        from babbly.modules.registry import RegistryService
+
+        registry = RegistryService(
+            str(config.get("COMMANDS_PATH")), str(config.get("TARGETS_PATH")), str(config.get("SOP_PATH"))
+        )
+    wake = config.get("WAKEUP_PHRASES")
+    if not isinstance(wake, list) or not wake:
+        wake = [str(config.get("WAKEUP_PHRASE") or "")]
+    exit_phrase = str(config.get("EXIT_PHRASE") or "")
+
+    from babbly.nlu.tokenizer import get_tokenizer
+
+    return VoskGrammar(
+        resolver=resolver,
+        registry=registry,
+        wake_phrases=wake,
+        extra_phrases=(exit_phrase, *extra_phrases),
+        states=states,
+        segment=get_tokenizer().segment,
+    )
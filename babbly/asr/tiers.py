@@ -0,0 +1,78 @@
+"""Whisper model tiers selected by dialogue state.
+
+Short yes/no confirmations and wake verification do not need the command
+model or a wide beam. A tier names a model and beam size; tiers are keyed by
+the dialogue state that uses them (``wake``, ``confirm``, ``command``), and a
+state without its own tier uses ``command``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterator, Mapping, Tuple
+
+from babbly.asr.types import ASRResult
+
+
+logger = logging.getLogger(__name__)
+
+DIALOGUE_STATES = ("wake", "confirm", "command")
+DEFAULT_TIER = "command"
+
+
+@dataclass(frozen=True)
+class WhisperTier:
+    name: str
+    model: str
+    beam_size: int = 5
+
+
+def parse_whisper_tiers(config: Mapping[str, object]) -> Tuple[WhisperTier, ...]:
+    """Read ``WHISPER_TIERS``; without it, one command tier on ``WHISPER_MODEL``."""
+    default_model = str(config.get("WHISPER_MODEL") or "small")
+    tiers = []
+    raw = config.get("WHISPER_TIERS")
+    if isinstance(raw, Mapping):
+        for name, spec in raw.items():
+            try:
+                spec = spec if isinstance(spec, Mapping) else {"model": spec}
+                tiers.append(
+                    WhisperTier(
+                        name=str(name).strip().lower(),
+                        model=str(spec.get("model") or default_model),
+                        beam_size=max(1, int(spec.get("beam_size", 5))),
+                    )
+                )
+            except (TypeError, ValueError) as exc:
+                logger.warning("Ignoring Whisper tier %s: %s", name, exc)
+    if not any(tier.name == DEFAULT_TIER for tier in tiers):
+        tiers.append(WhisperTier(DEFAULT_TIER, default_model, 5))
+    return tuple(tiers)
+
+
+def listen_in_state(asr, state: str) -> ASRResult:
+    """Listen with the tier for ``state`` when the backend supports tiers."""
+    listen_for = getattr(asr, "listen_for", None)
+    if callable(listen_for):
+        return listen_for(state)
+    return asr.listen()
+
+
+def stream_in_state(asr, state: str) -> Iterator[ASRResult]:
+    """Partial hypotheses then the final result, for backends that stream.
+
+    Other backends yield their final result only.
+    """
+    stream = getattr(asr, "stream", None)
+    if callable(stream):
+        yield from stream(state)
+        return
+    yield listen_in_state(asr, state)
+
+
+def transcribe_in_state(asr, pcm: bytes, sample_rate: int, state: str) -> ASRResult:
+    """Offline counterpart of ``listen_in_state`` for a recorded utterance."""
+    if callable(getattr(asr, "listen_for", None)):
+        return asr.transcribe_pcm16(pcm, sample_rate, state=state)
+    return asr.transcribe_pcm16(pcm, sample_rate)
@@ -1,5 +1,23 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ASRAlternative:
+    """One N-best hypothesis; ``score`` is the backend's log-domain score."""
+
+    text: str
+    score: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class ASRWord:
+    """One recognized word with its posterior ``confidence`` and times in seconds."""
+
+    text: str
+    confidence: float
+    start: Optional[float] = None
+    end: Optional[float] = None
 
 
 @dataclass(frozen=True)
@@ -7,6 +25,14 @@ class ASRResult:
     text: str
     confidence: Optional[float] = None
     backend: str = "unknown"
+    # True for an interim streaming hypothesis; only final results are
+    # authoritative for execution.
+    partial: bool = False
+    # N-best hypotheses, best first (the first is ``text``); empty when the
+    # backend returned a single hypothesis.
+    alternatives: Tuple[ASRAlternative, ...] = ()
+    # Per-word confidences of ``text`` when the backend reports them.
+    words: Tuple[ASRWord, ...] = ()
 
     @property
     def is_empty(self) -> bool:
@@ -1,11 +1,159 @@
-from babbly.asr.types import ASRResult
-from babbly.ja.vosk_asr_module import get_asr_result, initialize_vosk_asr
+from typing import Dict, Iterator, Optional, Tuple
+
+from babbly.asr.types import ASRAlternative, ASRResult, ASRWord
+from babbly.audio.ring import AudioQueueStats
+from babbly.ja.vosk_asr_module import (
+    capture_utterance,
+    create_recognizer,
+    initialize_vosk_asr,
+    load_vosk_model,
+    merge_results,
+    recognize_pcm16_payloads,
+    stream_asr_results,
+)
+
+
+def _result(payloads) -> ASRResult:
+    hypotheses, words = merge_results(payloads)
+    alternatives = ()
+    if len(hypotheses) > 1:
+        alternatives = tuple(ASRAlternative(text, score) for text, score in hypotheses)
+    words = tuple(ASRWord(*word) for word in words)
+    # Unweighted mean; the caller can weight it toward intent terms.
+    confidence = sum(word.confidence for word in words) / len(words) if words else None
+    return ASRResult(
+        text=hypotheses[0][0],
+        confidence=confidence,
+        backend="vosk",
+        alternatives=alternatives,
+        words=words,
+    )
 
 
 class VoskASR:
-    def __init__(self, model_path: str):
-        self._engine = initialize_vosk_asr(model_path)
+    """Vosk ASR over one persistent microphone stream.
+
+    ``preroll_ms`` of audio captured while idle is fed to the recognizer when
+    the next utterance starts, so the first syllable is not lost on re-arm.
+    With ``microphone=False`` only the model is loaded (up front, so the first
+    replayed file does not pay for it), for offline ``transcribe_pcm16``.
+
+    With a ``grammar`` (``babbly.asr.grammar.VoskGrammar``) each dialogue state
+    it covers decodes against its own phrase list. Recognizers are cached per
+    state and rebuilt when the grammar version changes.
+
+    ``drop_policy`` and ``max_seconds`` bound the microphone queue (see
+    ``MicrophoneStream``); ``audio_stats()`` reports its health.
+
+    ``capture_pcm16()`` returns one energy-VAD bounded utterance without
+    decoding it (``vad_*`` set the VAD), for the staged wake gate.
+
+    With ``alternatives`` above one, open-vocabulary and command decodes
+    return that many N-best hypotheses in ``ASRResult.alternatives``. With
+    ``word_confidence`` (1-best only) results carry ``ASRResult.words`` and
+    their mean confidence instead of ``confidence=None``.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        preroll_ms: float = 0.0,
+        capture=None,
+        *,
+        microphone: bool = True,
+        grammar=None,
+        drop_policy: str = "oldest",
+        max_seconds: float = 30.0,
+        vad_rms_threshold: float = 0.012,
+        vad_silence_seconds: float = 0.8,
+        vad_max_seconds: float = 12.0,
+        alternatives: int = 1,
+        word_confidence: bool = False,
+    ):
+        self.model_path = model_path
+        self.vad_rms_threshold = float(vad_rms_threshold)
+        self.vad_silence_seconds = float(vad_silence_seconds)
+        self.vad_max_seconds = float(vad_max_seconds)
+        self.alternatives = max(1, int(alternatives or 1))
+        self.word_confidence = bool(word_confidence)
+        self.grammar = grammar
+        self._engine = None
+        self._model = None
+        self._recognizers: Dict[Tuple[Optional[str], int], Tuple[int, object]] = {}
+        if microphone:
+            self._engine = initialize_vosk_asr(
+                model_path,
+                preroll_ms=preroll_ms,
+                capture=capture,
+                drop_policy=drop_policy,
+                max_seconds=max_seconds,
+            )
+            self._model = self._engine.model
+            if self.alternatives > 1:
+                self._engine.recognizer.SetMaxAlternatives(self.alternatives)
+            if self.word_confidence:
+                self._engine.recognizer.SetWords(True)
+        else:
+            self._model = load_vosk_model(model_path)
+
+    def _recognizer_for(self, state: Optional[str], sample_rate: int):
+        phrases = self.grammar.phrases(state) if self.grammar is not None and state else None
+        if phrases is None:
+            state = None
+            if self._engine is not None and sample_rate == self._engine.sample_rate:
+                return self._engine.recognizer
+        version = self.grammar.version if phrases is not None else 0
+        key = (state, int(sample_rate))
+        cached = self._recognizers.get(key)
+        if cached is None or cached[0] != version:
+            # Only commands are reranked; wake and yes/no grammars stay 1-best.
+            alternatives = self.alternatives if state in (None, "command") else 0
+            recognizer = create_recognizer(self._model, int(sample_rate), phrases, alternatives, self.word_confidence)
+            cached = (version, recognizer)
+            self._recognizers[key] = cached
+        return cached[1]
 
     def listen(self) -> ASRResult:
-        text = get_asr_result(self._engine) or ""
-        return ASRResult(text=text, confidence=None, backend="vosk")
+        return self.listen_for(None)
+
+    def listen_for(self, state: Optional[str]) -> ASRResult:
+        """Listen for one utterance with the grammar of ``state``, if any."""
+        recognizer = self._recognizer_for(state, self._engine.sample_rate)
+        for _text, _is_final, payload in stream_asr_results(
+            self._engine, partials=False, recognizer=recognizer, detailed=True
+        ):
+            return _result([payload])
+        return ASRResult(text="", confidence=None, backend="vosk")
+
+    def stream(self, state: Optional[str] = None) -> Iterator[ASRResult]:
+        """Yield partial hypotheses as they change, then the final result."""
+        recognizer = self._recognizer_for(state, self._engine.sample_rate)
+        for text, is_final, payload in stream_asr_results(self._engine, recognizer=recognizer, detailed=True):
+            if is_final:
+                yield _result([payload])
+            else:
+                yield ASRResult(text=text, confidence=None, backend="vosk", partial=True)
+
+    def capture_pcm16(self) -> Tuple[bytes, int]:
+        """Next utterance as mono int16 PCM and its sample rate; silence is skipped."""
+        pcm = capture_utterance(
+            self._engine,
+            rms_threshold=self.vad_rms_threshold,
+            silence_sec=self.vad_silence_seconds,
+            max_sec=self.vad_max_seconds,
+        )
+        return pcm, self._engine.sample_rate
+
+    def transcribe_pcm16(self, pcm: bytes, sample_rate: int, state: Optional[str] = None) -> ASRResult:
+        """Recognize one complete mono int16 utterance without a sound device."""
+        return _result(recognize_pcm16_payloads(self._recognizer_for(state, int(sample_rate)), pcm))
+
+    def audio_stats(self) -> Optional[AudioQueueStats]:
+        """Microphone queue stats, or None without a microphone."""
+        if self._engine is None:
+            return None
+        return self._engine.microphone_stream.stats()
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.microphone_stream.close()
@@ -0,0 +1,4 @@
+from .capture import AudioCaptureBus, AudioFrame, AudioSubscription, CallbackStream
+from .factory import create_audio_capture
+
+__all__ = ["AudioCaptureBus", "AudioFrame", "AudioSubscription", "CallbackStream", "create_audio_capture"]
@@ -0,0 +1,243 @@
+"""One always-open microphone shared by wake, VAD and ASR.
+
+Without a bus every stage opens its own input stream, so each wake -> command
+handoff pays a device close/reopen and drops the first syllables of the
+command. ``AudioCaptureBus`` keeps a single float32 mono stream running and
+fans every block out to subscribers:
+
+- the PortAudio buffer is copied once per block; every subscriber receives the
+  same read-only array, and the int16 form is derived once on first use;
+- the last ``preroll_ms`` of blocks are kept in a ring, so a subscriber opened
+  after the wake acknowledgement still receives speech that started during it.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Deque, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AudioFrame:
+    """One captured block. ``samples`` is read-only and shared by all readers."""
+
+    samples: Any  # numpy float32, shape (n,), range [-1.0, 1.0]
+    sample_rate: int
+    index: int
+    captured_at: float
+
+    @cached_property
+    def int16(self) -> Any:
+        import numpy as np
+
+        converted = (np.clip(self.samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+        converted.setflags(write=False)
+        return converted
+
+    @property
+    def duration_sec(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+
+class AudioSubscription:
+    """A reader's queue of frames; iterate it or call ``read()``."""
+
+    def __init__(self, bus: "AudioCaptureBus", frames, max_frames: int):
+        self._bus = bus
+        self._frames: Deque[AudioFrame] = deque(frames)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.max_frames = max(1, int(max_frames))
+        self.dropped = 0
+
+    def _push(self, frame: AudioFrame) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._frames) >= self.max_frames:
+                # A stalled reader loses its oldest audio, never the producer.
+                self._frames.popleft()
+                self.dropped += 1
+            self._frames.append(frame)
+            self._cond.notify()
+
+    def read(self, timeout: Optional[float] = None) -> Optional[AudioFrame]:
+        """Next frame, or None once closed (or after ``timeout`` seconds)."""
+        with self._cond:
+            if not self._frames and not self._closed:
+                self._cond.wait_for(lambda: self._frames or self._closed, timeout=timeout)
+            if self._frames:
+                return self._frames.popleft()
+            return None
+
+    def __iter__(self) -> Iterator[AudioFrame]:
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __enter__(self) -> "AudioSubscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AudioCaptureBus:
+    """Single capture stream fanned out to any number of subscribers."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        block_ms: int = 100,
+        preroll_ms: float = 1000.0,
+        queue_ms: float = 10000.0,
+        device=None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.sample_rate = max(8000, int(sample_rate))
+        self.block_ms = max(10, int(block_ms))
+        self.block_size = max(1, self.sample_rate * self.block_ms // 1000)
+        self.preroll_ms = max(0.0, float(preroll_ms))
+        self.queue_frames = max(1, math.ceil(float(queue_ms) / self.block_ms))
+        self.device = device
+        self._clock = clock or time.monotonic
+        self._ring: Deque[AudioFrame] = deque(maxlen=max(1, math.ceil(self.preroll_ms / self.block_ms)))
+        self._subscribers: List[AudioSubscription] = []
+        self._lock = threading.Lock()
+        self._index = 0
+        self._stream = None
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def start(self) -> "AudioCaptureBus":
+        if self._stream is not None:
+            return self
+        try:
+            import sounddevice as sd
+        except ImportError as exc:
+            raise RuntimeError("shared audio capture requested but sounddevice is unavailable") from exc
+
+        kwargs = {
+            "samplerate": self.sample_rate,
+            "channels": 1,
+            "dtype": "float32",
+            "blocksize": self.block_size,
+            "callback": self._callback,
+        }
+        if self.device is not None:
+            kwargs["device"] = self.device
+        stream = sd.InputStream(**kwargs)
+        stream.start()
+        self._stream = stream
+        return self
+
+    def close(self) -> None:
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+        with self._lock:
+            subscribers = tuple(self._subscribers)
+        for subscription in subscribers:
+            subscription.close()
+
+    def _callback(self, indata, frames, time_info, status) -> None:
+        if status:
+            logger.debug("audio capture status: %s", status)
+        self.publish(indata[:, 0] if getattr(indata, "ndim", 1) > 1 else indata)
+
+    def publish(self, samples) -> AudioFrame:
+        """Copy one block off the device buffer and hand it to every reader."""
+        import numpy as np
+
+        data = np.array(samples, dtype=np.float32, copy=True).reshape(-1)
+        data.setflags(write=False)
+        with self._lock:
+            frame = AudioFrame(data, self.sample_rate, self._index, self._clock())
+            self._index += 1
+            self._ring.append(frame)
+            subscribers = tuple(self._subscribers)
+        for subscription in subscribers:
+            subscription._push(frame)
+        return frame
+
+    def subscribe(self, *, preroll_ms: float = 0.0) -> AudioSubscription:
+        """Start receiving frames, seeded with up to ``preroll_ms`` of history."""
+        wanted = math.ceil(max(0.0, float(preroll_ms)) / self.block_ms)
+        with self._lock:
+            history = list(self._ring)[-wanted:] if wanted else []
+            subscription = AudioSubscription(self, history, self.queue_frames)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: AudioSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+
+class CallbackStream:
+    """Drive a sounddevice-style ``callback(indata, frames, time, status)``
+    from a bus subscription, for code written against ``RawInputStream``.
+    """
+
+    def __init__(self, bus: AudioCaptureBus, callback, *, dtype: str = "int16"):
+        self.bus = bus
+        self.callback = callback
+        self.dtype = dtype
+        self._subscription: Optional[AudioSubscription] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        return self._subscription is not None and not self._subscription.closed
+
+    def start(self) -> None:
+        if self.active:
+            return
+        subscription = self.bus.subscribe()
+        self._subscription = subscription
+        self._thread = threading.Thread(
+            target=self._pump, args=(subscription,), name="babbly-audio-callback", daemon=True
+        )
+        self._thread.start()
+
+    def _pump(self, subscription: AudioSubscription) -> None:
+        for frame in subscription:
+            data = frame.int16 if self.dtype == "int16" else frame.samples
+            self.callback(data, len(data), None, None)
+
+    def stop(self) -> None:
+        subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            subscription.close()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def close(self) -> None:
+        self.stop()
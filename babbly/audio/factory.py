@@ -0,0 +1,25 @@
+import logging
+
+from babbly.audio.capture import AudioCaptureBus
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_audio_capture(config):
+    """Build the shared capture bus, or None when each stage opens its own device.
+
+    Disabled by default. The caller starts the bus and closes it on exit.
+    """
+    if not bool(config.get("AUDIO_CAPTURE_SHARED", False)):
+        return None
+    try:
+        return AudioCaptureBus(
+            sample_rate=int(config.get("AUDIO_SAMPLE_RATE", 16000)),
+            block_ms=int(config.get("AUDIO_BLOCK_MS", 100)),
+            preroll_ms=float(config.get("AUDIO_PREROLL_MS", 1000)),
+            device=config.get("AUDIO_INPUT_DEVICE"),
+        )
+    except (TypeError, ValueError) as exc:
+        logger.warning("Shared audio capture configuration rejected; stages open their own device: %s", exc)
+        return None
@@ -0,0 +1,146 @@
+"""Preallocated PCM chunk ring for microphone callbacks.
+
+The audio callback runs on PortAudio's thread for every block. ``ChunkRing``
+copies each block into one of a fixed set of preallocated slots instead of
+allocating a new ``bytes`` per callback, and bounds memory when the
+recognizer falls behind: when full it drops either the oldest chunk (keep
+latency bounded, the default) or the incoming one (keep the start of the
+utterance). Drops, device xruns and the queue depth are counted so they can be
+logged and reported through the situation model.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+@dataclass(frozen=True)
+class AudioQueueStats:
+    """Point-in-time view of a microphone queue."""
+
+    depth: int  # chunks waiting for the recognizer
+    capacity: int
+    high_water: int  # deepest the queue has been
+    overflows: int  # chunks dropped by the drop policy
+    xruns: int  # device status events (input overflow/underflow)
+    underruns: int  # device input underflows
+    policy: str = DROP_OLDEST
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ChunkRing:
+    """Fixed-capacity FIFO of byte chunks backed by one preallocated buffer.
+
+    Not thread-safe; the owner serializes access (``MicrophoneStream`` holds
+    its condition variable around every call).
+    """
+
+    def __init__(self, capacity: int, chunk_bytes: int, *, policy: str = DROP_OLDEST):
+        policy = str(policy or DROP_OLDEST).strip().lower()
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unsupported drop policy: {policy}")
+        self.capacity = max(1, int(capacity))
+        self.chunk_bytes = max(1, int(chunk_bytes))
+        self.policy = policy
+        self._buffer = bytearray(self.capacity * self.chunk_bytes)
+        view = memoryview(self._buffer)
+        self._slots = [view[i * self.chunk_bytes:(i + 1) * self.chunk_bytes] for i in range(self.capacity)]
+        self._lengths: List[int] = [0] * self.capacity
+        self._drain = bytearray(self.capacity * self.chunk_bytes)
+        self._drain_view = memoryview(self._drain)
+        self._head = 0
+        self._count = 0
+        self.overflows = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, data) -> int:
+        """Copy ``data`` into the ring; returns how many chunks were dropped.
+
+        A block larger than one slot spans several slots.
+        """
+        view = memoryview(data).cast("B")
+        dropped = 0
+        for start in range(0, len(view), self.chunk_bytes):
+            dropped += self._push_slot(view[start:start + self.chunk_bytes])
+        return dropped
+
+    def _push_slot(self, piece: memoryview) -> int:
+        dropped = 0
+        if self._count == self.capacity:
+            self.overflows += 1
+            dropped = 1
+            if self.policy == DROP_NEWEST:
+                return dropped
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+        index = (self._head + self._count) % self.capacity
+        size = len(piece)
+        self._slots[index][:size] = piece
+        self._lengths[index] = size
+        self._count += 1
+        if self._count > self.high_water:
+            self.high_water = self._count
+        return dropped
+
+    def trim(self, limit: int) -> None:
+        """Discard the oldest chunks beyond ``limit`` (not counted as drops)."""
+        limit = max(0, int(limit))
+        while self._count > limit:
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+
+    def drain(self) -> bytes:
+        """Return every queued chunk as one ``bytes`` and empty the ring."""
+        total = 0
+        for offset in range(self._count):
+            index = (self._head + offset) % self.capacity
+            size = self._lengths[index]
+            self._drain_view[total:total + size] = self._slots[index][:size]
+            total += size
+        self._head = 0
+        self._count = 0
+        return bytes(self._drain_view[:total])
+
+    def clear(self) -> None:
+        self.trim(0)
+
+
+class XrunLog:
+    """Count device status events and log them at most once per interval."""
+
+    def __init__(self, interval_sec: float = 5.0, *, clock: Optional[Callable[[], float]] = None, name: str = "microphone"):
+        self.interval_sec = max(0.0, float(interval_sec))
+        self.name = name
+        self._clock = clock or time.monotonic
+        self._last_logged: Optional[float] = None
+        self._pending = 0
+        self.xruns = 0
+        self.underruns = 0
+
+    def record(self, status) -> None:
+        if not status:
+            return
+        self.xruns += 1
+        if getattr(status, "input_underflow", False):
+            self.underruns += 1
+        self._pending += 1
+        now = self._clock()
+        if self._last_logged is None or now - self._last_logged >= self.interval_sec:
+            logger.warning("%s xrun: %s (%d since last report)", self.name, status, self._pending)
+            self._last_logged = now
+            self._pending = 0
@@ -0,0 +1,168 @@
+"""Replay recorded WAV files through an ASR backend without a sound device.
+
+The output rows use the results format that ``tools/evaluate_asr_results.py``
+scores (``id``, ``recognized_text``, ``latency_ms``, ``backend``, ``model``,
+``device``), plus ``audio_sec`` and ``rtf`` (real-time factor: processing time
+divided by audio duration). Files fan out over a process pool; each worker
+loads the model once in its initializer.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import time
+import wave
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence
+
+from babbly.asr.tiers import transcribe_in_state
+
+
+logger = logging.getLogger(__name__)
+
+_worker_asr = None
+_worker_state: Optional[str] = None
+
+
+def read_wav_pcm16(path: str | Path) -> tuple[bytes, int, float]:
+    """Return mono int16 PCM, sample rate and duration of a 16-bit WAV file.
+
+    Multi-channel files keep their first channel.
+    """
+    with wave.open(str(path), "rb") as handle:
+        if handle.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {8 * handle.getsampwidth()}-bit")
+        channels = handle.getnchannels()
+        sample_rate = handle.getframerate()
+        frames = handle.getnframes()
+        pcm = handle.readframes(frames)
+    if channels > 1:
+        samples = array("h")
+        samples.frombytes(pcm)
+        pcm = samples[::channels].tobytes()
+    return pcm, sample_rate, frames / float(sample_rate) if sample_rate else 0.0
+
+
+def load_manifest(path: str | Path) -> list[dict[str, object]]:
+    """Read ``[{"id": ..., "audio": "relative/or/absolute.wav"}, ...]``.
+
+    Relative audio paths resolve against the manifest's directory; other
+    fields (``expected_trigger``, ``class``...) are kept. Entries without
+    audio (for example a plain utterance corpus) are skipped.
+    """
+    manifest = Path(path)
+    items = []
+    for entry in json.loads(manifest.read_text(encoding="utf-8")):
+        audio = entry.get("audio") or entry.get("wav")
+        if not audio:
+            continue
+        audio_path = Path(audio).expanduser()
+        if not audio_path.is_absolute():
+            audio_path = manifest.parent / audio_path
+        items.append({**entry, "id": str(entry["id"]), "audio": str(audio_path)})
+    return items
+
+
+def create_offline_asr(config: Mapping[str, object]):
+    from babbly.asr import create_asr
+    from babbly.asr.grammar import create_vosk_grammar
+
+    return create_asr(config, offline=True, grammar=create_vosk_grammar(config))
+
+
+def _init_worker(
+    factory: Callable[[Mapping[str, object]], object], config: Mapping[str, object], state: Optional[str] = None
+) -> None:
+    global _worker_asr, _worker_state
+    _worker_asr = factory(config)
+    _worker_state = state
+
+
+def _transcribe(item: Mapping[str, str]) -> dict[str, object]:
+    row: dict[str, object] = {"id": item["id"], "audio": item["audio"]}
+    try:
+        pcm, sample_rate, duration = read_wav_pcm16(item["audio"])
+        started = time.perf_counter()
+        if _worker_state:
+            result = transcribe_in_state(_worker_asr, pcm, sample_rate, _worker_state)
+        else:
+            result = _worker_asr.transcribe_pcm16(pcm, sample_rate)
+        elapsed = time.perf_counter() - started
+    except Exception as exc:  # one bad file must not abort the run
+        logger.warning("replay failed for %s: %s", item["id"], exc)
+        row.update({"recognized_text": "", "latency_ms": None, "error": str(exc)})
+        return row
+    row.update(
+        {
+            "recognized_text": result.text,
+            "confidence": result.confidence,
+            "backend": result.backend,
+            "latency_ms": elapsed * 1000.0,
+            "audio_sec": duration,
+            "rtf": elapsed / duration if duration > 0 else None,
+        }
+    )
+    if result.alternatives:
+        row["alternatives"] = [{"text": item.text, "score": item.score} for item in result.alternatives]
+    if result.words:
+        row["words"] = [
+            {"word": word.text, "conf": word.confidence, "start": word.start, "end": word.end} for word in result.words
+        ]
+    return row
+
+
+def replay(
+    items: Sequence[Mapping[str, str]],
+    config: Mapping[str, object],
+    *,
+    workers: int = 0,
+    factory: Callable[[Mapping[str, object]], object] = create_offline_asr,
+    model: Optional[str] = None,
+    device: Optional[str] = None,
+    state: Optional[str] = None,
+) -> list[dict[str, object]]:
+    """Transcribe every manifest item; rows keep manifest order.
+
+    ``workers=0`` runs in-process with one backend; a positive count starts
+    that many processes, each loading its own backend once. ``factory`` must be
+    a picklable module-level callable when ``workers`` is positive. ``state``
+    decodes as that dialogue state (Whisper tier, Vosk grammar).
+    """
+    config = dict(config)
+    if workers and int(workers) > 0:
+        with ProcessPoolExecutor(
+            max_workers=int(workers), initializer=_init_worker, initargs=(factory, config, state)
+        ) as pool:
+            rows = list(pool.map(_transcribe, items))
+    else:
+        _init_worker(factory, config, state)
+        rows = [_transcribe(item) for item in items]
+
+    label = model or _model_label(config)
+    for row in rows:
+        row.setdefault("backend", str(config.get("ASR_BACKEND", "vosk")))
+        row["model"] = label
+        row["device"] = device or platform.node()
+    return rows
+
+
+def _model_label(config: Mapping[str, object]) -> str:
+    backend = str(config.get("ASR_BACKEND", "vosk")).strip().lower()
+    if backend in {"faster-whisper", "whisper"}:
+        return str(config.get("WHISPER_MODEL", "small"))
+    return Path(str(config.get("MODEL_PATH") or "")).name
+
+
+def summarize(rows: Sequence[Mapping[str, object]]) -> dict[str, object]:
+    latencies = [float(row["latency_ms"]) for row in rows if isinstance(row.get("latency_ms"), (int, float))]
+    rtfs = [float(row["rtf"]) for row in rows if isinstance(row.get("rtf"), (int, float))]
+    return {
+        "files": len(rows),
+        "errors": sum(1 for row in rows if row.get("error")),
+        "mean_latency_ms": sum(latencies) / len(latencies) if latencies else None,
+        "mean_rtf": sum(rtfs) / len(rtfs) if rtfs else None,
+    }
@@ -0,0 +1,244 @@
+"""In-process microbenchmarks for Babbly's hot paths.
+
+These complement the process-level runtime profilers: each function times one
+pure-Python component on synthetic input and returns JSON-ready rows, so a
+result can be written with ``write_json_atomic`` and compared across hosts.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+from babbly.core.situation import Observation, Recommendation, SituationSnapshot
+from babbly.nlu.japanese import IntentResolver, _basic_normalize
+from babbly.nlu.tokenizer import TOKENIZER_BACKENDS, TokenizerService
+from babbly.wake.vad import EnergyVad
+
+
+_SEVERITIES = ("info", "caution", "info", "warning", "info", "critical")
+
+
+def _best_of(repeat: int, run: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(max(1, int(repeat))):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _scaling_summary(rows: Sequence[dict[str, object]], per_item_key: str) -> dict[str, object]:
+    """Compare per-item cost of the largest and smallest size.
+
+    A ratio near 1.0 means linear scaling; quadratic work grows the ratio with
+    the size ratio.
+    """
+    if len(rows) < 2:
+        return {"per_item_ratio": None}
+    smallest = float(rows[0][per_item_key])
+    largest = float(rows[-1][per_item_key])
+    return {"per_item_ratio": largest / smallest if smallest > 0 else None}
+
+
+def snapshot_scaling(
+    sizes: Sequence[int] = (100, 1000, 10000),
+    *,
+    repeat: int = 3,
+    recommendations_per_observation: float = 0.1,
+) -> dict[str, object]:
+    """Time snapshot assembly through ``add_*`` and ``extend()`` per size."""
+    rows = []
+    for size in sorted(int(value) for value in sizes):
+        observations = [
+            Observation("bench", "health.row", f"row {index}", severity=_SEVERITIES[index % len(_SEVERITIES)])
+            for index in range(size)
+        ]
+        recommendations = [
+            Recommendation("bench", f"action {index}", "bench", priority=(index * 37) % 101)
+            for index in range(int(size * recommendations_per_observation))
+        ]
+
+        def incremental() -> None:
+            snapshot = SituationSnapshot()
+            for item in observations:
+                snapshot.add_observation(item)
+            for item in recommendations:
+                snapshot.add_recommendation(item)
+
+        def bulk() -> None:
+            SituationSnapshot().extend(observations, recommendations)
+
+        add_sec = _best_of(repeat, incremental)
+        extend_sec = _best_of(repeat, bulk)
+        rows.append(
+            {
+                "observations": size,
+                "recommendations": len(recommendations),
+                "add_ms": add_sec * 1000.0,
+                "extend_ms": extend_sec * 1000.0,
+                "add_us_per_observation": add_sec * 1e6 / max(size, 1),
+                "extend_us_per_observation": extend_sec * 1e6 / max(size, 1),
+            }
+        )
+    return {
+        "benchmark": "situation.snapshot_scaling",
+        "rows": rows,
+        "summary": _scaling_summary(rows, "add_us_per_observation"),
+    }
+
+
+def _linear_first_match(resolver: IntentResolver, text: str) -> str:
+    # The pre-index resolver: walk every rule, re-normalizing each term.
+    normalized = resolver.normalizer(text)
+    for intent, alternatives in resolver.rules:
+        for required_terms in alternatives:
+            if all(_basic_normalize(term) in normalized for term in required_terms):
+                return intent
+    return "unknown"
+
+
+def resolver_throughput(
+    rule_count: int = 1000,
+    *,
+    repeat: int = 3,
+    corpus_path: str | Path = "benchmarks/ja_command_corpus.json",
+) -> dict[str, object]:
+    """Resolve the command corpus against ``rule_count`` synthetic rules.
+
+    Synthetic rules precede the built-in ones, so corpus utterances exercise
+    the worst case for a linear rule walk.
+    """
+    synthetic = tuple(
+        (f"bench.rule{index:04d}", ((f"対象{index:04d}", "確認"), (f"項目{index:04d}",)))
+        for index in range(max(0, int(rule_count)))
+    )
+    resolver = IntentResolver(rules=synthetic + IntentResolver.RULES)
+    utterances = [str(case["utterance"]) for case in json.loads(Path(corpus_path).read_text(encoding="utf-8"))]
+    utterances += [f"対象{index:04d}を確認して" for index in range(0, max(1, int(rule_count)), 97)]
+    mismatches = sum(1 for text in utterances if resolver.resolve(text).name != _linear_first_match(resolver, text))
+
+    indexed_sec = _best_of(repeat, lambda: [resolver.resolve(text) for text in utterances])
+    linear_sec = _best_of(repeat, lambda: [_linear_first_match(resolver, text) for text in utterances])
+    return {
+        "benchmark": "nlu.resolver_throughput",
+        "rows": [
+            {
+                "rules": len(resolver.rules),
+                "utterances": len(utterances),
+                "indexed_utterances_per_sec": len(utterances) / indexed_sec if indexed_sec > 0 else None,
+                "linear_utterances_per_sec": len(utterances) / linear_sec if linear_sec > 0 else None,
+            }
+        ],
+        "summary": {
+            "speedup": linear_sec / indexed_sec if indexed_sec > 0 else None,
+            "mismatches": mismatches,
+        },
+    }
+
+
+def tokenizer_latency(
+    backends: Sequence[str] = TOKENIZER_BACKENDS,
+    *,
+    repeat: int = 3,
+    corpus_path: str | Path = "benchmarks/ja_command_corpus.json",
+) -> dict[str, object]:
+    """Cold (load + first utterance) and warm per-utterance tokenizer latency.
+
+    ``warm_ms`` tokenizes with the memo cleared; ``memoized_ms`` repeats
+    utterances already seen. ``backend`` reports what actually ran, e.g.
+    ``simple`` when Janome is not installed.
+    """
+    utterances = [str(case["utterance"]) for case in json.loads(Path(corpus_path).read_text(encoding="utf-8"))]
+    rows = []
+    for backend in backends:
+        started = time.perf_counter()
+        service = TokenizerService(backend)
+        service.tokenize(utterances[0])
+        cold_sec = time.perf_counter() - started
+
+        def uncached() -> None:
+            for text in utterances:
+                service.clear_cache()
+                service.tokenize(text)
+
+        def memoized() -> None:
+            for text in utterances:
+                service.tokenize(text)
+
+        memoized()
+        warm_sec = _best_of(repeat, uncached)
+        memo_sec = _best_of(repeat, memoized)
+        rows.append(
+            {
+                "requested_backend": backend,
+                "backend": service.backend,
+                "cold_ms": cold_sec * 1000.0,
+                "warm_ms": warm_sec * 1000.0 / len(utterances),
+                "memoized_ms": memo_sec * 1000.0 / len(utterances),
+            }
+        )
+    return {
+        "benchmark": "nlu.tokenizer_latency",
+        "rows": rows,
+        "summary": {"utterances": len(utterances)},
+    }
+
+
+def vad_throughput(
+    frames: int = 2000,
+    *,
+    frame_ms: int = 20,
+    sample_rate: int = 16000,
+    repeat: int = 3,
+    seed: int = 0,
+) -> dict[str, object]:
+    """EnergyVad frames per second for the scalar and NumPy block paths.
+
+    Requires NumPy. Input alternates silence and speech-level noise so the
+    hysteresis state machine sees every transition.
+    """
+    import numpy as np
+
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    rng = np.random.default_rng(seed)
+    levels = np.repeat(rng.choice([0.0, 0.004, 0.1], size=max(1, frames // 25)), 25)[:frames]
+    block = rng.standard_normal((len(levels), frame_len)) * levels[:, None]
+    rows = [row.tolist() for row in block]
+
+    def scalar() -> None:
+        vad = EnergyVad()
+        for row in rows:
+            vad.observe_frame(row)
+
+    def vectorized() -> None:
+        EnergyVad().observe_block(block)
+
+    scalar_sec = _best_of(repeat, scalar)
+    vector_sec = _best_of(repeat, vectorized)
+    reference = EnergyVad()
+    agrees = EnergyVad().observe_block(block) == [reference.observe_frame(row) for row in rows]
+    return {
+        "benchmark": "wake.vad_throughput",
+        "rows": [
+            {
+                "path": "scalar",
+                "frames": len(rows),
+                "frame_len": frame_len,
+                "frames_per_sec": len(rows) / scalar_sec if scalar_sec > 0 else None,
+            },
+            {
+                "path": "vectorized",
+                "frames": len(rows),
+                "frame_len": frame_len,
+                "frames_per_sec": len(rows) / vector_sec if vector_sec > 0 else None,
+            },
+        ],
+        "summary": {
+            "speedup": scalar_sec / vector_sec if vector_sec > 0 else None,
+            "realtime_factor_vectorized": (len(rows) * frame_ms / 1000.0) / vector_sec if vector_sec > 0 else None,
+            "events_match": agrees,
+        },
+    }
@@ -0,0 +1,110 @@
+"""Compare one-shot "wake + command" utterances with the two-turn flow.
+
+For every recorded command the two-turn flow is timed as it runs live: the
+wake phrase is recognized, the acknowledgement and command prompt are
+played, and then the command is recognized. The one-shot flow recognizes the
+wake recording followed by the command recording as a single utterance.
+Both pay ``endpoint_sec`` of trailing silence per recognition, and audio
+counts at real time. The recognizer time is measured. The TTS durations
+(``ack_sec``, ``prompt_sec``) are inputs: measure them with the local voice.
+
+A one-shot row counts as correct when the wake gate triggers on the combined
+utterance and its remainder resolves to the expected intent.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from typing import Mapping, Optional, Sequence
+
+from babbly.asr.tiers import transcribe_in_state
+from babbly.benchmark.asr_replay import read_wav_pcm16
+from babbly.wake.one_shot import resolve_one_shot
+
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(asr, pcm: bytes, sample_rate: int, state: str):
+    started = time.perf_counter()
+    result = transcribe_in_state(asr, pcm, sample_rate, state)
+    return result, time.perf_counter() - started
+
+
+def compare_one_shot(
+    items: Sequence[Mapping[str, object]],
+    asr,
+    wake_audio: str,
+    *,
+    gate,
+    resolver,
+    ack_sec: float,
+    prompt_sec: float,
+    endpoint_sec: float = 0.8,
+    gap_sec: float = 0.2,
+) -> list[dict[str, object]]:
+    """One row per command recording; ``gate`` is an ``ASRWakeDetector``.
+
+    ``gap_sec`` of silence separates the wake phrase and the command in the
+    combined utterance, like a short breath.
+    """
+    wake_pcm, wake_rate, wake_sec = read_wav_pcm16(wake_audio)
+    wake_result, wake_elapsed = _timed(asr, wake_pcm, wake_rate, "wake")
+    if gate.match(wake_result) is None:
+        logger.warning("wake recording not recognized as a wake phrase: %r", wake_result.text)
+    gap = b"\0\0" * int(wake_rate * gap_sec)
+
+    rows = []
+    for item in items:
+        row: dict[str, object] = {"id": item["id"], "expected_intent": item.get("expected_intent")}
+        try:
+            pcm, sample_rate, command_sec = read_wav_pcm16(str(item["audio"]))
+            if sample_rate != wake_rate:
+                raise ValueError(f"sample rate {sample_rate} differs from the wake recording ({wake_rate})")
+            command, command_elapsed = _timed(asr, pcm, sample_rate, "command")
+            combined, one_shot_elapsed = _timed(asr, wake_pcm + gap + pcm, sample_rate, "wake")
+        except Exception as exc:  # one bad file must not abort the run
+            logger.warning("one-shot comparison failed for %s: %s", item["id"], exc)
+            row["error"] = str(exc)
+            rows.append(row)
+            continue
+
+        wake = gate.match(combined)
+        one_shot = resolve_one_shot(wake, resolver) if wake is not None else None
+        intent = resolver.resolve(one_shot.text).name if one_shot is not None else None
+        two_turn = wake_sec + endpoint_sec + wake_elapsed + ack_sec + prompt_sec
+        two_turn += command_sec + endpoint_sec + command_elapsed
+        single = wake_sec + gap_sec + command_sec + endpoint_sec + one_shot_elapsed
+        row.update(
+            {
+                "recognized_text": combined.text,
+                "two_turn_text": command.text,
+                "two_turn_intent": resolver.resolve(command.text).name,
+                "one_shot_intent": intent,
+                "one_shot_ok": intent is not None and intent == item.get("expected_intent"),
+                "two_turn_ms": two_turn * 1000.0,
+                "one_shot_ms": single * 1000.0,
+                "saved_ms": (two_turn - single) * 1000.0,
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+def summarize_one_shot(rows: Sequence[Mapping[str, object]]) -> dict[str, Optional[float]]:
+    scored = [row for row in rows if not row.get("error")]
+    saved = [float(row["saved_ms"]) for row in scored]
+    return {
+        "utterances": len(rows),
+        "errors": len(rows) - len(scored),
+        "one_shot_accuracy": sum(1 for row in scored if row["one_shot_ok"]) / len(scored) if scored else None,
+        "two_turn_accuracy": (
+            sum(1 for row in scored if row["two_turn_intent"] == row["expected_intent"]) / len(scored)
+            if scored
+            else None
+        ),
+        "mean_saved_ms": statistics.fmean(saved) if saved else None,
+        "median_saved_ms": statistics.median(saved) if saved else None,
+    }
@@ -297,7 +297,15 @@ def profile_command(
     backend: Optional[str] = None,
     model: Optional[str] = None,
     evaluation_json: Optional[str] = None,
+    stats_json: Optional[str] = None,
 ) -> dict[str, object]:
+    """Run ``command`` and sample its process tree until it exits.
+
+    ``stats_json`` names a JSON object the child writes on shutdown (for
+    example Babbly's ``WAKE_STATS_PATH``: wake re-arm latency and decode
+    load). It is embedded as ``runtime_stats`` when the child wrote it
+    during this run.
+    """
     if not command:
         raise ValueError("command is required")
     if duration_sec is not None and duration_sec <= 0:
@@ -352,10 +360,25 @@ def profile_command(
     evaluation = _load_evaluation(evaluation_json)
     if evaluation is not None:
         result["evaluation"] = dict(evaluation)
+    stats = _load_fresh_stats(stats_json, started_wall)
+    if stats is not None:
+        result["runtime_stats"] = dict(stats)
     return result
 
 
-def write_json_atomic(path: str | Path, payload: Mapping[str, object]) -> None:
+def _load_fresh_stats(path: Optional[str], since_epoch: float) -> Optional[Mapping[str, object]]:
+    """The child's stats JSON, ignoring a file left over from an earlier run."""
+    if not path:
+        return None
+    try:
+        if Path(path).stat().st_mtime < since_epoch:
+            return None
+    except OSError:
+        return None
+    return _load_evaluation(path)
+
+
+def write_json_atomic(path: str | Path, payload: Mapping[str, object] | list) -> None:
     destination = Path(path)
     destination.parent.mkdir(parents=True, exist_ok=True)
     temporary = destination.with_name(destination.name + ".tmp")
@@ -0,0 +1,208 @@
+"""Synthesize WAV corpora from the text benchmarks with the local TTS.
+
+Every utterance in a text corpus (``ja_command_corpus.json``,
+``wake_corpus.json``) is rendered through ``Japanese_TTS.synthesize``
+(pyopenjtalk) once per variant: speaking rate, pitch (``half_tone``), level,
+and optionally a noise bed mixed in at a target SNR. The clips are
+resampled to 16 kHz mono int16, and the written manifest keeps every corpus
+field, so it works directly as the ``--corpus`` of the evaluators and as the
+manifest of the ASR and wake replay tools. Nothing touches the network or a
+sound device.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import math
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from babbly.benchmark.asr_replay import read_wav_pcm16
+
+
+logger = logging.getLogger(__name__)
+
+WHITE_NOISE = "white"
+
+# (text, speed_rate, half_tone) -> (float waveform with peak 1.0, sample rate)
+Synthesizer = Callable[[str, float, float], Tuple[Any, int]]
+
+_worker_synthesize: Optional[Synthesizer] = None
+_worker_noise: Dict[Tuple[str, int], Any] = {}
+_tts = None
+
+
+@dataclass(frozen=True)
+class SynthVariant:
+    speed_rate: float = 1.0
+    half_tone: float = 0.0
+    volume: float = 0.8
+    noise: Optional[str] = None  # path to a noise WAV, "white", or None (clean)
+    snr_db: Optional[float] = None
+
+    @property
+    def tag(self) -> str:
+        tag = f"s{self.speed_rate:g}-p{self.half_tone:+g}-v{self.volume:g}"
+        if self.noise is not None:
+            tag += f"-{Path(self.noise).stem}{self.snr_db:g}db"
+        return tag
+
+
+def variant_grid(
+    speeds: Iterable[float] = (1.0,),
+    half_tones: Iterable[float] = (0.0,),
+    volumes: Iterable[float] = (0.8,),
+    noises: Sequence[str] = (),
+    snrs_db: Sequence[float] = (),
+    *,
+    clean: bool = True,
+) -> List[SynthVariant]:
+    """Every combination of voice settings, clean and/or per noise and SNR."""
+    beds: List[Tuple[Optional[str], Optional[float]]] = [(None, None)] if clean else []
+    beds.extend((noise, float(snr)) for noise in noises for snr in snrs_db)
+    return [
+        SynthVariant(float(speed), float(half_tone), float(volume), noise, snr)
+        for speed, half_tone, volume, (noise, snr) in itertools.product(speeds, half_tones, volumes, beds)
+    ]
+
+
+def openjtalk_synthesizer(text: str, speed_rate: float, half_tone: float):
+    """Render through the same ``Japanese_TTS`` path Babbly speaks with."""
+    global _tts
+    if _tts is None:
+        from babbly.ja.japanese_tts import Japanese_TTS
+
+        _tts = Japanese_TTS(auto_play=False)
+    samples, sample_rate, _settings = _tts.synthesize(
+        text, speed_rate=speed_rate, half_tone=half_tone, master_volume=1.0
+    )
+    return samples, sample_rate
+
+
+def resample(samples, source_rate: int, target_rate: int):
+    import numpy as np
+
+    if source_rate == target_rate:
+        return np.asarray(samples, dtype=np.float64)
+    from scipy.signal import resample_poly
+
+    divisor = math.gcd(int(source_rate), int(target_rate))
+    return resample_poly(samples, target_rate // divisor, source_rate // divisor)
+
+
+def mix_noise(speech, noise, snr_db: float, rng):
+    """Add ``noise`` (looped or cut at a random offset) at ``snr_db``."""
+    import numpy as np
+
+    speech = np.asarray(speech, dtype=np.float64)
+    if noise is None:
+        bed = rng.standard_normal(len(speech))
+    else:
+        noise = np.asarray(noise, dtype=np.float64)
+        repeats = -(-len(speech) // max(1, len(noise))) + 1
+        looped = np.tile(noise, repeats)
+        offset = int(rng.integers(0, max(1, len(looped) - len(speech))))
+        bed = looped[offset:offset + len(speech)]
+    speech_power = float(np.mean(speech ** 2))
+    noise_power = float(np.mean(bed ** 2))
+    if speech_power == 0.0 or noise_power == 0.0:
+        return speech
+    gain = math.sqrt(speech_power / (noise_power * 10.0 ** (float(snr_db) / 10.0)))
+    return speech + gain * bed
+
+
+def _noise_bed(path: str, sample_rate: int):
+    key = (path, sample_rate)
+    if key not in _worker_noise:
+        import numpy as np
+
+        pcm, rate, _duration = read_wav_pcm16(path)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float64) / 32768.0
+        _worker_noise[key] = resample(samples, rate, sample_rate)
+    return _worker_noise[key]
+
+
+def _init_worker(synthesize: Synthesizer) -> None:
+    global _worker_synthesize
+    _worker_synthesize = synthesize
+
+
+def _render(job: Mapping[str, Any]) -> Dict[str, Any]:
+    import numpy as np
+
+    variant: SynthVariant = job["variant"]
+    sample_rate = int(job["sample_rate"])
+    samples, rate = _worker_synthesize(job["text"], variant.speed_rate, variant.half_tone)
+    audio = resample(samples, rate, sample_rate) * variant.volume
+    if variant.noise is not None:
+        rng = np.random.default_rng(job["seed"])
+        bed = None if variant.noise == WHITE_NOISE else _noise_bed(variant.noise, sample_rate)
+        audio = mix_noise(audio, bed, variant.snr_db, rng)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+    destination = Path(job["path"])
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(destination), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm)
+    return {"duration_sec": len(pcm) / 2 / float(sample_rate)}
+
+
+def build_corpus(
+    corpus: Sequence[Mapping[str, Any]],
+    output_dir: str | Path,
+    variants: Sequence[SynthVariant],
+    *,
+    workers: int = 0,
+    synthesize: Synthesizer = openjtalk_synthesizer,
+    sample_rate: int = 16000,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Render ``corpus x variants`` into ``output_dir``; return the manifest.
+
+    Manifest ids are ``<corpus id>~<variant tag>`` and audio paths are
+    relative to ``output_dir``. Noise placement is seeded per clip, so a
+    rebuild with the same arguments writes the same files.
+    """
+    output = Path(output_dir)
+    manifest: List[Dict[str, Any]] = []
+    jobs: List[Dict[str, Any]] = []
+    for item in corpus:
+        text = str(item.get("utterance") or "").strip()
+        if not text:
+            continue
+        for variant in variants:
+            clip_id = f"{item['id']}~{variant.tag}"
+            relative = Path(str(item["id"])) / f"{variant.tag}.wav"
+            jobs.append(
+                {
+                    "text": text,
+                    "variant": variant,
+                    "path": str(output / relative),
+                    "sample_rate": sample_rate,
+                    "seed": seed + len(jobs),
+                }
+            )
+            entry = {**item, "id": clip_id, "source_id": item["id"], "audio": relative.as_posix()}
+            entry.update(asdict(variant))
+            manifest.append(entry)
+
+    if workers and int(workers) > 0:
+        with ProcessPoolExecutor(
+            max_workers=int(workers), initializer=_init_worker, initargs=(synthesize,)
+        ) as pool:
+            rendered = list(pool.map(_render, jobs, chunksize=8))
+    else:
+        _init_worker(synthesize)
+        rendered = [_render(job) for job in jobs]
+
+    for entry, info in zip(manifest, rendered):
+        entry.update(info)
+    logger.info("Synthesized %d clips into %s", len(manifest), output)
+    return manifest
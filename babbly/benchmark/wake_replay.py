@@ -0,0 +1,240 @@
+"""Replay WAV corpora through a wake detector and sweep its threshold.
+
+Each manifest item is a recording with ``expected_trigger``: short positives
+(the wake phrase), and negatives that may be hours of ordinary speech or room
+noise. Every trigger is logged with its offset and score, so one replay yields
+both the rows ``tools/evaluate_wake_results.py`` scores and a false accepts per
+hour vs false reject rate curve:
+
+- the ASR gate reports the ASR confidence as its score, so its curve is
+  computed from one replay by filtering hits (``sweep_scores``);
+- the sherpa-onnx spotter's hits carry a score when the installed build
+  reports one (``WakeResult.confidence``), and ``sweep_scores`` filters them
+  like the ASR gate's; only a build without scores needs a separate replay
+  per threshold with ``keywords_threshold`` set (``sweep_replays``).
+
+For the staged ASR gate, ``stage_rates`` breaks the false accepts per hour
+down by stage (VAD, phonetic screen, verification).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+from babbly.asr.tiers import transcribe_in_state
+from babbly.benchmark.asr_replay import read_wav_pcm16
+from babbly.wake.vad import EnergyVad, VadEvent
+
+
+@dataclass(frozen=True)
+class WakeHit:
+    offset_sec: float
+    keyword: str
+    score: Optional[float] = None
+
+
+class WakeScanner(Protocol):
+    backend: str
+
+    def scan(self, pcm: bytes, sample_rate: int) -> List[WakeHit]:
+        ...
+
+
+def _float_samples(pcm: bytes):
+    import numpy as np
+
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class KwsScanner:
+    """Feed recordings to ``SherpaOnnxWakeDetector.scan``."""
+
+    backend = "sherpa-onnx-kws"
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def scan(self, pcm: bytes, sample_rate: int) -> List[WakeHit]:
+        return [
+            WakeHit(offset, result.keyword, result.confidence)
+            for offset, result in self.detector.scan(_float_samples(pcm), sample_rate)
+        ]
+
+
+class AsrGateScanner:
+    """Cut recordings into utterances with ``EnergyVad`` and run each through
+    the ASR backend and ``ASRWakeDetector.match``, as the live gate would.
+
+    A hit is stamped at the end of its utterance, when the live gate fires.
+    """
+
+    backend = "asr"
+
+    def __init__(self, detector, *, vad: Optional[EnergyVad] = None, frame_ms: int = 30):
+        self.detector = detector
+        self.vad = vad or EnergyVad()
+        self.frame_ms = max(10, int(frame_ms))
+
+    def utterances(self, pcm: bytes, sample_rate: int) -> List[tuple[int, int]]:
+        """``(start, end)`` sample spans of every VAD utterance."""
+        samples = _float_samples(pcm)
+        frame = max(1, sample_rate * self.frame_ms // 1000)
+        usable = len(samples) - len(samples) % frame
+        spans = []
+        start = None
+        self.vad.reset()
+        events = self.vad.observe_block(samples[:usable].reshape(-1, frame)) if usable else []
+        for index, event in enumerate(events):
+            if event is VadEvent.SPEECH_START:
+                # Back up over the frames that opened the utterance plus one
+                # of lead-in, so the first phoneme is not clipped.
+                start = max(0, index - self.vad.start_frames) * frame
+            elif event is VadEvent.SPEECH_END and start is not None:
+                spans.append((start, (index + 1) * frame))
+                start = None
+        if start is not None:
+            spans.append((start, len(samples)))
+        return spans
+
+    def scan(self, pcm: bytes, sample_rate: int) -> List[WakeHit]:
+        hits = []
+        for start, end in self.utterances(pcm, sample_rate):
+            result = transcribe_in_state(self.detector.asr, pcm[2 * start:2 * end], sample_rate, "wake")
+            wake = self.detector.match(result)
+            if wake is not None:
+                hits.append(WakeHit(end / float(sample_rate), wake.keyword, wake.confidence))
+        return hits
+
+
+class StagedGateScanner(AsrGateScanner):
+    """``AsrGateScanner`` for ``StagedWakeDetector``: every VAD utterance goes
+    through the phonetic screen and the verification, and the detector counts
+    what passed each stage.
+    """
+
+    backend = "asr-staged"
+
+    def scan(self, pcm: bytes, sample_rate: int) -> List[WakeHit]:
+        hits = []
+        for start, end in self.utterances(pcm, sample_rate):
+            wake = self.detector.check(pcm[2 * start:2 * end], sample_rate)
+            if wake is not None:
+                hits.append(WakeHit(end / float(sample_rate), wake.keyword, wake.confidence))
+        # Replay stands in for live listening, so stage loads are per audio second.
+        self.detector.listened_sec += len(pcm) / 2.0 / sample_rate
+        return hits
+
+    def stage_counts(self) -> dict[str, int]:
+        return self.detector.stage_counts()
+
+
+def replay_wake(items: Sequence[Mapping[str, object]], scanner: WakeScanner) -> list[dict[str, object]]:
+    """Scan every item; rows carry ``actual_trigger`` plus every hit.
+
+    Scanners with ``stage_counts()`` also get per-row ``stages``: how many
+    utterances of the recording passed each stage.
+    """
+    stage_counts = getattr(scanner, "stage_counts", None)
+    rows = []
+    for item in items:
+        pcm, sample_rate, duration = read_wav_pcm16(str(item["audio"]))
+        before = stage_counts() if callable(stage_counts) else None
+        started = time.perf_counter()
+        hits = scanner.scan(pcm, sample_rate)
+        elapsed = time.perf_counter() - started
+        rows.append(
+            {
+                "id": item["id"],
+                "expected_trigger": bool(item.get("expected_trigger")),
+                "actual_trigger": bool(hits),
+                # Offline replay has no live trigger latency to report.
+                "latency_ms": None,
+                "backend": scanner.backend,
+                "audio_sec": duration,
+                "rtf": elapsed / duration if duration > 0 else None,
+                "hits": [asdict(hit) for hit in hits],
+            }
+        )
+        if before is not None:
+            rows[-1]["stages"] = {stage: count - before.get(stage, 0) for stage, count in stage_counts().items()}
+    return rows
+
+
+def stage_rates(rows: Sequence[Mapping[str, object]]) -> list[dict[str, object]]:
+    """Per stage: passes per hour of negative audio and positives kept.
+
+    A negative utterance passing a stage is a false accept of that stage;
+    a positive recording counts as kept when any of its utterances passed.
+    """
+    staged = [row for row in rows if isinstance(row.get("stages"), Mapping)]
+    names = list(dict.fromkeys(name for row in staged for name in row["stages"]))
+    negative_sec = sum(float(row.get("audio_sec") or 0.0) for row in staged if not row.get("expected_trigger"))
+    positives = [row for row in staged if row.get("expected_trigger")]
+    hours = negative_sec / 3600.0
+    points = []
+    for name in names:
+        passes = sum(int(row["stages"].get(name, 0)) for row in staged if not row.get("expected_trigger"))
+        kept = sum(1 for row in positives if int(row["stages"].get(name, 0)) > 0)
+        points.append(
+            {
+                "stage": name,
+                "negative_passes": passes,
+                "passes_per_hour": passes / hours if hours else None,
+                "positive_recall": kept / len(positives) if positives else None,
+            }
+        )
+    return points
+
+
+def _passes(hit: Mapping[str, object], threshold: Optional[float]) -> bool:
+    score = hit.get("score")
+    return threshold is None or score is None or float(score) >= threshold
+
+
+def curve_point(rows: Iterable[Mapping[str, object]], threshold: Optional[float] = None) -> dict[str, object]:
+    """False accepts per hour of negative audio and false reject rate.
+
+    Every hit in a negative recording counts as a false accept; a positive
+    recording with no hit is a false reject. Hits scored below ``threshold``
+    are ignored (unscored hits always count).
+    """
+    false_accepts = false_rejects = positives = 0
+    negative_sec = 0.0
+    for row in rows:
+        kept = sum(1 for hit in row.get("hits", ()) if _passes(hit, threshold))
+        if row.get("expected_trigger"):
+            positives += 1
+            false_rejects += int(kept == 0)
+        else:
+            negative_sec += float(row.get("audio_sec") or 0.0)
+            false_accepts += kept
+    hours = negative_sec / 3600.0
+    return {
+        "threshold": threshold,
+        "false_accepts": false_accepts,
+        "negative_hours": hours,
+        "false_accepts_per_hour": false_accepts / hours if hours else None,
+        "false_rejects": false_rejects,
+        "false_reject_rate": false_rejects / positives if positives else None,
+    }
+
+
+def sweep_scores(rows: Sequence[Mapping[str, object]], thresholds: Iterable[float]) -> list[dict[str, object]]:
+    """Curve from one replay by re-filtering its scored hits."""
+    return [curve_point(rows, float(threshold)) for threshold in sorted(thresholds)]
+
+
+def sweep_replays(
+    items: Sequence[Mapping[str, object]],
+    scanner_for: Callable[[float], WakeScanner],
+    thresholds: Iterable[float],
+) -> list[dict[str, object]]:
+    """Curve from one replay per threshold, for detectors without scores."""
+    points = []
+    for threshold in sorted(thresholds):
+        point = curve_point(replay_wake(items, scanner_for(float(threshold))))
+        point["threshold"] = float(threshold)
+        points.append(point)
+    return points
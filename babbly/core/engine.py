@@ -1,27 +1,147 @@
-from typing import Iterable
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
 
-from babbly.adapters.base import BabblyAdapter
+from babbly.adapters.base import AdapterReport, BabblyAdapter
 from babbly.core.situation import SituationSnapshot
 
 
 class SituationEngine:
-    """Aggregate read-only adapter output into one operator-facing snapshot."""
+    """Aggregate read-only adapter output into one operator-facing snapshot.
 
-    def __init__(self, adapters: Iterable[BabblyAdapter] = ()):
+    By default adapters are walked serially. Passing ``max_workers`` enables
+    the parallel mode: adapters are fanned out on a bounded thread pool and the
+    collection is bounded by ``collection_timeout_sec`` overall and by
+    ``adapter_timeout_sec`` (or an adapter's own ``timeout_sec``) per adapter.
+    An adapter that misses its deadline is reported as ``timeout`` rather than
+    blocking the operator loop. Results are always merged in adapter order, so
+    the snapshot does not depend on which adapter finished first.
+
+    Each adapter is asked once per cycle through its batched ``collect()``
+    when it has one, so observations and recommendations share one fetch.
+    """
+
+    def __init__(
+        self,
+        adapters: Iterable[BabblyAdapter] = (),
+        *,
+        max_workers: Optional[int] = None,
+        collection_timeout_sec: Optional[float] = None,
+        adapter_timeout_sec: Optional[float] = None,
+    ):
         self.adapters = list(adapters)
+        self.max_workers = None if max_workers is None else max(1, int(max_workers))
+        self.collection_timeout_sec = _optional_positive(collection_timeout_sec)
+        self.adapter_timeout_sec = _optional_positive(adapter_timeout_sec)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+        # A timed-out adapter keeps its worker until its call returns. Track the
+        # in-flight call so a hung adapter is never submitted twice, even by
+        # collections running concurrently (poller and surfaces).
+        self._in_flight: Dict[int, Future] = {}
+        self._in_flight_lock = Lock()
+
+    @property
+    def parallel(self) -> bool:
+        return self.max_workers is not None
 
     def collect(self) -> SituationSnapshot:
+        if self.parallel:
+            return self._collect_parallel()
+
         snapshot = SituationSnapshot()
         for adapter in self.adapters:
             try:
-                for observation in adapter.observations():
-                    snapshot.add_observation(observation)
-                for recommendation in adapter.recommendations():
-                    snapshot.add_recommendation(recommendation)
-                snapshot.set_system_state(adapter.name, "online")
-            except Exception as exc:
+                report = _collect_adapter(adapter)
+            except Exception:
                 snapshot.set_system_state(adapter.name, "error")
                 # Adapter failure is represented as state, not raised into the
                 # operator loop. External integrations must remain optional.
                 continue
+            _merge(snapshot, adapter, report)
+        return snapshot
+
+    def close(self) -> None:
+        """Release the worker pool without waiting for hung adapters."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="babbly-situation",
+                )
+            return self._executor
+
+    def _adapter_deadline(self, adapter: BabblyAdapter, started: float) -> Optional[float]:
+        limits = []
+        own = _optional_positive(getattr(adapter, "timeout_sec", None))
+        per_adapter = own if own is not None else self.adapter_timeout_sec
+        if per_adapter is not None:
+            limits.append(started + per_adapter)
+        if self.collection_timeout_sec is not None:
+            limits.append(started + self.collection_timeout_sec)
+        return min(limits) if limits else None
+
+    def _collect_parallel(self) -> SituationSnapshot:
+        started = time.monotonic()
+        pool = self._pool()
+        adapters = list(self.adapters)
+        futures: List[Optional[Future]] = []
+        with self._in_flight_lock:
+            for adapter in adapters:
+                previous = self._in_flight.get(id(adapter))
+                if previous is not None and not previous.done():
+                    futures.append(None)
+                    continue
+                future = pool.submit(_collect_adapter, adapter)
+                self._in_flight[id(adapter)] = future
+                futures.append(future)
+
+        snapshot = SituationSnapshot()
+        for adapter, future in zip(adapters, futures):
+            if future is None:
+                snapshot.set_system_state(adapter.name, "timeout")
+                continue
+            deadline = self._adapter_deadline(adapter, started)
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                report = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                snapshot.set_system_state(adapter.name, "timeout")
+                continue
+            except Exception:
+                snapshot.set_system_state(adapter.name, "error")
+                continue
+            _merge(snapshot, adapter, report)
         return snapshot
+
+
+def _collect_adapter(adapter: BabblyAdapter) -> AdapterReport:
+    collect = getattr(adapter, "collect", None)
+    if callable(collect):
+        return collect()
+    # Duck-typed adapters without the batched call keep the two-call path.
+    return AdapterReport(
+        observations=tuple(adapter.observations()),
+        recommendations=tuple(adapter.recommendations()),
+    )
+
+
+def _merge(snapshot: SituationSnapshot, adapter: BabblyAdapter, report: AdapterReport) -> None:
+    snapshot.extend(report.observations, report.recommendations)
+    snapshot.set_system_state(adapter.name, str(report.health or "online"))
+
+
+def _optional_positive(value: Optional[object]) -> Optional[float]:
+    if value is None:
+        return None
+    number = float(value)
+    return number if number > 0 else None
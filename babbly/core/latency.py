@@ -0,0 +1,50 @@
+"""Bounded latency statistics for long-running loops."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyStats:
+    """Count, mean and recent percentiles of observed latencies in ms.
+
+    Lifetime count/total/max are exact; percentiles cover the last ``window``
+    observations so memory stays bounded in an always-on process.
+    """
+
+    def __init__(self, window: int = 256):
+        self._recent: Deque[float] = deque(maxlen=max(1, int(window)))
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: Optional[float] = None
+
+    def record(self, elapsed_ms: float) -> None:
+        value = max(0.0, float(elapsed_ms))
+        with self._lock:
+            self._recent.append(value)
+            self.count += 1
+            self.total_ms += value
+            self.max_ms = max(self.max_ms, value)
+            self.last_ms = value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._recent)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max_ms if self.count else None,
+            "last_ms": self.last_ms,
+        }
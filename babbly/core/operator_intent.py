@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Mapping as _MappingABC
 from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Any, Mapping, Optional
+from typing import Any, Iterator, Mapping, Optional
 from uuid import uuid4
 
+from babbly.core.situation import SituationSnapshot
+
 
 SCHEMA_VERSION = "babbly.operator-intent.v1"
 
@@ -74,6 +77,34 @@ class OperatorIntent:
         return replace(self, source_modality=modality)
 
 
+class SnapshotPayload(_MappingABC):
+    """Result payload whose ``snapshot`` entry is serialized on first access.
+
+    In-process readers use ``OperatorResult.snapshot`` directly; the dict form
+    is only built when something reads ``payload["snapshot"]`` or serializes
+    the result for a wire boundary.
+    """
+
+    def __init__(self, snapshot: SituationSnapshot, extra: Optional[Mapping[str, Any]] = None) -> None:
+        self._snapshot = snapshot
+        self._extra = dict(extra or {})
+        self._serialized: Optional[dict[str, Any]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "snapshot":
+            if self._serialized is None:
+                self._serialized = self._snapshot.to_dict()
+            return self._serialized
+        return self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield "snapshot"
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return 1 + len(self._extra)
+
+
 @dataclass(frozen=True)
 class OperatorResult:
     intent_id: str
@@ -83,6 +114,14 @@ class OperatorResult:
     payload: Mapping[str, Any] = field(default_factory=dict)
     confirmation_id: Optional[str] = None
     message_code: Optional[str] = None
+    # Typed snapshot for in-process renderers; not part of the wire form.
+    snapshot: Optional[SituationSnapshot] = field(default=None, compare=False, repr=False)
+
+    def situation(self) -> SituationSnapshot:
+        """Return the typed snapshot, decoding the payload only as a fallback."""
+        if self.snapshot is not None:
+            return self.snapshot
+        return SituationSnapshot.from_dict(self.payload.get("snapshot", {}))
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -11,6 +11,7 @@ from babbly.core.operator_intent import (
     OperatorContext,
     OperatorIntent,
     OperatorResult,
+    SnapshotPayload,
     SourceModality,
 )
 from babbly.core.request import (
@@ -19,6 +20,7 @@ from babbly.core.request import (
     ControlledRequestManager,
     RiskClass,
 )
+from babbly.core.situation import SituationSnapshot
 
 
 class OperatorIntentRuntime:
@@ -67,25 +69,31 @@ class OperatorIntentRuntime:
             normalized[str(name)] = risk if isinstance(risk, RiskClass) else RiskClass(str(risk))
         return normalized
 
-    def submit(self, intent: OperatorIntent) -> OperatorResult:
+    def submit(self, intent: OperatorIntent, *, snapshot: Optional[SituationSnapshot] = None) -> OperatorResult:
+        """Run one intent.
+
+        ``snapshot`` is a situation snapshot already collected for this intent
+        (e.g. speculatively while the operator was still speaking). Only the
+        read-only situation intents use it.
+        """
         bound = self.context.bind(intent)
 
         if bound.intent_id == "situation.report":
-            snapshot = self.situation_engine.collect()
+            snapshot = snapshot if snapshot is not None else self.situation_engine.collect()
             return OperatorResult(
                 intent_id=bound.intent_id,
                 status="ok",
                 correlation_id=bound.correlation_id,
                 audit_id=bound.audit_id,
-                payload={"snapshot": snapshot.to_dict()},
+                payload=SnapshotPayload(snapshot),
                 message_code="situation.snapshot",
+                snapshot=snapshot,
             )
 
         if bound.intent_id == "recommendation.explain":
-            snapshot = self.situation_engine.collect()
+            snapshot = snapshot if snapshot is not None else self.situation_engine.collect()
             top = snapshot.recommendations[0] if snapshot.recommendations else None
-            payload = {
-                "snapshot": snapshot.to_dict(),
+            extra = {
                 "recommendation": (
                     {
                         "source": top.source,
@@ -104,8 +112,9 @@ class OperatorIntentRuntime:
                 status="ok",
                 correlation_id=bound.correlation_id,
                 audit_id=bound.audit_id,
-                payload=payload,
+                payload=SnapshotPayload(snapshot, extra),
                 message_code="recommendation.snapshot",
+                snapshot=snapshot,
             )
 
         if bound.intent_id == "attention.set":
@@ -0,0 +1,111 @@
+"""Background refresh of one shared SituationSnapshot.
+
+Every surface (voice, Web, EUD sessions) reads situation state through the
+operator runtime. Without a poller each read is a full ``SituationEngine``
+collection and an upstream fetch, so load on external systems grows with the
+number of attached surfaces. ``SituationPoller`` collects on a fixed cadence
+instead, freezes the result, and publishes it with a monotonic revision; every
+reader gets the same immutable snapshot in O(1).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from babbly.core.engine import SituationEngine
+from babbly.core.situation import SituationSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PublishedSituation:
+    revision: int
+    snapshot: SituationSnapshot
+    collected_at: float
+
+
+class SituationPoller:
+    """Drop-in ``collect()`` source backed by a background collection thread.
+
+    ``collect()`` returns the latest published snapshot without touching any
+    adapter. Before the first background cycle completes it performs one
+    synchronous refresh so early readers never see an empty placeholder.
+    """
+
+    def __init__(
+        self,
+        engine: SituationEngine,
+        *,
+        interval_sec: float = 2.0,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.engine = engine
+        self.interval_sec = max(0.1, float(interval_sec))
+        self._clock = clock or time.monotonic
+        self._published: Optional[PublishedSituation] = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def revision(self) -> int:
+        published = self._published
+        return published.revision if published is not None else 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self) -> Optional[PublishedSituation]:
+        return self._published
+
+    def collect(self) -> SituationSnapshot:
+        published = self._published
+        if published is None:
+            published = self.refresh()
+        return published.snapshot
+
+    def refresh(self) -> PublishedSituation:
+        """Collect now and publish the result under the next revision."""
+        with self._refresh_lock:
+            snapshot = self.engine.collect().freeze()
+            previous = self._published
+            published = PublishedSituation(
+                revision=(previous.revision if previous is not None else 0) + 1,
+                snapshot=snapshot,
+                collected_at=self._clock(),
+            )
+            # A single reference assignment is the publication point; readers
+            # never observe a partially built snapshot.
+            self._published = published
+            return published
+
+    def start(self) -> "SituationPoller":
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="babbly-situation-poller", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=timeout if timeout is not None else self.interval_sec + 1.0)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the last good snapshot; adapter failures are
+                # already represented as system state inside collect().
+                logger.exception("situation refresh failed")
+            self._stop.wait(self.interval_sec)
@@ -3,7 +3,7 @@ from babbly.core.attention import (
     OperatorAttentionState,
     policy_for,
 )
-from babbly.core.situation import Recommendation, SituationSnapshot
+from babbly.core.situation import UNAVAILABLE_STATES, Recommendation, SituationSnapshot
 
 
 STATUS_JA = {
@@ -21,7 +21,7 @@ def render_situation_ja(snapshot: SituationSnapshot, max_observations: int = 2)
     parts = [f"現在の状態は{status}です"]
 
     online = sum(1 for state in snapshot.systems.values() if state == "online")
-    errors = sum(1 for state in snapshot.systems.values() if state == "error")
+    errors = sum(1 for state in snapshot.systems.values() if state in UNAVAILABLE_STATES)
     if snapshot.systems:
         parts.append(f"接続系統は{online}件正常")
         if errors:
@@ -75,7 +75,7 @@ def render_situation_for_attention(
 
     if policy.include_adapter_health and snapshot.systems:
         online = sum(1 for value in snapshot.systems.values() if value == "online")
-        errors = sum(1 for value in snapshot.systems.values() if value == "error")
+        errors = sum(1 for value in snapshot.systems.values() if value in UNAVAILABLE_STATES)
         parts.append(f"接続系統は{online}件正常")
         if errors:
             parts.append(f"{errors}件で取得エラー")
@@ -8,7 +8,6 @@ from uuid import uuid4
 
 from babbly.core.operator_intent import OperatorIntent, SourceModality
 from babbly.core.operator_runtime import OperatorIntentRuntime
-from babbly.core.situation import SituationSnapshot
 from babbly.core.surface import build_situation_view
 
 
@@ -190,7 +189,7 @@ class CoreSessionEndpoint:
         result = self.runtime.submit(
             OperatorIntent(intent_id="situation.report", source_modality=SourceModality.EUD)
         )
-        snapshot = SituationSnapshot.from_dict(result.payload.get("snapshot", {}))
+        snapshot = result.situation()
         pending = self.runtime.context.pending_intent
         pending_view = None
         if pending is not None:
@@ -200,11 +199,18 @@ class CoreSessionEndpoint:
                 "target_ref": pending.target_ref,
             }
         view = build_situation_view(snapshot, self.runtime.attention.state, pending_confirmation=pending_view)
-        return {
+        envelope = {
             "revision": self._revision,
             "generated_at": self._clock(),
             "view": view,
         }
+        # A background poller publishes snapshots under its own monotonic
+        # revision; expose it so clients can tell a new collection from a
+        # re-read of the same one.
+        situation_revision = getattr(self.runtime.situation_engine, "revision", None)
+        if situation_revision is not None:
+            envelope["situation_revision"] = situation_revision
+        return envelope
 
     def _check_auth(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if self._expected_token is None:
@@ -1,8 +1,16 @@
+import bisect
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Mapping, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 
+# Adapter health states that mean "no current data from this source". A
+# ``timeout`` is a source that missed its collection deadline.
+UNAVAILABLE_STATES = frozenset({"error", "timeout"})
+
+_SEVERITY_RANK = {"info": 0, "caution": 1, "warning": 2, "critical": 3}
+
 @dataclass(frozen=True)
 class Observation:
     source: str
@@ -33,46 +41,106 @@ class SituationSnapshot:
     recommendations: List[Recommendation] = field(default_factory=list)
     systems: Dict[str, str] = field(default_factory=dict)
 
+    @property
+    def frozen(self) -> bool:
+        return getattr(self, "_frozen", False)
+
+    def freeze(self) -> "SituationSnapshot":
+        """Make this snapshot immutable so it can be shared between readers.
+
+        Observations and recommendations become tuples and systems a read-only
+        mapping. Further ``add_*``/``set_system_state`` calls raise.
+        """
+        if not self.frozen:
+            self.observations = tuple(self.observations)
+            self.recommendations = tuple(self.recommendations)
+            self.systems = MappingProxyType(dict(self.systems))
+            self._frozen = True
+        return self
+
+    def _check_mutable(self) -> None:
+        if self.frozen:
+            raise RuntimeError("SituationSnapshot is frozen")
+
     def add_observation(self, observation: Observation) -> None:
+        self._check_mutable()
         self.observations.append(observation)
-        self._recompute_status()
+        self._raise_status((observation,))
 
     def add_recommendation(self, recommendation: Recommendation) -> None:
-        self.recommendations.append(recommendation)
-        self.recommendations.sort(key=lambda item: item.priority)
+        self._check_mutable()
+        # Stable: an equal priority goes after the ones already present.
+        bisect.insort_right(self.recommendations, recommendation, key=_priority)
+
+    def extend(
+        self,
+        observations: Iterable[Observation] = (),
+        recommendations: Iterable[Recommendation] = (),
+    ) -> None:
+        """Add many items at once: one severity pass and at most one sort."""
+        self._check_mutable()
+        added = list(observations)
+        self.observations.extend(added)
+        self._raise_status(added)
+        ranked = list(recommendations)
+        if ranked:
+            self.recommendations.extend(ranked)
+            self.recommendations.sort(key=_priority)
 
     def set_system_state(self, system: str, state: str) -> None:
+        self._check_mutable()
         self.systems[system] = state
 
-    def _recompute_status(self) -> None:
-        rank = {"info": 0, "caution": 1, "warning": 2, "critical": 3}
-        current = "info"
-        for observation in self.observations:
-            if rank.get(observation.severity, 0) > rank.get(current, 0):
+    def _raise_status(self, added: Iterable[Observation]) -> None:
+        """Fold new observations into the running max severity.
+
+        Status is the highest observation severity, so only the new items need
+        to be inspected; unknown severities rank as ``info``.
+        """
+        if not self.observations:
+            return
+        current = self.status if self.status in _SEVERITY_RANK else "info"
+        best = _SEVERITY_RANK[current]
+        for observation in added:
+            rank = _SEVERITY_RANK.get(observation.severity, 0)
+            if rank > best:
+                best = rank
                 current = observation.severity
-        self.status = current if self.observations else "unknown"
+        self.status = current
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        """Serialize for a wire boundary.
+
+        A frozen snapshot never changes, so its serialization is computed once
+        and the same dict is returned afterwards; treat it as read-only.
+        """
+        cached = getattr(self, "_dict_cache", None)
+        if cached is not None:
+            return cached
+        payload = {
             "status": self.status,
             "systems": dict(self.systems),
             "observations": [asdict(item) for item in self.observations],
             "recommendations": [asdict(item) for item in self.recommendations],
         }
+        if self.frozen:
+            self._dict_cache = payload
+        return payload
 
     @classmethod
     def from_dict(cls, payload: Mapping[str, Any]) -> "SituationSnapshot":
-        snapshot = cls(status=str(payload.get("status") or "unknown"))
+        snapshot = cls()
         systems = payload.get("systems") or {}
         if isinstance(systems, Mapping):
             snapshot.systems = {str(key): str(value) for key, value in systems.items()}
 
+        parsed_observations = []
         observations = payload.get("observations") or []
         if isinstance(observations, list):
             for item in observations:
                 if not isinstance(item, Mapping):
                     continue
-                snapshot.observations.append(
+                parsed_observations.append(
                     Observation(
                         source=str(item.get("source") or "unknown"),
                         category=str(item.get("category") or "unknown"),
@@ -84,12 +152,13 @@ class SituationSnapshot:
                     )
                 )
 
+        parsed_recommendations = []
         recommendations = payload.get("recommendations") or []
         if isinstance(recommendations, list):
             for item in recommendations:
                 if not isinstance(item, Mapping):
                     continue
-                snapshot.recommendations.append(
+                parsed_recommendations.append(
                     Recommendation(
                         source=str(item.get("source") or "unknown"),
                         action=str(item.get("action") or ""),
@@ -99,5 +168,11 @@ class SituationSnapshot:
                         advisory_only=bool(item.get("advisory_only", True)),
                     )
                 )
-        snapshot.recommendations.sort(key=lambda item: item.priority)
+        snapshot.extend(parsed_observations, parsed_recommendations)
+        # The wire status is authoritative; it is not re-derived on decode.
+        snapshot.status = str(payload.get("status") or "unknown")
         return snapshot
+
+
+def _priority(recommendation: Recommendation) -> int:
+    return recommendation.priority
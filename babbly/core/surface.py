@@ -4,7 +4,7 @@ from typing import Any, Dict, List, Optional
 
 from babbly.core.attention import OperatorAttentionState, policy_for
 from babbly.core.render import STATUS_JA
-from babbly.core.situation import SituationSnapshot
+from babbly.core.situation import UNAVAILABLE_STATES, SituationSnapshot
 
 
 _SEVERITY_ORDER = {"critical": 0, "warning": 1, "caution": 2, "info": 3}
@@ -27,7 +27,7 @@ def build_situation_view(
     policy = policy_for(state)
 
     online = sum(1 for value in snapshot.systems.values() if value == "online")
-    errors = sum(1 for value in snapshot.systems.values() if value == "error")
+    errors = sum(1 for value in snapshot.systems.values() if value in UNAVAILABLE_STATES)
     systems_summary = {"online": online, "error": errors, "total": len(snapshot.systems)}
 
     observations = [
@@ -5,23 +5,22 @@ import logging
 import pyfiglet
 from babbly.en.vosk_asr_module import initialize_vosk_asr, get_asr_result
 from babbly.en.english_tts import English_TTS
-from babbly.modules.ipaddress_manager import IPAddressManager
-from babbly.modules.operation_manager import OperationManager
 from babbly.modules.network_scanner import NetworkScanner
+from babbly.modules.registry import RegistryService
 from babbly.modules.utils import load_config, assist_command_mode, select_target, introduce
-from babbly.modules.commands_manager import CommandManager
 
 tts = English_TTS()
 lang_ja = 0
 
 def set_globals(config):
-    global WAKEUP_PHRASE, EXIT_PHRASE, COMMANDS_PATH, TARGETS_PATH, SOP_PATH, MODEL_PATH
+    global WAKEUP_PHRASE, EXIT_PHRASE, COMMANDS_PATH, TARGETS_PATH, SOP_PATH, MODEL_PATH, registry
     WAKEUP_PHRASE = config.get("WAKEUP_PHRASE")
     EXIT_PHRASE = config.get("EXIT_PHRASE")
     COMMANDS_PATH = config.get("COMMANDS_PATH")
     TARGETS_PATH = config.get("TARGETS_PATH")
     SOP_PATH = config.get("SOP_PATH")
     MODEL_PATH = config.get("MODEL_PATH")
+    registry = RegistryService(COMMANDS_PATH, TARGETS_PATH, SOP_PATH)
 
 
 def merge_target_with_next(array, target):
@@ -63,13 +62,14 @@ def listen_for_command(vosk_asr):
 
     :param:vosk_asr (VoskStreamingASR): Voice Recognition Module
     """
-    cmd_mgr = CommandManager(COMMANDS_PATH)
+    registry.refresh()
+    cmd_mgr = registry.commands
     command_dict = cmd_mgr.get_search_dict()
 
-    ip_mgr = IPAddressManager(TARGETS_PATH)
+    ip_mgr = registry.targets
     target_dict = ip_mgr.get_search_dict()
 
-    op_mgr = OperationManager(SOP_PATH)
+    op_mgr = registry.operations
     operation_dict = op_mgr.get_search_dict()
 
     try:
@@ -22,27 +22,43 @@ SOFTWARE.
 """
 
 import json
-import queue
-import sys
+import math
+import threading
 import os
 from collections import namedtuple
 import sounddevice as sd
 from vosk import KaldiRecognizer, Model, SetLogLevel
 from dotenv import load_dotenv
 
+from babbly.audio.ring import DROP_OLDEST, AudioQueueStats, ChunkRing, XrunLog
+
 load_dotenv()
 # MODEL_PATH = os.getenv("MODEL_PATH")
 MODEL_PATH = "babbly/EN/model"
 
+# Upper bound on unread audio, so a stalled recognizer cannot grow the buffer
+# without limit.
+MAX_BUFFER_SECONDS = 30.0
+
 class MicrophoneStream:
-    """Class for microphone audio input."""
-    def __init__(self, rate, chunk):
+    """Class for microphone audio input.
+
+    Blocks are copied into a preallocated ring of at most ``max_seconds``;
+    when it is full the ``drop_policy`` ("oldest" or "newest") decides which
+    chunk is lost, and ``stats()`` reports the drops and device xruns.
+    """
+    def __init__(self, rate, chunk, drop_policy=DROP_OLDEST, max_seconds=MAX_BUFFER_SECONDS):
         self.rate = rate
         self.chunk = chunk
-        self.buff = queue.Queue()
+        capacity = max(1, math.ceil(float(max_seconds) * rate / chunk)) if chunk else 1
+        self._ring = ChunkRing(capacity, 2 * chunk, policy=drop_policy)
+        self._xruns = XrunLog(name="vosk microphone")
+        self._cond = threading.Condition()
         self.input_stream = None
 
     def open_stream(self):
+        with self._cond:
+            self._ring.clear()
         self.input_stream = sd.RawInputStream(
             samplerate=self.rate,
             blocksize=self.chunk,
@@ -52,25 +68,30 @@ class MicrophoneStream:
         )
 
     def callback(self, indata, frames, time, status):
-        if status:
-            print(status, file=sys.stderr)
-        self.buff.put(bytes(indata))
+        with self._cond:
+            self._xruns.record(status)
+            self._ring.push(indata)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return AudioQueueStats(
+                depth=len(self._ring),
+                capacity=self._ring.capacity,
+                high_water=self._ring.high_water,
+                overflows=self._ring.overflows,
+                xruns=self._xruns.xruns,
+                underruns=self._xruns.underruns,
+                policy=self._ring.policy,
+            )
 
     def generator(self):
         while True:
-            chunk = self.buff.get()
-            if chunk is None:
-                return
-            data = [chunk]
-            while True:
-                try:
-                    chunk = self.buff.get(block=False)
-                    if chunk is None:
-                        return
-                    data.append(chunk)
-                except queue.Empty:
-                    break
-            yield b"".join(data)
+            with self._cond:
+                while not len(self._ring):
+                    self._cond.wait()
+                data = self._ring.drain()
+            yield data
 
 def get_asr_result(vosk_asr):
     """Execute the speech recognition API to obtain the final recognition result."""
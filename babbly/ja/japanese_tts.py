@@ -81,6 +81,43 @@ class Japanese_TTS:
         
         return wave
     
+    def synthesize(self,
+                   text: str,
+                   preset: Optional[str] = None,
+                   half_tone: float = 0.0,
+                   **kwargs) -> Tuple[np.ndarray, int, Dict[str, float]]:
+        """
+        ファイル保存・再生なしで音声波形を生成する
+
+        Args:
+            text (str): 読み上げるテキスト
+            preset (Optional[str]): 使用するプリセット名
+            half_tone (float): 声の高さ（半音単位、pyopenjtalkに渡す）
+            **kwargs: 個別の設定値（speed_rate, alpha, master_volume）
+
+        Returns:
+            Tuple[np.ndarray, int, Dict[str, float]]: ピーク1.0に正規化した波形、サンプリング周波数、使用された設定値
+        """
+        # 設定の取得
+        settings = self.default_settings.copy()
+        if preset and preset in self.presets:
+            settings.update(self.presets[preset])
+        settings.update({k: v for k, v in kwargs.items() if k in settings})
+        
+        # テキストの前処理
+        processed_text = self._process_text(text)
+        
+        # 音声合成
+        wave, sr = pyopenjtalk.tts(processed_text, half_tone=half_tone)
+        
+        # 波形の調整
+        wave = self._adjust_wave(
+            wave,
+            settings['speed_rate'],
+            settings['master_volume']
+        )
+        return wave, sr, settings
+    
     def play_voice(self, filepath: str) -> None:
         """音声ファイルを再生"""
         try:
@@ -109,29 +146,12 @@ class Japanese_TTS:
         Returns:
             VoiceResult: 生成された音声の情報
         """
-        # 設定の取得
-        settings = self.default_settings.copy()
-        if preset and preset in self.presets:
-            settings.update(self.presets[preset])
-        settings.update({k: v for k, v in kwargs.items() if k in settings})
-        
         # 出力ファイル名の設定
         if output_filename is None:
             output_filename = "speech.wav"
         output_path = os.path.join(output_filename)
         
-        # テキストの前処理
-        processed_text = self._process_text(text)
-        
-        # 音声合成
-        wave, sr = pyopenjtalk.tts(processed_text)
-        
-        # 波形の調整
-        wave = self._adjust_wave(
-            wave,
-            settings['speed_rate'],
-            settings['master_volume']
-        )
+        wave, sr, settings = self.synthesize(text, preset=preset, **kwargs)
         
         # ファイルの保存
         wavfile.write(output_path, sr, (wave * 32767).astype(np.int16))
@@ -2,11 +2,16 @@
 import argparse
 import logging
 import sys
+from dataclasses import replace
 
 import pyfiglet
 
-from babbly.adapters.factory import create_situation_engine
-from babbly.asr import create_asr
+from babbly.adapters.factory import create_situation_engine, create_situation_poller
+from babbly.asr import ASRResult, create_asr
+from babbly.asr.grammar import create_vosk_grammar
+from babbly.asr.tiers import listen_in_state, stream_in_state
+from babbly.audio import create_audio_capture
+from babbly.benchmark.runtime import write_json_atomic
 from babbly.core.engine import SituationEngine
 from babbly.core.operator_intent import OperatorIntent, SourceModality
 from babbly.core.operator_runtime import OperatorIntentRuntime
@@ -15,18 +20,19 @@ from babbly.core.render import (
     render_situation_for_attention,
 )
 from babbly.core.runtime_factory import build_operator_runtime
-from babbly.core.situation import SituationSnapshot
 from babbly.ja.japanese_tts import Japanese_TTS
-from babbly.modules.commands_manager import CommandManager
-from babbly.modules.ipaddress_manager import IPAddressManager
 from babbly.modules.network_scanner import NetworkScanner
-from babbly.modules.operation_manager import OperationManager
+from babbly.modules.registry import RegistryService
 from babbly.modules.utils import analyze_text, assist_command_mode, load_config, select_target
-from babbly.nlu.japanese import IntentResolver, normalize_japanese
+from babbly.nlu.confidence import utterance_confidence
+from babbly.nlu.japanese import CONFIRM_NO, CONFIRM_YES, IntentResolver
+from babbly.nlu.nbest import create_nbest_reranker, hypothesis_confidence
 from babbly.nlu.policy import Decision, IntentPolicy
+from babbly.nlu.speculative import SpeculativeIntentPipeline
+from babbly.nlu.tokenizer import create_tokenizer, set_tokenizer
 from babbly.nlu.vocabulary import build_aliases
 from babbly.profiles import apply_profile_to_config, list_profiles, load_profile, resolve_profile_name
-from babbly.wake import create_wake_detector
+from babbly.wake import create_wake_detector, resolve_one_shot
 
 
 tts = Japanese_TTS()
@@ -34,6 +40,8 @@ lang_ja = 1
 situation_engine = SituationEngine()
 operator_runtime = OperatorIntentRuntime(situation_engine)
 agent_profile = None
+speculation = None
+nbest_reranker = None
 
 
 def set_situation_engine(engine):
@@ -61,15 +69,43 @@ def configure_operator_runtime(config, engine):
     operator_runtime = build_operator_runtime(config, engine)
 
 
+def configure_speculation(config):
+    """Prefetch the situation snapshot while a read-only request is still spoken.
+
+    Off unless ``SPECULATIVE_INTENTS`` is set. Only read-only intents can be
+    prefetched; the final hypothesis still goes through the intent policy.
+    """
+    global speculation
+    if speculation is not None:
+        speculation.close()
+        speculation = None
+    if not bool(config.get("SPECULATIVE_INTENTS", False)):
+        return None
+
+    def collect_snapshot(_intent):
+        return operator_runtime.situation_engine.collect()
+
+    speculation = SpeculativeIntentPipeline(
+        intent_resolver,
+        intent_policy,
+        {"situation.report": collect_snapshot, "recommendation.explain": collect_snapshot},
+        read_only=OperatorIntentRuntime.READ_ONLY_INTENTS,
+    )
+    return speculation
+
+
 def set_globals(config):
-    global WAKEUP_PHRASE, EXIT_PHRASE, COMMANDS_PATH, TARGETS_PATH, SOP_PATH, DRY_RUN
-    global intent_resolver, intent_policy, domain_aliases, operator_runtime
+    global WAKEUP_PHRASE, EXIT_PHRASE, COMMANDS_PATH, TARGETS_PATH, SOP_PATH, DRY_RUN, ONE_SHOT
+    global intent_resolver, intent_policy, domain_aliases, operator_runtime, registry, nbest_reranker
+    global CONFIDENCE_TERM_WEIGHT
     WAKEUP_PHRASE = config.get("WAKEUP_PHRASE")
     EXIT_PHRASE = config.get("EXIT_PHRASE")
     COMMANDS_PATH = config.get("COMMANDS_PATH")
     TARGETS_PATH = config.get("TARGETS_PATH")
     SOP_PATH = config.get("SOP_PATH")
+    registry = RegistryService(COMMANDS_PATH, TARGETS_PATH, SOP_PATH)
     DRY_RUN = bool(config.get("DRY_RUN", False))
+    ONE_SHOT = bool(config.get("WAKE_ONE_SHOT", False))
     operator_runtime.dry_run = DRY_RUN
 
     packs = config.get("DOMAIN_VOCABULARY", ["core", "kali"])
@@ -78,6 +114,13 @@ def set_globals(config):
     intent_policy = IntentPolicy(
         execute_threshold=float(config.get("INTENT_EXECUTE_THRESHOLD", 0.90)),
         clarify_threshold=float(config.get("INTENT_CLARIFY_THRESHOLD", 0.60)),
+        read_only=OperatorIntentRuntime.READ_ONLY_INTENTS,
+        read_only_execute_threshold=config.get("INTENT_READ_ONLY_EXECUTE_THRESHOLD"),
+    )
+    CONFIDENCE_TERM_WEIGHT = float(config.get("CONFIDENCE_TERM_WEIGHT", 3.0))
+    # Picks among ASR N-best hypotheses when ASR_ALTERNATIVES > 1.
+    nbest_reranker = create_nbest_reranker(
+        config, intent_resolver, registry, read_only=OperatorIntentRuntime.READ_ONLY_INTENTS
     )
 
 
@@ -109,22 +152,45 @@ def introduce_agent():
         tts.say(sentence)
 
 
-def listen_result(asr):
-    result = asr.listen()
+def listen_result(asr, state="command"):
+    result = listen_in_state(asr, state)
+    _log_asr_result(result)
+    return result
+
+
+def listen_command(asr):
+    """Listen for a command; returns ``(ASRResult, SpeculativeOutcome | None)``."""
+    if speculation is None:
+        return listen_result(asr), None
+    outcome = speculation.run(stream_in_state(asr, "command"))
+    if outcome is None:
+        # The stream closed before a final hypothesis.
+        return ASRResult(text=""), None
+    _log_asr_result(outcome.result)
+    if outcome.speculated:
+        logging.info(
+            "speculation intent=%s committed=%s partials=%d",
+            outcome.speculated,
+            outcome.committed,
+            outcome.partials,
+        )
+    return outcome.result, outcome
+
+
+def _log_asr_result(result):
     if result.is_empty:
-        return result
+        return
     confidence = "unknown" if result.confidence is None else f"{result.confidence:.2f}"
     logging.info("ASR backend=%s confidence=%s text=%s", result.backend, confidence, result.text)
-    return result
 
 
 def ask_confirmation(asr, prompt):
     tts.say(prompt + "。よろしければ、はい。中止する場合は、いいえ、と答えてください")
-    result = listen_result(asr)
-    normalized = normalize_japanese(result.text, domain_aliases)
-    if any(token in normalized for token in ("はい", "実行", "お願いします", "よし")):
+    result = listen_result(asr, "confirm")
+    normalized = intent_resolver.normalizer(result.text)
+    if any(token in normalized for token in CONFIRM_YES):
         return True
-    if any(token in normalized for token in ("いいえ", "中止", "やめ", "キャンセル")):
+    if any(token in normalized for token in CONFIRM_NO):
         return False
     tts.say("確認できなかったため実行しません")
     return False
@@ -139,18 +205,18 @@ def report_dry_run(action, detail=""):
     tts.say("ドライランのため、実際の処理は実行しません")
 
 
-def speak_situation_report(confidence=None):
-    result = operator_runtime.submit(_voice_intent("situation.report", confidence=confidence))
-    snapshot = SituationSnapshot.from_dict(result.payload.get("snapshot", {}))
+def speak_situation_report(confidence=None, snapshot=None):
+    result = operator_runtime.submit(_voice_intent("situation.report", confidence=confidence), snapshot=snapshot)
+    snapshot = result.situation()
     # Render at the current operator-attention density (NORMAL/HEADS_UP/CRITICAL).
     message = render_situation_for_attention(snapshot, operator_runtime.attention.state)
     print(message)
     tts.say(message)
 
 
-def speak_recommendation(confidence=None):
-    result = operator_runtime.submit(_voice_intent("recommendation.explain", confidence=confidence))
-    snapshot = SituationSnapshot.from_dict(result.payload.get("snapshot", {}))
+def speak_recommendation(confidence=None, snapshot=None):
+    result = operator_runtime.submit(_voice_intent("recommendation.explain", confidence=confidence), snapshot=snapshot)
+    snapshot = result.situation()
     message = render_recommendation_for_attention(snapshot, operator_runtime.attention.state)
     print(message)
     tts.say(message)
@@ -166,6 +232,7 @@ _ATTENTION_PHRASES = (
     ("通常モード", "normal"),
 )
 _ATTENTION_LABELS = {"normal": "通常", "heads_up": "ヘッドアップ", "critical": "クリティカル"}
+_REGISTRY_LABELS = {"commands": "コマンド", "targets": "ターゲット", "operations": "SOP"}
 
 
 def maybe_set_attention(normalized):
@@ -198,6 +265,12 @@ def wait_for_wakeup(wake_detector, asr):
                 confidence,
             )
             print(f"ウェイクアップ検知: {result.keyword} ({result.backend})")
+            # "バブリー、状況報告" in one breath skips the acknowledgement turn.
+            command = resolve_one_shot(result, intent_resolver, asr) if ONE_SHOT else None
+            if command is not None:
+                logging.info("one-shot command text=%s", command.text)
+                listen_for_command(asr, first=command)
+                continue
             tts.say(_persona_value("acknowledgement", "はい、ボス"))
             listen_for_command(asr)
     except KeyboardInterrupt:
@@ -206,27 +279,69 @@ def wait_for_wakeup(wake_detector, asr):
         raise SystemExit(0)
 
 
-def listen_for_command(asr):
-    cmd_mgr = CommandManager(COMMANDS_PATH)
+def listen_for_command(asr, first=None):
+    """Run command turns until one completes.
+
+    ``first`` is a command already recognized with the wake phrase; it is
+    handled before listening, without the spoken prompt.
+    """
+    # Registries are loaded once; a wake only pays a stat() per file unless a
+    # registry file changed since the last command.
+    registry.refresh()
+    cmd_mgr = registry.commands
     command_dict = cmd_mgr.get_search_dict()
-    ip_mgr = IPAddressManager(TARGETS_PATH)
-    op_mgr = OperationManager(SOP_PATH)
+    ip_mgr = registry.targets
+    op_mgr = registry.operations
 
     try:
-        print(f"コマンドを入力してください（終了するには {EXIT_PHRASE} を言ってください）")
-        tts.say(_persona_value("command_prompt", "指示をどうぞ"))
+        if first is None:
+            print(f"コマンドを入力してください（終了するには {EXIT_PHRASE} を言ってください）")
+            tts.say(_persona_value("command_prompt", "指示をどうぞ"))
 
         while True:
-            asr_result = listen_result(asr)
+            if first is not None:
+                asr_result, outcome, first = first, None, None
+            else:
+                asr_result, outcome = listen_command(asr)
             if asr_result.is_empty:
                 continue
 
             recog_text = asr_result.text
             print(f"認識テキスト: {recog_text}")
-            intent = intent_resolver.resolve(recog_text)
+            intent = outcome.intent if outcome is not None else intent_resolver.resolve(recog_text)
+            # A snapshot collected while the operator was still speaking; only
+            # handed over when the final hypothesis resolved to the same intent.
+            prefetched = outcome.prefetched if outcome is not None and outcome.committed else None
+            choice = None
+            if nbest_reranker is not None and asr_result.alternatives:
+                choice = nbest_reranker.rerank(asr_result)
+                if choice.rank:
+                    logging.info(
+                        "N-best rerank rank=%d prior=%.2f text=%s intent=%s",
+                        choice.rank,
+                        choice.prior,
+                        choice.text,
+                        choice.intent.name,
+                    )
+                    if choice.intent.name != intent.name:
+                        prefetched = None
+                    # Word confidences and the utterance score belong to the top hypothesis.
+                    asr_result = replace(
+                        asr_result,
+                        text=choice.text,
+                        words=(),
+                        confidence=hypothesis_confidence(asr_result, choice.rank),
+                    )
+                    recog_text = choice.text
+                    intent = choice.intent
             normalized = intent.normalized_text
             user_order = analyze_text(normalized)
-            policy = intent_policy.evaluate(intent, asr_result.confidence)
+            asr_confidence = utterance_confidence(
+                asr_result, intent, term_weight=CONFIDENCE_TERM_WEIGHT, normalize=intent_resolver.normalizer
+            )
+            policy = intent_policy.evaluate(intent, asr_confidence)
+            if choice is not None:
+                policy = nbest_reranker.gate(choice, policy)
             logging.info(
                 "intent=%s intent_confidence=%.2f decision=%s reason=%s normalized=%s",
                 intent.name,
@@ -236,7 +351,7 @@ def listen_for_command(asr):
                 normalized,
             )
 
-            if intent.name == "system.exit" or normalize_japanese(EXIT_PHRASE, domain_aliases) in normalized:
+            if intent.name == "system.exit" or intent_resolver.normalizer(EXIT_PHRASE) in normalized:
                 if policy.decision == Decision.REJECT:
                     tts.say("終了指示を確認できませんでした")
                     continue
@@ -263,11 +378,11 @@ def listen_for_command(asr):
                 break
 
             if intent.name == "situation.report":
-                speak_situation_report(intent.confidence)
+                speak_situation_report(intent.confidence, snapshot=prefetched)
                 break
 
             if intent.name == "recommendation.explain":
-                speak_recommendation(intent.confidence)
+                speak_recommendation(intent.confidence, snapshot=prefetched)
                 break
 
             if intent.name == "network.scan":
@@ -295,6 +410,18 @@ def listen_for_command(asr):
                     assist_command_mode(cmd_mgr, ip_mgr, asr, tts, command_dict, lang_ja)
                 break
 
+            if intent.name == "registry.reload":
+                failed = registry.reload()
+                if failed:
+                    # A file that fails to parse keeps the previously loaded registry.
+                    names = "、".join(_REGISTRY_LABELS.get(name, name) for name in failed)
+                    message = f"{names}の登録情報を読み込めませんでした。以前の内容を使います"
+                else:
+                    message = "登録情報を再読み込みしました"
+                print(message)
+                tts.say(message)
+                break
+
             ipaddress = cmd_name = op_name = None
             cmd_arg = None
             for word in user_order:
@@ -412,7 +539,8 @@ def main(argv=None):
     config = apply_profile_to_config(base_config, profile)
     set_agent_profile(profile)
     set_globals(config)
-    configure_operator_runtime(config, create_situation_engine(config))
+    set_tokenizer(create_tokenizer(config)).warm()
+    configure_speculation(config)
 
     ascii_art = pyfiglet.figlet_format(profile.identity.display_name, font="dos_rebel")
     print(ascii_art)
@@ -422,8 +550,25 @@ def main(argv=None):
     )
     logging.info("プログラム開始")
 
-    asr = create_asr(config)
-    wake_detector = create_wake_detector(config, asr, domain_aliases)
+    # One always-open microphone for wake, VAD and ASR when enabled.
+    capture = create_audio_capture(config)
+    if capture is not None:
+        capture.start()
+    # Optional per-state Vosk grammar from the intents, aliases and registries.
+    grammar = create_vosk_grammar(
+        config,
+        resolver=intent_resolver,
+        registry=registry,
+        extra_phrases=[phrase for phrase, _ in _ATTENTION_PHRASES],
+    )
+    asr = create_asr(config, capture=capture, grammar=grammar)
+    # Every adapter, the ASR's audio health included, exists before polling starts.
+    engine = create_situation_engine(config, asr)
+    situation_poller = create_situation_poller(config, engine)
+    if situation_poller is not None:
+        situation_poller.start()
+    configure_operator_runtime(config, situation_poller or engine)
+    wake_detector = create_wake_detector(config, asr, domain_aliases, capture=capture)
     logging.info(
         "設定読み込み完了 profile=%s agent=%s persona=%s dry_run=%s azazel_edge=%s asr=%s wake=%s",
         profile.id,
@@ -457,6 +602,37 @@ def main(argv=None):
         if web_server is not None:
             web_server.shutdown()
             web_server.server_close()
+        if situation_poller is not None:
+            situation_poller.stop()
+        if speculation is not None:
+            logging.info(
+                "speculation speculated=%d committed=%d discarded=%d",
+                speculation.speculations,
+                speculation.commits,
+                speculation.discards,
+            )
+            speculation.close()
+        if nbest_reranker is not None:
+            logging.info("N-best reranker stats: %s", nbest_reranker.stats())
+        engine.close()
+        latency_summary = getattr(asr, "latency_summary", None)
+        if callable(latency_summary):
+            logging.info("ASR latency by tier: %s", latency_summary())
+        wake_stats = getattr(wake_detector, "stats", None)
+        if callable(wake_stats):
+            stats = wake_stats()
+            logging.info("wake detector stats: %s", stats)
+            # Picked up by tools/capture_runtime_benchmark.py --stats-json.
+            if config.get("WAKE_STATS_PATH"):
+                write_json_atomic(str(config.get("WAKE_STATS_PATH")), stats)
+        close_wake = getattr(wake_detector, "close", None)
+        if callable(close_wake):
+            close_wake()
+        close_asr = getattr(asr, "close", None)
+        if callable(close_asr):
+            close_asr()
+        if capture is not None:
+            capture.close()
 
 
 if __name__ == '__main__':
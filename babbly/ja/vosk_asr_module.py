@@ -22,78 +22,337 @@ SOFTWARE.
 """
 
 import json
-import queue
-import sys
+import math
 import os
+import threading
 from collections import namedtuple
-import sounddevice as sd
-from vosk import KaldiRecognizer, Model, SetLogLevel
+
+from babbly.audio.ring import DROP_OLDEST, AudioQueueStats, ChunkRing, XrunLog
+
 # from dotenv import load_dotenv
 
 # load_dotenv()
 # MODEL_PATH = os.getenv("MODEL_PATH")
 MODEL_PATH = os.environ.get("MODEL_PATH")
 
+# Upper bound on unread audio while a consumer is listening, so a stalled
+# recognizer cannot grow the buffer without limit.
+MAX_ARMED_SECONDS = 30.0
+
+
 class MicrophoneStream:
-    """マイク音声入力のためのクラス."""
-    def __init__(self, rate, chunk):
+    """マイク音声入力のためのクラス.
+
+    The device is opened once and keeps capturing between utterances. While no
+    consumer is armed only the most recent ``preroll_ms`` of audio is kept, so
+    speech that starts just before the next ``listen`` is not lost and the
+    device open latency is paid once per process instead of once per utterance.
+
+    Blocks are copied into a preallocated ``ChunkRing`` holding at most
+    ``max_seconds`` of audio; when the recognizer falls behind the ring drops
+    by ``drop_policy`` ("oldest" or "newest") and counts it. ``stats()``
+    reports depth, drops and device xruns.
+    """
+    def __init__(self, rate, chunk, preroll_ms=0.0, capture=None, drop_policy=DROP_OLDEST, max_seconds=MAX_ARMED_SECONDS):
         self.rate = rate
         self.chunk = chunk
-        self.buff = queue.Queue()
+        self.capture = capture
         self.input_stream = None
+        chunk_ms = 1000.0 * chunk / rate
+        self.preroll_chunks = max(0, math.ceil(float(preroll_ms) / chunk_ms)) if chunk_ms > 0 else 0
+        self.max_chunks = max(1, math.ceil(float(max_seconds) * 1000.0 / chunk_ms)) if chunk_ms > 0 else 1
+        self._ring = ChunkRing(max(self.max_chunks, self.preroll_chunks), 2 * chunk, policy=drop_policy)
+        self._xruns = XrunLog(name="vosk microphone")
+        self._cond = threading.Condition()
+        self._armed = False
+        self._closed = False
 
     def open_stream(self):
-        self.input_stream = sd.RawInputStream(
-            samplerate=self.rate,
-            blocksize=self.chunk,
-            dtype="int16",
-            channels=1,
-            callback=self.callback,
-        )
+        if self.input_stream is None and self.capture is not None:
+            from babbly.audio.capture import CallbackStream
+
+            # Frames come from the shared capture bus instead of a device.
+            self.input_stream = CallbackStream(self.capture, self.callback, dtype="int16")
+        if self.input_stream is None:
+            import sounddevice as sd
+
+            self.input_stream = sd.RawInputStream(
+                samplerate=self.rate,
+                blocksize=self.chunk,
+                dtype="int16",
+                channels=1,
+                callback=self.callback,
+            )
+        return self.input_stream
+
+    def start(self):
+        """Open the device if needed and keep it capturing."""
+        stream = self.open_stream()
+        if not stream.active:
+            stream.start()
+        return self
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        stream, self.input_stream = self.input_stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
 
     def callback(self, indata, frames, time, status):
-        if status:
-            print(status, file=sys.stderr)
-        self.buff.put(bytes(indata))
+        with self._cond:
+            self._xruns.record(status)
+            self._ring.push(indata)
+            if not self._armed:
+                self._ring.trim(self.preroll_chunks)
+            self._cond.notify()
+
+    def arm(self):
+        """Start consuming; buffered pre-roll audio is delivered first."""
+        with self._cond:
+            self._armed = True
+            self._closed = False
+
+    def disarm(self):
+        with self._cond:
+            self._armed = False
+            self._ring.trim(self.preroll_chunks)
+
+    def stats(self):
+        """Current ``AudioQueueStats`` for logs and the audio health adapter."""
+        with self._cond:
+            return AudioQueueStats(
+                depth=len(self._ring),
+                capacity=self._ring.capacity,
+                high_water=self._ring.high_water,
+                overflows=self._ring.overflows,
+                xruns=self._xruns.xruns,
+                underruns=self._xruns.underruns,
+                policy=self._ring.policy,
+            )
 
     def generator(self):
         while True:
-            chunk = self.buff.get()
-            if chunk is None:
+            with self._cond:
+                while not len(self._ring) and not self._closed:
+                    self._cond.wait()
+                if not len(self._ring):
+                    return
+                data = self._ring.drain()
+            yield data
+
+
+def _join_words(text):
+    """空白記号を除去し、grammar の [unk] を捨てる."""
+    return "".join(word for word in text.split() if word != "[unk]")
+
+
+def _hypotheses(payload):
+    """``(text, score)`` pairs of one Vosk result, best first.
+
+    A recognizer with ``SetMaxAlternatives`` reports ``alternatives`` with a
+    log-domain ``confidence`` each; otherwise there is one unscored ``text``.
+    """
+    alternatives = payload.get("alternatives")
+    if alternatives is None:
+        return [(_join_words(payload.get("text", "")), None)]
+    hypotheses = [(_join_words(item.get("text", "")), item.get("confidence")) for item in alternatives]
+    return hypotheses or [("", None)]
+
+
+def _words(payload):
+    """``(word, conf, start, end)`` of the best hypothesis, from ``SetWords``.
+
+    Only 1-best results carry a per-word ``conf``; N-best word lists have
+    timings alone and yield nothing.
+    """
+    return [
+        (item["word"], float(item["conf"]), item.get("start"), item.get("end"))
+        for item in payload.get("result") or ()
+        if item.get("word") != "[unk]" and item.get("conf") is not None
+    ]
+
+
+def merge_results(payloads):
+    """``(hypotheses, words)`` of one utterance from its finalized segments.
+
+    Earlier segments contribute their best text and words; the alternatives
+    come from the last segment.
+    """
+    payloads = [payload for payload in payloads if _hypotheses(payload)[0][0]] or [{}]
+    prefix = "".join(_hypotheses(payload)[0][0] for payload in payloads[:-1])
+    hypotheses = [(prefix + text, score) for text, score in _hypotheses(payloads[-1])]
+    return hypotheses, [word for payload in payloads for word in _words(payload)]
+
+
+def stream_asr_results(vosk_asr, partials=True, recognizer=None, detailed=False):
+    """Yield ``(text, is_final)`` hypotheses for one utterance.
+
+    Partial hypotheses are yielded as they change (when ``partials`` is true)
+    so callers can start intent resolution early; the generator ends after the
+    final result. ``recognizer`` replaces the open-vocabulary one, e.g. with a
+    grammar-constrained recognizer for the current dialogue state. With
+    ``detailed`` each item gains the parsed final result (N-best list, word
+    confidences; empty for partials).
+    """
+    mic_stream = vosk_asr.microphone_stream
+    recognizer = recognizer or vosk_asr.recognizer
+    mic_stream.start()
+    mic_stream.arm()
+    last_partial = ""
+    try:
+        for content in mic_stream.generator():
+            if recognizer.AcceptWaveform(content):
+                payload = json.loads(recognizer.Result())
+                text = _hypotheses(payload)[0][0]
+                yield (text, True, payload) if detailed else (text, True)
                 return
-            data = [chunk]
-            while True:
-                try:
-                    chunk = self.buff.get(block=False)
-                    if chunk is None:
-                        return
-                    data.append(chunk)
-                except queue.Empty:
-                    break
-            yield b"".join(data)
-
-def get_asr_result(vosk_asr):
+            if partials:
+                partial = _join_words(json.loads(recognizer.PartialResult()).get("partial", ""))
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield (partial, False, {}) if detailed else (partial, False)
+    finally:
+        mic_stream.disarm()
+
+
+def get_asr_result(vosk_asr, recognizer=None):
     """音声認識APIを実行して最終的な認識結果を得る."""
+    for text, is_final in stream_asr_results(vosk_asr, partials=False, recognizer=recognizer):
+        if is_final:
+            return text
+    return None
+
+
+def capture_utterance(vosk_asr, rms_threshold=0.012, silence_sec=0.8, max_sec=12.0):
+    """Int16 PCM of the next utterance, with silence never reaching a recognizer.
+
+    Chunks are screened with ``EnergyVad``; the chunk before speech starts is
+    kept as lead-in, and the utterance ends after ``silence_sec`` of quiet or
+    at ``max_sec``. Returns ``b""`` when the stream closes without speech.
+    """
+    import numpy as np
+
+    from babbly.wake.vad import EnergyVad, VadEvent
+
     mic_stream = vosk_asr.microphone_stream
-    mic_stream.open_stream()
-    with mic_stream.input_stream:
-        audio_generator = mic_stream.generator()
-        for content in audio_generator:
-            if vosk_asr.recognizer.AcceptWaveform(content):
-                recog_result = json.loads(vosk_asr.recognizer.Result())
-                recog_text = recog_result["text"].split()
-                recog_text = "".join(recog_text)  # 空白記号を除去
-                return recog_text
-        return None
-
-def initialize_vosk_asr(model_path=MODEL_PATH, chunk_size=8000):
+    chunk_sec = mic_stream.chunk / float(mic_stream.rate)
+    vad = EnergyVad(
+        rms_threshold=rms_threshold,
+        hangover_frames=max(1, math.ceil(float(silence_sec) / chunk_sec)),
+    )
+    max_chunks = max(1, math.ceil(float(max_sec) / chunk_sec))
+    chunk_bytes = 2 * mic_stream.chunk
+    lead_in = b""
+    parts = []
+    mic_stream.start()
+    mic_stream.arm()
+    try:
+        for content in mic_stream.generator():
+            # A late read can return several queued chunks at once.
+            for offset in range(0, len(content), chunk_bytes):
+                chunk = content[offset:offset + chunk_bytes]
+                samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+                event = vad.observe_rms(EnergyVad.rms_block(samples)[0])
+                if event is VadEvent.SILENCE:
+                    lead_in = chunk
+                    continue
+                if event is VadEvent.SPEECH_START:
+                    parts.append(lead_in)
+                parts.append(chunk)
+                if event is VadEvent.SPEECH_END or len(parts) > max_chunks:
+                    return b"".join(parts)
+    finally:
+        mic_stream.disarm()
+    return b"".join(parts)
+
+
+def load_vosk_model(model_path=MODEL_PATH):
+    """Load a Vosk model without touching any audio device."""
+    from vosk import Model, SetLogLevel
+
+    SetLogLevel(-1)
+    return Model(model_path)
+
+
+def create_recognizer(model, sample_rate, grammar=None, alternatives=0, words=False):
+    """Open-vocabulary recognizer, or one limited to ``grammar`` phrases.
+
+    Vosk compiles the grammar into a small decoding graph; words missing from
+    the model's lexicon are dropped. Only models with a dynamic graph (the
+    small ones) accept a grammar. ``alternatives`` above one makes final
+    results N-best lists; ``words`` adds per-word timings and confidences.
+    """
+    from vosk import KaldiRecognizer
+
+    if grammar:
+        recognizer = KaldiRecognizer(model, sample_rate, json.dumps(list(grammar), ensure_ascii=False))
+    else:
+        recognizer = KaldiRecognizer(model, sample_rate)
+    if int(alternatives or 0) > 1:
+        recognizer.SetMaxAlternatives(int(alternatives))
+    if words:
+        recognizer.SetWords(True)
+    return recognizer
+
+
+def recognize_pcm16(recognizer, pcm, chunk_bytes=16000):
+    """Recognize a complete mono int16 buffer (e.g. a WAV file) offline.
+
+    The recognizer is left ready for the next buffer, so a cached one can be
+    reused.
+    """
+    return recognize_pcm16_alternatives(recognizer, pcm, chunk_bytes)[0][0]
+
+
+def recognize_pcm16_alternatives(recognizer, pcm, chunk_bytes=16000):
+    """``(text, score)`` hypotheses of a complete buffer, best first."""
+    return merge_results(recognize_pcm16_payloads(recognizer, pcm, chunk_bytes))[0]
+
+
+def recognize_pcm16_payloads(recognizer, pcm, chunk_bytes=16000):
+    """Parsed Vosk results of a complete buffer, one per finalized segment."""
+    payloads = []
+    for offset in range(0, len(pcm), chunk_bytes):
+        if recognizer.AcceptWaveform(bytes(pcm[offset:offset + chunk_bytes])):
+            payloads.append(json.loads(recognizer.Result()))
+    payloads.append(json.loads(recognizer.FinalResult()))
+    return payloads
+
+
+def initialize_vosk_asr(
+    model_path=MODEL_PATH,
+    chunk_size=8000,
+    preroll_ms=0.0,
+    capture=None,
+    drop_policy=DROP_OLDEST,
+    max_seconds=MAX_ARMED_SECONDS,
+):
     """Voskの音声認識モジュールを初期化する."""
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+
     SetLogLevel(-1)
-    input_device_info = sd.query_devices(kind="input")
-    sample_rate = int(input_device_info["default_samplerate"])
+    if capture is not None:
+        sample_rate = int(capture.sample_rate)
+        chunk_size = int(capture.block_size)
+    else:
+        import sounddevice as sd
+
+        input_device_info = sd.query_devices(kind="input")
+        sample_rate = int(input_device_info["default_samplerate"])
 
-    mic_stream = MicrophoneStream(sample_rate, chunk_size)
-    recognizer = KaldiRecognizer(Model(model_path), sample_rate)
+    mic_stream = MicrophoneStream(
+        sample_rate,
+        chunk_size,
+        preroll_ms=preroll_ms,
+        capture=capture,
+        drop_policy=drop_policy,
+        max_seconds=max_seconds,
+    )
+    model = Model(model_path)
+    recognizer = KaldiRecognizer(model, sample_rate)
 
-    VoskStreamingASR = namedtuple("VoskStreamingASR", ["microphone_stream", "recognizer"])
-    return VoskStreamingASR(mic_stream, recognizer)
+    VoskStreamingASR = namedtuple("VoskStreamingASR", ["microphone_stream", "recognizer", "model", "sample_rate"])
+    return VoskStreamingASR(mic_stream, recognizer, model, sample_rate)
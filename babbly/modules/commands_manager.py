@@ -3,6 +3,8 @@ import subprocess
 import logging
 import json
 
+from babbly.modules.phonetic import build_search_dict
+
 
 class CommandManager:
     """コマンドの管理・検索・実行を行うクラス。"""
@@ -38,31 +40,7 @@ class CommandManager:
 
     def _build_search_dict(self):
         """補助辞書を作成する。"""
-        phonetic_codes = {
-            "a": ["alpha", "アルファ"],
-            "b": ["bravo", "ブラボー"],
-            "c": ["charlie", "チャーリー"],
-            "d": ["delta", "デルタ"],
-            "e": ["echo", "エコー"],
-            "f": ["foxtrot", "フォックスロット"],
-            "g": ["golf", "ゴルフ"],
-            "h": ["hotel", "ホテル"],
-            "i": ["india", "インディア"],
-            "j": ["juliet", "ジュリエット"]
-        }
-
-        # 補助辞書作成
-        for key, record in self.command_map.items():
-            # 通常キーの登録
-            self.search_dict[key] = record
-            self.search_dict[record["ID"]] = record
-            self.search_dict[record["VoiceAlias"]] = record
-
-            # ID をキーにフォネティックコードを登録
-            phonetic_entries = phonetic_codes.get(record["ID"])
-            if phonetic_entries:
-                for code in phonetic_entries:
-                    self.search_dict[code.lower()] = record  # 小文字で登録
+        self.search_dict = build_search_dict(self.command_map)
 
 
     def get_search_dict(self):
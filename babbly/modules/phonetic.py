@@ -0,0 +1,34 @@
+"""Phonetic-code index shared by the command, target and SOP registries."""
+
+from types import MappingProxyType
+
+
+# ID -> spoken phonetic codes registered as extra search keys (lower case).
+PHONETIC_CODES = MappingProxyType({
+    "a": ("alpha", "アルファ"),
+    "b": ("bravo", "ブラボー"),
+    "c": ("charlie", "チャーリー"),
+    "d": ("delta", "デルタ"),
+    "e": ("echo", "エコー"),
+    "f": ("foxtrot", "フォックスロット"),
+    "g": ("golf", "ゴルフ"),
+    "h": ("hotel", "ホテル"),
+    "i": ("india", "インディア"),
+    "j": ("juliet", "ジュリエット"),
+})
+
+
+def build_search_dict(records):
+    """補助辞書を作成する。
+
+    Each record is registered under its key, ID, VoiceAlias and, when its ID
+    has one, its phonetic codes.
+    """
+    search_dict = {}
+    for key, record in records.items():
+        search_dict[key] = record
+        search_dict[record["ID"]] = record
+        search_dict[record["VoiceAlias"]] = record
+        for code in PHONETIC_CODES.get(record["ID"], ()):
+            search_dict[code.lower()] = record  # 小文字で登録
+    return search_dict
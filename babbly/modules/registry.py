@@ -0,0 +1,107 @@
+"""Command, target and SOP registries loaded once and reloaded on change.
+
+``listen_for_command`` used to build all three managers (three JSON reads and
+three search dicts) after every wake word. ``RegistryService`` loads them at
+startup and only rebuilds a manager when its file's mtime changes or when the
+operator asks for a reload. A file that fails to parse keeps the previously
+loaded registry instead of dropping it mid-session.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from babbly.modules.commands_manager import CommandManager
+from babbly.modules.ipaddress_manager import IPAddressManager
+from babbly.modules.operation_manager import OperationManager
+
+
+logger = logging.getLogger(__name__)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class RegistryService:
+    """Shared owner of the command, target and SOP managers."""
+
+    def __init__(
+        self,
+        commands_path: str,
+        targets_path: str,
+        sop_path: str,
+        *,
+        command_factory: Callable[[str], object] = CommandManager,
+        target_factory: Callable[[str], object] = IPAddressManager,
+        operation_factory: Callable[[str], object] = OperationManager,
+    ) -> None:
+        self._sources: Dict[str, Tuple[str, Callable[[str], object]]] = {
+            "commands": (commands_path, command_factory),
+            "targets": (targets_path, target_factory),
+            "operations": (sop_path, operation_factory),
+        }
+        self._managers: Dict[str, object] = {}
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.reload(strict=True)
+
+    @property
+    def commands(self) -> CommandManager:
+        return self._managers["commands"]
+
+    @property
+    def targets(self) -> IPAddressManager:
+        return self._managers["targets"]
+
+    @property
+    def operations(self) -> OperationManager:
+        return self._managers["operations"]
+
+    def _load(self, name: str, *, strict: bool) -> bool:
+        path, factory = self._sources[name]
+        mtime = _mtime(path)
+        try:
+            manager = factory(path)
+        except Exception as exc:
+            if strict or name not in self._managers:
+                raise
+            logger.warning("Registry %s reload failed; keeping the loaded version: %s", name, exc)
+            # Do not re-parse the same broken file on every wake.
+            self._mtimes[name] = mtime
+            return False
+        self._managers[name] = manager
+        self._mtimes[name] = mtime
+        return True
+
+    def reload(self, *, strict: bool = False) -> Tuple[str, ...]:
+        """Rebuild every registry now (explicit reload intent).
+
+        Returns the names of the registries whose file failed to load and
+        that keep their previous version; empty when every one reloaded.
+        """
+        with self._lock:
+            loaded = {name: self._load(name, strict=strict) for name in self._sources}
+            if any(loaded.values()):
+                self.generation += 1
+            return tuple(name for name, ok in loaded.items() if not ok)
+
+    def refresh(self) -> bool:
+        """Rebuild only registries whose file changed since the last load.
+
+        Costs one ``stat`` per file when nothing changed.
+        """
+        with self._lock:
+            stale = [name for name, (path, _) in self._sources.items() if _mtime(path) != self._mtimes.get(name)]
+            changed = [self._load(name, strict=False) for name in stale]
+            if any(changed):
+                self.generation += 1
+                logger.info("Registries reloaded: %s", ", ".join(stale))
+            return any(changed)
@@ -1,19 +1,12 @@
 #!/usr/bin/python3
 import yaml
 import logging
-from janome.analyzer import Analyzer
-from janome.tokenfilter import CompoundNounFilter
-from babbly.ja.vosk_asr_module import get_asr_result as get_asr_result_ja
-from babbly.en.vosk_asr_module import get_asr_result as get_asr_result_en
+from babbly.nlu.tokenizer import get_tokenizer
 
 
 def analyze_text(message):
     """受け取った文字列を形態素解析する"""
-    messages = []
-    a = Analyzer(token_filters=[CompoundNounFilter()])
-    for token in a.analyze(message):
-        messages.append(token.base_form)
-    return messages
+    return list(get_tokenizer().tokenize(message))
 
 
 def load_config(file_path):
@@ -46,7 +39,13 @@ def listen_text(asr, lang_ja=True):
     if hasattr(asr, "listen"):
         result = asr.listen()
         return result.text if hasattr(result, "text") else str(result)
-    return get_asr_result_ja(asr) if lang_ja else get_asr_result_en(asr)
+    # Legacy engines only: the EN module opens sounddevice/vosk at import, so
+    # config loading stays usable on hosts without an audio stack.
+    if lang_ja:
+        from babbly.ja.vosk_asr_module import get_asr_result
+    else:
+        from babbly.en.vosk_asr_module import get_asr_result
+    return get_asr_result(asr)
 
 
 def assist_command_mode(cmd_mgr, ip_mgr, asr, tts, search_dict, lang_ja):
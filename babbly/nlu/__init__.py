@@ -1,3 +1,3 @@
-from .japanese import IntentResolver, IntentResult, normalize_japanese
+from .japanese import IntentResolver, IntentResult, Normalizer, normalize_japanese
 
-__all__ = ["IntentResolver", "IntentResult", "normalize_japanese"]
+__all__ = ["IntentResolver", "IntentResult", "Normalizer", "normalize_japanese"]
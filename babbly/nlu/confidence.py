@@ -0,0 +1,44 @@
+"""Utterance confidence for the intent policy from ASR word confidences.
+
+A backend's utterance score averages every word alike, so a shaky particle
+weighs as much as the command word. ``utterance_confidence`` weights the
+words that spell the terms the intent matched on (``IntentResult
+.matched_terms``) ``term_weight`` times, so the policy judges how well the
+command itself was heard.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from babbly.asr.types import ASRResult
+from babbly.nlu.japanese import IntentResult
+
+
+def is_term_word(word: str, terms) -> bool:
+    """True when ``word`` is part of, or contains, one of ``terms``."""
+    return bool(word) and any(word in term or term in word for term in terms)
+
+
+def utterance_confidence(
+    result: ASRResult,
+    intent: IntentResult,
+    *,
+    term_weight: float = 3.0,
+    normalize: Optional[Callable[[str], str]] = None,
+) -> Optional[float]:
+    """Term-weighted mean word confidence, else the backend's own score.
+
+    ``normalize`` maps a recognized word to the resolver's normalized form
+    (``IntentResolver.normalizer``) so it can be compared with the terms.
+    """
+    if not result.words:
+        return result.confidence
+    weighted = 0.0
+    total = 0.0
+    for word in result.words:
+        text = normalize(word.text) if normalize is not None else word.text
+        weight = float(term_weight) if is_term_word(text, intent.matched_terms) else 1.0
+        weighted += weight * max(0.0, min(1.0, word.confidence))
+        total += weight
+    return weighted / total if total else result.confidence
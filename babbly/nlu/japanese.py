@@ -1,27 +1,91 @@
 import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 
+from babbly.nlu.matcher import TermAutomaton
 from babbly.nlu.vocabulary import build_aliases
 
 
+# Spoken answers to a confirmation prompt.
+CONFIRM_YES: Tuple[str, ...] = ("はい", "実行", "お願いします", "よし")
+CONFIRM_NO: Tuple[str, ...] = ("いいえ", "中止", "やめ", "キャンセル")
+
+_WHITESPACE_RE = re.compile(r"[\s\u3000]+")
+_PUNCTUATION_RE = re.compile(r"[、。,.!?！？・:：;；\"'「」『』（）()\[\]{}]")
+
+
 def _basic_normalize(text: str) -> str:
     value = unicodedata.normalize("NFKC", text or "").strip().lower()
-    value = re.sub(r"[\s\u3000]+", "", value)
-    value = re.sub(r"[、。,.!?！？・:：;；\"'「」『』（）()\[\]{}]", "", value)
+    value = _WHITESPACE_RE.sub("", value)
+    value = _PUNCTUATION_RE.sub("", value)
     return value
 
 
+class Normalizer:
+    """Alias normalizer compiled once per alias set.
+
+    Alias sources are normalized up front and joined into one longest-first
+    pattern, so an utterance is rewritten in a single pass regardless of
+    vocabulary size. Targets are resolved through the alias table at compile
+    time, which keeps chained aliases working (``シールト`` -> ``シールド`` ->
+    ``shield`` when the Azazel pack is active). Recent inputs are memoized.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, *, cache_size: int = 256):
+        mapping: Dict[str, str] = {}
+        for source, target in build_aliases("core").items():
+            mapping[_basic_normalize(source)] = _basic_normalize(target)
+        for source, target in (aliases or {}).items():
+            mapping[_basic_normalize(source)] = _basic_normalize(target)
+        mapping.pop("", None)
+        self._pattern = self._compile(mapping)
+        self._targets = {source: self._closure(target, mapping) for source, target in mapping.items()}
+        self._cached = lru_cache(maxsize=max(0, int(cache_size)))(self._normalize)
+
+    @staticmethod
+    def _compile(mapping: Dict[str, str]) -> Optional["re.Pattern[str]"]:
+        if not mapping:
+            return None
+        sources = sorted(mapping, key=len, reverse=True)
+        return re.compile("|".join(re.escape(source) for source in sources))
+
+    def _closure(self, target: str, mapping: Dict[str, str]) -> str:
+        # Apply the table to a target until it stops changing. The bound stops
+        # alias cycles (a -> b -> a) and self-expanding targets.
+        for _ in range(len(mapping)):
+            rewritten = self._pattern.sub(lambda match: mapping[match.group(0)], target)
+            if rewritten == target:
+                break
+            target = rewritten
+        return target
+
+    @classmethod
+    def for_aliases(cls, aliases: Optional[Dict[str, str]] = None) -> "Normalizer":
+        """Return the shared normalizer for this alias set."""
+        return _shared_normalizer(tuple((aliases or {}).items()))
+
+    def _normalize(self, text: str) -> str:
+        value = _basic_normalize(text)
+        if self._pattern is None or not value:
+            return value
+        return self._pattern.sub(lambda match: self._targets[match.group(0)], value)
+
+    def normalize(self, text: str) -> str:
+        return self._cached(text or "")
+
+    __call__ = normalize
+
+
+@lru_cache(maxsize=16)
+def _shared_normalizer(items: Tuple[Tuple[str, str], ...]) -> Normalizer:
+    return Normalizer(dict(items))
+
+
 def normalize_japanese(text: str, aliases: Optional[Dict[str, str]] = None) -> str:
     """Normalize ASR output without depending on tokenizer whitespace."""
-    value = _basic_normalize(text)
-    mapping = build_aliases("core")
-    if aliases:
-        mapping.update(aliases)
-    for source, target in mapping.items():
-        value = value.replace(_basic_normalize(source), _basic_normalize(target))
-    return value
+    return Normalizer.for_aliases(aliases).normalize(text)
 
 
 @dataclass(frozen=True)
@@ -29,6 +93,8 @@ class IntentResult:
     name: str
     confidence: float
     normalized_text: str
+    # Normalized rule terms that selected the intent.
+    matched_terms: Tuple[str, ...] = ()
 
 
 class IntentResolver:
@@ -42,16 +108,51 @@ class IntentResolver:
         ("network.scan", (("ネットワーク", "スキャン"), ("周辺", "スキャン"))),
         ("target.show", (("ターゲット", "教え"), ("ターゲット", "表示"), ("ターゲット", "確認"))),
         ("command.mode", (("コマンド",),)),
+        ("registry.reload", (("登録", "再読み込み"), ("レジストリ", "再読み込み"), ("リロード",))),
     )
 
-    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        aliases: Optional[Dict[str, str]] = None,
+        rules: Optional[Sequence[Tuple[str, Sequence[Sequence[str]]]]] = None,
+    ):
         self.aliases = aliases or build_aliases("core")
+        self.normalizer = Normalizer.for_aliases(self.aliases)
+        self.rules = tuple(rules) if rules is not None else self.RULES
+        self._compile()
+
+    def _compile(self) -> None:
+        # Flatten rules to (intent, confidence, distinct terms) in priority
+        # order; that order is the tie-breaker, which keeps first-match
+        # semantics while every term is located in one automaton pass.
+        alternatives: List[Tuple[str, float, FrozenSet[str]]] = []
+        for intent, options in self.rules:
+            for required_terms in options:
+                terms = frozenset(term for term in map(_basic_normalize, required_terms) if term)
+                confidence = 0.98 if len(required_terms) > 1 else 0.90
+                alternatives.append((intent, confidence, terms))
+        self._automaton = TermAutomaton(term for _, _, terms in alternatives for term in sorted(terms))
+        term_ids = {term: index for index, term in enumerate(self._automaton.terms)}
+        self._index: Dict[int, List[int]] = {}
+        for order, (_, _, terms) in enumerate(alternatives):
+            for term in terms:
+                self._index.setdefault(term_ids[term], []).append(order)
+        self._alternatives = [(intent, confidence, len(terms)) for intent, confidence, terms in alternatives]
+        self._terms = [tuple(sorted(terms)) for _, _, terms in alternatives]
+        # An alternative made only of empty terms matches any utterance.
+        self._unconditional = next((order for order, (_, _, terms) in enumerate(alternatives) if not terms), None)
 
     def resolve(self, text: str) -> IntentResult:
-        normalized = normalize_japanese(text, self.aliases)
-        for intent, alternatives in self.RULES:
-            for required_terms in alternatives:
-                if all(_basic_normalize(term) in normalized for term in required_terms):
-                    confidence = 0.98 if len(required_terms) > 1 else 0.90
-                    return IntentResult(intent, confidence, normalized)
-        return IntentResult("unknown", 0.0, normalized)
+        normalized = self.normalizer(text)
+        best = self._unconditional
+        hits: Dict[int, int] = {}
+        for term_id in self._automaton.find(normalized):
+            for order in self._index[term_id]:
+                count = hits.get(order, 0) + 1
+                hits[order] = count
+                if count == self._alternatives[order][2] and (best is None or order < best):
+                    best = order
+        if best is None:
+            return IntentResult("unknown", 0.0, normalized)
+        intent, confidence, _ = self._alternatives[best]
+        return IntentResult(intent, confidence, normalized, self._terms[best])
@@ -0,0 +1,65 @@
+"""Multi-pattern term location for the intent resolver.
+
+``TermAutomaton`` is a small Aho-Corasick automaton: every term is located in
+one left-to-right pass over the text, so matching cost follows utterance
+length rather than the number of registered rules.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class TermAutomaton:
+    """Report which of a fixed set of terms occur anywhere in a text."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(term for term in terms if term))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, term in enumerate(self.terms):
+            self._insert(term, index)
+        self._link()
+
+    def _insert(self, term: str, index: int) -> None:
+        state = 0
+        for char in term:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = following
+        self._out[state] = self._out[state] + (index,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[following] = link if link != following else 0
+                # Fold the suffix state's outputs in so a match never needs
+                # to walk the failure chain.
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def find(self, text: str) -> FrozenSet[int]:
+        """Return indexes into ``terms`` of every term present in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return frozenset(found)
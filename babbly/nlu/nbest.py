@@ -0,0 +1,168 @@
+"""Intent-aware reranking of ASR N-best hypotheses.
+
+The recognizer's best hypothesis is not always the one that names a command:
+"ネットワークをスキャン" can come second behind a near-homophone that
+resolves to nothing. ``NBestReranker`` scores every hypothesis as
+
+    joint = prior * fit
+
+where ``prior`` is the ASR posterior of the hypothesis (a softmax over the
+backend's log-domain scores, or a rank-based prior when it has none) and
+``fit`` is how well it matches the command vocabulary: the resolved intent's
+confidence, or ``REGISTRY_FIT`` when only a registered command, target or SOP
+name occurs in it.
+
+Reranking may only make the policy more careful. A lower-ranked hypothesis
+never yields ``system.exit``, and one that resolves to an intent outside
+``read_only`` is asked back (CLARIFY) even when the policy would execute it,
+and it is judged with its own ASR confidence (``hypothesis_confidence``),
+not the top hypothesis's.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+
+from babbly.asr.types import ASRResult
+from babbly.nlu.japanese import IntentResult
+from babbly.nlu.matcher import TermAutomaton
+from babbly.nlu.policy import Decision, PolicyDecision
+
+
+# Fit of a hypothesis that names a registry entry but no intent rule.
+REGISTRY_FIT = 0.5
+
+# Intents a lower-ranked hypothesis may never select.
+NEVER_FROM_ALTERNATIVE = frozenset({"system.exit"})
+
+
+@dataclass(frozen=True)
+class NBestChoice:
+    """The hypothesis the reranker picked; ``rank`` 0 is the ASR's own best."""
+
+    text: str
+    intent: IntentResult
+    rank: int
+    prior: float
+    score: float
+
+
+def hypothesis_priors(scores: Sequence[Optional[float]], temperature: float = 1.0) -> Tuple[float, ...]:
+    """Posterior of each hypothesis from log-domain scores, best first.
+
+    Without a score for every hypothesis the prior falls off with rank
+    (``1 / (rank + 1)``, normalized).
+    """
+    if not scores:
+        return ()
+    if any(score is None for score in scores):
+        weights = [1.0 / (rank + 1) for rank in range(len(scores))]
+    else:
+        scaled = [float(score) / max(float(temperature), 1e-6) for score in scores]
+        top = max(scaled)
+        weights = [math.exp(value - top) for value in scaled]
+    total = sum(weights)
+    return tuple(weight / total for weight in weights)
+
+
+def hypothesis_confidence(result: ASRResult, rank: int) -> Optional[float]:
+    """ASR confidence to judge hypothesis ``rank`` of ``result`` with.
+
+    Rank 0 keeps the backend's confidence. A lower-ranked hypothesis gets
+    ``exp(score)`` clamped to [0, 1], never above the top's confidence, and
+    none when either is unknown, so the policy never relaxes on it.
+    """
+    if not rank:
+        return result.confidence
+    score = result.alternatives[rank].score if rank < len(result.alternatives) else None
+    if score is None or result.confidence is None:
+        return None
+    return min(max(0.0, min(1.0, math.exp(float(score)))), float(result.confidence))
+
+
+class NBestReranker:
+    """Pick the N-best hypothesis with the best ASR prior times intent fit."""
+
+    def __init__(
+        self,
+        resolver,
+        registry=None,
+        *,
+        read_only: Iterable[str] = (),
+        min_prior: float = 0.05,
+        temperature: float = 1.0,
+    ):
+        self.resolver = resolver
+        self.registry = registry
+        self.read_only = frozenset(read_only)
+        self.min_prior = max(0.0, float(min_prior))
+        self.temperature = float(temperature)
+        self._vocabulary: Optional[Tuple[int, TermAutomaton]] = None
+        self.reranked = 0
+        self.kept = 0
+
+    def _registry_terms(self) -> Optional[TermAutomaton]:
+        if self.registry is None:
+            return None
+        generation = int(getattr(self.registry, "generation", 0))
+        if self._vocabulary is None or self._vocabulary[0] != generation:
+            terms = []
+            for manager in (self.registry.commands, self.registry.targets, self.registry.operations):
+                terms.extend(self.resolver.normalizer(str(key)) for key in manager.get_search_dict())
+            self._vocabulary = (generation, TermAutomaton(terms))
+        return self._vocabulary[1]
+
+    def fit(self, intent: IntentResult, rank: int) -> float:
+        """How well one resolved hypothesis matches the command vocabulary."""
+        if rank and intent.name in NEVER_FROM_ALTERNATIVE:
+            return 0.0
+        if intent.name != "unknown":
+            return intent.confidence
+        terms = self._registry_terms()
+        if terms is not None and terms.find(intent.normalized_text):
+            return REGISTRY_FIT
+        return 0.0
+
+    def rerank(self, result: ASRResult) -> NBestChoice:
+        """Choose among ``result.alternatives`` (or just ``result.text``)."""
+        hypotheses = result.alternatives or ()
+        texts = [alternative.text for alternative in hypotheses] or [result.text]
+        priors = hypothesis_priors([alternative.score for alternative in hypotheses] or [None], self.temperature)
+        best: Optional[NBestChoice] = None
+        for rank, (text, prior) in enumerate(zip(texts, priors)):
+            if rank and prior < self.min_prior:
+                continue
+            intent = self.resolver.resolve(text)
+            score = prior * self.fit(intent, rank)
+            # Strictly better only: ties stay with the higher-ranked hypothesis.
+            if best is None or score > best.score:
+                best = NBestChoice(text, intent, rank, prior, score)
+        if best.rank:
+            self.reranked += 1
+        else:
+            self.kept += 1
+        return best
+
+    def gate(self, choice: NBestChoice, policy: PolicyDecision) -> PolicyDecision:
+        """Ask back an executable intent that only a lower-ranked hypothesis named."""
+        if choice.rank and policy.decision == Decision.EXECUTE and choice.intent.name not in self.read_only:
+            return PolicyDecision(Decision.CLARIFY, f"N-best rank {choice.rank}; {policy.reason}")
+        return policy
+
+    def stats(self) -> dict:
+        return {"reranked": self.reranked, "kept": self.kept}
+
+
+def create_nbest_reranker(config, resolver, registry=None, *, read_only: Iterable[str] = ()) -> Optional[NBestReranker]:
+    """Reranker when ``ASR_ALTERNATIVES`` asks for more than one hypothesis."""
+    if int(config.get("ASR_ALTERNATIVES", 1) or 1) <= 1:
+        return None
+    return NBestReranker(
+        resolver,
+        registry,
+        read_only=read_only,
+        min_prior=float(config.get("NBEST_MIN_PRIOR", 0.05)),
+        temperature=float(config.get("NBEST_TEMPERATURE", 1.0)),
+    )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 
 from babbly.nlu.japanese import IntentResult
 
@@ -18,21 +18,40 @@ class PolicyDecision:
 
 
 class IntentPolicy:
-    """Gate executable intents using deterministic confidence thresholds."""
-
-    def __init__(self, execute_threshold: float = 0.90, clarify_threshold: float = 0.60):
+    """Gate executable intents using deterministic confidence thresholds.
+
+    ``read_only_execute_threshold`` lets ``read_only`` intents execute on a
+    lower score, but only when the ASR measured one: without a backend
+    confidence every intent keeps ``execute_threshold``.
+    """
+
+    def __init__(
+        self,
+        execute_threshold: float = 0.90,
+        clarify_threshold: float = 0.60,
+        *,
+        read_only: Iterable[str] = (),
+        read_only_execute_threshold: Optional[float] = None,
+    ):
         self.execute_threshold = float(execute_threshold)
         self.clarify_threshold = float(clarify_threshold)
+        self.read_only = frozenset(read_only)
+        self.read_only_execute_threshold = (
+            self.execute_threshold if read_only_execute_threshold is None else float(read_only_execute_threshold)
+        )
 
     def evaluate(self, intent: IntentResult, asr_confidence: Optional[float] = None) -> PolicyDecision:
         if intent.name == "unknown":
             return PolicyDecision(Decision.REJECT, "unknown intent")
 
         effective = intent.confidence
+        execute_threshold = self.execute_threshold
         if asr_confidence is not None:
             effective = min(effective, max(0.0, min(1.0, asr_confidence)))
+            if intent.name in self.read_only:
+                execute_threshold = self.read_only_execute_threshold
 
-        if effective >= self.execute_threshold:
+        if effective >= execute_threshold:
             return PolicyDecision(Decision.EXECUTE, f"confidence={effective:.2f}")
         if effective >= self.clarify_threshold:
             return PolicyDecision(Decision.CLARIFY, f"confidence={effective:.2f}")
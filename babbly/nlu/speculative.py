@@ -0,0 +1,141 @@
+"""Speculative intent resolution on streaming partial hypotheses.
+
+Endpointing waits for a silence window before the final hypothesis arrives, so
+resolving the intent and collecting the situation snapshot only start after
+the operator stopped speaking. ``SpeculativeIntentPipeline`` resolves every
+changed partial as it streams in. Once a partial already resolves to a
+read-only intent the policy would execute, the registered prefetch (e.g. a
+situation snapshot) starts in the background.
+
+Speculation never acts. Its result is handed over only when the final
+hypothesis resolves to the same intent; otherwise it is discarded. Prefetches
+can only be registered for read-only intents, and the caller still applies
+the policy and confirmation to the final result as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from babbly.asr.types import ASRResult
+from babbly.nlu.japanese import IntentResult
+from babbly.nlu.policy import Decision
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SpeculativeOutcome:
+    """Final hypothesis of one utterance and the speculation it committed."""
+
+    result: ASRResult
+    intent: IntentResult
+    speculated: Optional[str] = None  # last intent a prefetch started for
+    committed: bool = False
+    prefetched: Any = None  # the prefetch result, only when committed
+    partials: int = 0
+
+
+class SpeculativeIntentPipeline:
+    """Resolve partial hypotheses and prefetch for clear read-only intents."""
+
+    def __init__(
+        self,
+        resolver,
+        policy,
+        prefetchers: Mapping[str, Callable[[IntentResult], Any]],
+        *,
+        read_only: Iterable[str],
+        commit_timeout_sec: Optional[float] = None,
+    ):
+        read_only = frozenset(read_only)
+        unsafe = sorted(set(prefetchers) - read_only)
+        if unsafe:
+            raise ValueError(f"Speculative prefetch is limited to read-only intents: {', '.join(unsafe)}")
+        self.resolver = resolver
+        self.policy = policy
+        self.prefetchers: Dict[str, Callable[[IntentResult], Any]] = dict(prefetchers)
+        self.commit_timeout_sec = commit_timeout_sec
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.speculations = 0
+        self.commits = 0
+        self.discards = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="babbly-speculate")
+            return self._executor
+
+    def _speculate(self, intent: IntentResult) -> Optional[Future]:
+        prefetch = self.prefetchers.get(intent.name)
+        if prefetch is None or self.policy.evaluate(intent).decision != Decision.EXECUTE:
+            return None
+        self.speculations += 1
+        logger.debug("speculating intent=%s on partial=%s", intent.name, intent.normalized_text)
+        return self._pool().submit(prefetch, intent)
+
+    def run(self, hypotheses: Iterable[ASRResult]) -> Optional[SpeculativeOutcome]:
+        """Consume one utterance's hypotheses; None when no final result came."""
+        speculated: Optional[IntentResult] = None
+        future: Optional[Future] = None
+        last_normalized = None
+        partials = 0
+        for hypothesis in hypotheses:
+            if not hypothesis.partial:
+                return self._finish(hypothesis, speculated, future, partials)
+            partials += 1
+            normalized = self.resolver.normalizer(hypothesis.text)
+            if normalized == last_normalized:
+                continue
+            last_normalized = normalized
+            intent = self.resolver.resolve(hypothesis.text)
+            if speculated is not None and intent.name == speculated.name:
+                continue
+            started = self._speculate(intent)
+            if started is not None:
+                if future is not None:
+                    future.cancel()
+                speculated, future = intent, started
+        if future is not None:
+            future.cancel()
+        return None
+
+    def _finish(
+        self,
+        result: ASRResult,
+        speculated: Optional[IntentResult],
+        future: Optional[Future],
+        partials: int,
+    ) -> SpeculativeOutcome:
+        intent = self.resolver.resolve(result.text)
+        outcome = SpeculativeOutcome(result=result, intent=intent, partials=partials)
+        if speculated is None:
+            return outcome
+        outcome = replace(outcome, speculated=speculated.name)
+        if intent.name != speculated.name:
+            self.discards += 1
+            future.cancel()
+            logger.info("speculation discarded: partial=%s final=%s", speculated.name, intent.name)
+            return outcome
+        try:
+            prefetched = future.result(timeout=self.commit_timeout_sec)
+        except Exception as exc:
+            # A failed or slow prefetch falls back to the normal path.
+            self.discards += 1
+            logger.warning("speculative prefetch for %s unusable: %s", intent.name, exc)
+            return outcome
+        self.commits += 1
+        return replace(outcome, committed=True, prefetched=prefetched)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
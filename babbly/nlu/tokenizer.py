@@ -0,0 +1,126 @@
+"""Process-wide tokenizer for recognized commands.
+
+Janome dictionary setup dominates the cost of tokenizing a short utterance, so
+``TokenizerService`` builds the analyzer once, can be warmed at startup, and
+memoizes recent inputs. The ``simple`` backend splits text into script runs
+(kanji, hiragana, katakana, latin/digits) for hosts where Janome startup is
+too slow or Janome is not installed.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_BACKENDS = ("janome", "simple")
+
+_SCRIPT_RUN_RE = re.compile(
+    r"[一-鿿々]+"  # kanji (and the 々 iteration mark)
+    r"|[ぁ-ゟ]+"  # hiragana
+    r"|[゠-ヿ]+"  # katakana, including the long-vowel mark
+    r"|[0-9A-Za-z._\-]+"  # latin words, numbers and dotted addresses
+)
+
+
+def simple_tokenize(text: str) -> Tuple[str, ...]:
+    """Split text into runs of one script; no dictionary required."""
+    return tuple(_SCRIPT_RUN_RE.findall(text or ""))
+
+
+class TokenizerService:
+    """Load a tokenizer backend once and reuse it for every utterance."""
+
+    def __init__(self, backend: str = "janome", *, cache_size: int = 256):
+        backend = str(backend or "janome").strip().lower()
+        if backend not in TOKENIZER_BACKENDS:
+            raise ValueError(f"Unsupported TOKENIZER_BACKEND: {backend}")
+        self.backend = backend
+        self._analyzer = None
+        self._load_lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        self._cached = lru_cache(maxsize=max(0, int(cache_size)))(self._tokenize)
+
+    @property
+    def loaded(self) -> bool:
+        return self.backend == "simple" or self._analyzer is not None
+
+    def warm(self) -> "TokenizerService":
+        """Load the backend now instead of on the first command."""
+        self.tokenize("ウォームアップ")
+        return self
+
+    def _load_janome(self):
+        with self._load_lock:
+            if self._analyzer is None:
+                started = time.perf_counter()
+                try:
+                    from janome.analyzer import Analyzer
+                    from janome.tokenfilter import CompoundNounFilter
+                except ImportError:
+                    logger.warning("Janome is not installed; using the simple tokenizer")
+                    self.backend = "simple"
+                    return None
+                self._analyzer = Analyzer(token_filters=[CompoundNounFilter()])
+                self.load_seconds = time.perf_counter() - started
+                logger.info("Janome analyzer loaded in %.2fs", self.load_seconds)
+            return self._analyzer
+
+    def _tokenize(self, text: str) -> Tuple[str, ...]:
+        if self.backend == "janome":
+            analyzer = self._analyzer or self._load_janome()
+            if analyzer is not None:
+                return tuple(token.base_form for token in analyzer.analyze(text))
+        return simple_tokenize(text)
+
+    def segment(self, text: str) -> Tuple[str, ...]:
+        """Surface forms as spoken (not memoized), e.g. to build ASR grammars."""
+        if self.backend == "janome":
+            analyzer = self._analyzer or self._load_janome()
+            if analyzer is not None:
+                return tuple(token.surface for token in analyzer.analyze(text or ""))
+        return simple_tokenize(text)
+
+    def tokenize(self, text: str) -> Tuple[str, ...]:
+        """Return base forms, memoized for recently seen utterances."""
+        return self._cached(text or "")
+
+    def clear_cache(self) -> None:
+        self._cached.cache_clear()
+
+
+_shared: Optional[TokenizerService] = None
+_shared_lock = threading.Lock()
+
+
+def create_tokenizer(config: Mapping[str, object]) -> TokenizerService:
+    try:
+        return TokenizerService(
+            str(config.get("TOKENIZER_BACKEND", "janome")),
+            cache_size=int(config.get("TOKENIZER_CACHE_SIZE", 256)),
+        )
+    except (TypeError, ValueError) as exc:
+        logger.warning("Tokenizer configuration rejected; using Janome defaults: %s", exc)
+        return TokenizerService()
+
+
+def set_tokenizer(service: TokenizerService) -> TokenizerService:
+    global _shared
+    with _shared_lock:
+        _shared = service
+    return service
+
+
+def get_tokenizer() -> TokenizerService:
+    """Return the process-wide tokenizer, creating a Janome one on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TokenizerService()
+        return _shared
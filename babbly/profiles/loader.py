@@ -6,7 +6,7 @@ import re
 from pathlib import Path
 from typing import Mapping, Optional
 
-from .model import AgentIdentity, AgentProfile, EnvironmentProfile, PersonaProfile
+from .model import AgentIdentity, AgentProfile, EnvironmentProfile, PersonaProfile, WakePhraseTuning
 
 
 _PROFILE_NAME = re.compile(r"^[a-z0-9][a-z0-9._-]{0,63}$")
@@ -35,6 +35,36 @@ def _text_list(value, field: str, *, allow_empty: bool = False) -> tuple[str, ..
     return items
 
 
+def _optional_number(value, field: str, *, upper: Optional[float] = None) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} must be a number")
+    number = float(value)
+    if number <= 0 or (upper is not None and number >= upper):
+        raise ValueError(f"{field} is out of range")
+    return number
+
+
+def _wake_tuning(value, wake_phrases: tuple[str, ...]) -> tuple[WakePhraseTuning, ...]:
+    """``identity.wake_tuning``: ``{phrase: {"threshold": t, "boost": b}}``."""
+    if value is None:
+        return ()
+    tuning = []
+    for phrase, entry in _require_mapping(value, "identity.wake_tuning").items():
+        if phrase not in wake_phrases:
+            raise ValueError(f"identity.wake_tuning names an unknown wake phrase: {phrase!r}")
+        entry = _require_mapping(entry, f"identity.wake_tuning.{phrase}")
+        tuning.append(
+            WakePhraseTuning(
+                phrase=phrase,
+                threshold=_optional_number(entry.get("threshold"), f"identity.wake_tuning.{phrase}.threshold", upper=1.0),
+                boost=_optional_number(entry.get("boost"), f"identity.wake_tuning.{phrase}.boost"),
+            )
+        )
+    return tuple(tuning)
+
+
 def _profile_dir(root: Optional[str | Path] = None) -> Path:
     if root is not None:
         return Path(root)
@@ -83,12 +113,14 @@ def load_profile(name: str, root: Optional[str | Path] = None) -> AgentProfile:
         raise ValueError(f"profile id mismatch: expected {normalized!r}, got {profile_id!r}")
 
     identity_obj = _require_mapping(root_obj.get("identity"), "identity")
+    wake_phrases = _text_list(identity_obj.get("wake_phrases"), "identity.wake_phrases")
     identity = AgentIdentity(
         id=_require_text(identity_obj.get("id"), "identity.id"),
         display_name=_require_text(identity_obj.get("display_name"), "identity.display_name"),
         spoken_name=_require_text(identity_obj.get("spoken_name"), "identity.spoken_name"),
-        wake_phrases=_text_list(identity_obj.get("wake_phrases"), "identity.wake_phrases"),
+        wake_phrases=wake_phrases,
         language=_require_text(identity_obj.get("language", "ja"), "identity.language"),
+        wake_tuning=_wake_tuning(identity_obj.get("wake_tuning"), wake_phrases),
     )
 
     persona_obj = _require_mapping(root_obj.get("persona"), "persona")
@@ -128,14 +160,19 @@ def apply_profile_to_config(
 ) -> dict[str, object]:
     """Project only non-authority profile fields into runtime configuration.
 
-    Profiles may select identity, wake phrases, vocabulary, and read-only
-    situation sources. They cannot modify DRY_RUN, intent thresholds, command
+    Profiles may select identity, wake phrases and their spotter tuning,
+    vocabulary, and read-only situation sources. They cannot modify DRY_RUN, intent thresholds, command
     registries, action policy, or any execution authority setting.
     """
     projected = dict(config)
     projected["ACTIVE_PROFILE"] = profile.id
     projected["WAKEUP_PHRASE"] = profile.identity.primary_wake_phrase
     projected["WAKEUP_PHRASES"] = list(profile.identity.wake_phrases)
+    if profile.identity.wake_tuning:
+        projected["KWS_KEYWORD_TUNING"] = {
+            tuning.phrase: {"threshold": tuning.threshold, "boost": tuning.boost}
+            for tuning in profile.identity.wake_tuning
+        }
     projected["DOMAIN_VOCABULARY"] = list(profile.environment.vocabulary_packs)
     projected["AZAZEL_EDGE_ENABLED"] = "azazel-edge" in profile.environment.situation_sources
     return projected
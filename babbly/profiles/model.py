@@ -3,6 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
+@dataclass(frozen=True)
+class WakePhraseTuning:
+    """Per-phrase keyword-spotter sensitivity; None keeps the default."""
+
+    phrase: str
+    threshold: float | None = None
+    boost: float | None = None
+
+
 @dataclass(frozen=True)
 class AgentIdentity:
     id: str
@@ -10,6 +19,7 @@ class AgentIdentity:
     spoken_name: str
     wake_phrases: tuple[str, ...]
     language: str = "ja"
+    wake_tuning: tuple[WakePhraseTuning, ...] = ()
 
     @property
     def primary_wake_phrase(self) -> str:
@@ -1,4 +1,5 @@
 from .factory import create_wake_detector
+from .one_shot import resolve_one_shot
 from .types import WakeResult
 
-__all__ = ["WakeResult", "create_wake_detector"]
+__all__ = ["WakeResult", "create_wake_detector", "resolve_one_shot"]
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 
-from babbly.nlu.japanese import normalize_japanese
+from babbly.asr.tiers import listen_in_state
+from babbly.nlu.japanese import Normalizer
 from babbly.wake.base import WakeDetector
 from babbly.wake.types import WakeResult
 
@@ -17,26 +18,37 @@ class ASRWakeDetector(WakeDetector):
     def __init__(self, asr, phrases: str | Sequence[str], aliases=None):
         self.asr = asr
         self.aliases = aliases
+        self.normalizer = Normalizer.for_aliases(aliases)
         if isinstance(phrases, str):
             values = (phrases,)
         else:
             values = tuple(str(value) for value in phrases)
         self.phrases = tuple(value.strip() for value in values if value.strip())
         self.expected = tuple(
-            (phrase, normalize_japanese(phrase, aliases)) for phrase in self.phrases
+            (phrase, self.normalizer(phrase)) for phrase in self.phrases
         )
 
+    def match(self, result) -> WakeResult | None:
+        """Return a trigger if an ASR result contains a wake phrase.
+
+        Normalized text after the phrase is kept as ``remainder``.
+        """
+        if result.is_empty:
+            return None
+        text = self.normalizer(result.text)
+        for phrase, expected in self.expected:
+            if expected and expected in text:
+                return WakeResult(
+                    triggered=True,
+                    keyword=phrase,
+                    backend=f"asr:{result.backend}",
+                    confidence=result.confidence,
+                    remainder=text.split(expected, 1)[1],
+                )
+        return None
+
     def wait(self) -> WakeResult:
         while True:
-            result = self.asr.listen()
-            if result.is_empty:
-                continue
-            text = normalize_japanese(result.text, self.aliases)
-            for phrase, expected in self.expected:
-                if expected and expected in text:
-                    return WakeResult(
-                        triggered=True,
-                        keyword=phrase,
-                        backend=f"asr:{result.backend}",
-                        confidence=result.confidence,
-                    )
+            wake = self.match(listen_in_state(self.asr, "wake"))
+            if wake is not None:
+                return wake
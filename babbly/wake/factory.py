@@ -1,17 +1,65 @@
+import logging
+from collections.abc import Mapping
+
 from babbly.wake.asr_backend import ASRWakeDetector
 from babbly.wake.sherpa_onnx_backend import SherpaOnnxWakeDetector
+from babbly.wake.staged import StagedWakeDetector
+from babbly.wake.verify import WakeVerifier
+
+
+logger = logging.getLogger(__name__)
+
+
+def _optional_float(config, key):
+    value = config.get(key)
+    return None if value in (None, "") else float(value)
+
+
+def _keyword_tuning(config):
+    """``KWS_KEYWORD_TUNING`` (set by the profile's ``wake_tuning``), or None."""
+    raw = config.get("KWS_KEYWORD_TUNING")
+    if not isinstance(raw, Mapping):
+        return None
+    tuning = {}
+    for label, entry in raw.items():
+        if not isinstance(entry, Mapping):
+            logger.warning("Ignoring KWS tuning for %s: expected threshold/boost", label)
+            continue
+        try:
+            tuning[str(label)] = {
+                "threshold": _optional_float(entry, "threshold"),
+                "boost": _optional_float(entry, "boost"),
+            }
+        except (TypeError, ValueError) as exc:
+            logger.warning("Ignoring KWS tuning for %s: %s", label, exc)
+    return tuning or None
 
 
-def create_wake_detector(config, asr, aliases=None):
+def create_wake_detector(config, asr, aliases=None, capture=None, offline=False):
     backend = str(config.get("WAKE_BACKEND", "asr")).strip().lower()
     phrases = config.get("WAKEUP_PHRASES")
     if not isinstance(phrases, list) or not phrases:
         phrases = [str(config.get("WAKEUP_PHRASE") or "").strip()]
 
     if backend in {"asr", "legacy"}:
+        if bool(config.get("WAKE_STAGED", False)):
+            if not callable(getattr(asr, "capture_pcm16", None)):
+                raise ValueError("WAKE_STAGED needs an ASR backend that can capture utterances")
+            return StagedWakeDetector(
+                asr,
+                phrases,
+                aliases,
+                screen_threshold=float(config.get("WAKE_SCREEN_THRESHOLD", 0.6)),
+                verify=bool(config.get("WAKE_STAGED_VERIFY", True)),
+            )
         return ASRWakeDetector(asr, phrases, aliases)
 
     if backend in {"sherpa-onnx", "sherpa", "kws"}:
+        verifier = None
+        if bool(config.get("KWS_VERIFY", False)):
+            if asr is None:
+                raise ValueError("KWS_VERIFY needs an ASR backend to verify hits with")
+            verifier = WakeVerifier(asr, phrases, aliases)
         return SherpaOnnxWakeDetector(
             tokens=str(config.get("KWS_TOKENS") or ""),
             encoder=str(config.get("KWS_ENCODER") or ""),
@@ -23,6 +71,20 @@ def create_wake_detector(config, asr, aliases=None):
             num_threads=int(config.get("KWS_NUM_THREADS", 2)),
             provider=str(config.get("KWS_PROVIDER") or "cpu"),
             device=config.get("KWS_INPUT_DEVICE"),
+            capture=capture,
+            keywords_threshold=_optional_float(config, "KWS_KEYWORDS_THRESHOLD"),
+            keywords_score=_optional_float(config, "KWS_KEYWORDS_SCORE"),
+            microphone=not offline,
+            # One-shot "wake + command": keep listening briefly after a hit.
+            trailing_ms=int(config.get("KWS_TRAILING_MS", 600)) if bool(config.get("WAKE_ONE_SHOT", False)) else 0,
+            trailing_silence_sec=float(config.get("ASR_SILENCE_SECONDS", 0.8)),
+            trailing_max_sec=float(config.get("ASR_MAX_SECONDS", 12.0)),
+            trailing_rms=float(config.get("ASR_RMS_THRESHOLD", 0.012)),
+            keyword_tuning=_keyword_tuning(config),
+            keep_device_open=bool(config.get("KWS_KEEP_DEVICE_OPEN", False)),
+            verifier=verifier,
+            verify_window_ms=int(config.get("KWS_VERIFY_WINDOW_MS", 2000)),
+            verify_tail_ms=int(config.get("KWS_VERIFY_TAIL_MS", 400)),
         )
 
     raise ValueError(f"Unsupported WAKE_BACKEND: {backend}")
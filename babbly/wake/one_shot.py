@@ -0,0 +1,36 @@
+"""One-shot "wake + command" utterances.
+
+"バブリー、状況報告" spoken in one breath would otherwise cost the wake
+acknowledgement and a second recognition turn. The wake gate hands over what
+followed the phrase (``WakeResult.remainder`` from the ASR gate, or
+``WakeResult.audio`` from the KWS gate). When that resolves to a known intent it
+becomes the first command. The command still goes through the intent policy
+and any confirmation; one-shot only saves the extra turn.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from babbly.asr.tiers import transcribe_in_state
+from babbly.asr.types import ASRResult
+from babbly.wake.types import WakeResult
+
+
+def resolve_one_shot(wake: WakeResult, resolver, asr=None) -> Optional[ASRResult]:
+    """The command spoken with the wake phrase, or None to prompt as usual.
+
+    Trailing KWS audio is transcribed in the ``command`` state with ``asr``.
+    Text that resolves to ``unknown`` (a cough, a trailing "えーと") returns
+    None so the normal acknowledgement and prompt follow.
+    """
+    if wake.remainder.strip():
+        backend = wake.backend.split(":", 1)[-1]
+        result = ASRResult(text=wake.remainder, confidence=wake.confidence, backend=backend)
+    elif wake.audio and asr is not None:
+        result = transcribe_in_state(asr, wake.audio, wake.sample_rate, "command")
+    else:
+        return None
+    if result.is_empty or resolver.resolve(result.text).name == "unknown":
+        return None
+    return result
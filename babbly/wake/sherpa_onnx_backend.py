@@ -1,9 +1,110 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import math
+import tempfile
+import time
+from collections import deque
+from dataclasses import replace
 from pathlib import Path
+from typing import Mapping
+
+from babbly.audio.ring import ChunkRing
+from babbly.core.latency import LatencyStats
 
 from babbly.wake.base import WakeDetector
 from babbly.wake.types import WakeResult
 
 
+logger = logging.getLogger(__name__)
+
+
+def _keyword_score(result) -> float | None:
+    """The spotter's score for a hit when this sherpa-onnx build reports one."""
+    for name in ("score", "confidence"):
+        value = getattr(result, name, None)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+def tune_keywords(lines, tuning: Mapping[str, Mapping[str, object]]) -> str:
+    """Keyword-file lines with per-keyword ``:boost`` / ``#threshold`` applied.
+
+    sherpa-onnx keyword lines read ``<tokens> [:boost] [#threshold] [@label]``.
+    A line whose ``@label`` is a key of ``tuning`` gets that entry's ``boost``
+    and ``threshold`` in place of its own; other lines are kept. Returns the
+    text of a keyword file; a ``tuning`` key that labels no line is logged.
+    """
+    keywords = []
+    labels = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        label = next((part[1:] for part in parts if part.startswith("@")), "")
+        labels.add(label)
+        entry = tuning.get(label) if label else None
+        if entry:
+            parts = [part for part in parts if not part.startswith((":", "#", "@"))]
+            if entry.get("boost") is not None:
+                parts.append(f":{float(entry['boost']):g}")
+            if entry.get("threshold") is not None:
+                parts.append(f"#{float(entry['threshold']):g}")
+            parts.append(f"@{label}")
+        keywords.append(" ".join(parts))
+    for key in tuning:
+        if key not in labels:
+            logger.warning("Keyword tuning for %s matches no @label in the keyword file", key)
+    return "".join(keyword + "\n" for keyword in keywords)
+
+
+def collect_trailing(
+    chunks,
+    sample_rate: int,
+    *,
+    wait_ms: float,
+    silence_sec: float = 0.8,
+    max_sec: float = 8.0,
+    rms_threshold: float = 0.012,
+) -> bytes | None:
+    """Int16 PCM of speech that follows a wake hit, or None if nobody spoke.
+
+    ``chunks`` are float32 mono blocks read after the keyword. Speech must
+    start within ``wait_ms``; it ends after ``silence_sec`` of quiet or at
+    ``max_sec``.
+    """
+    import numpy as np
+
+    parts = []
+    elapsed = quiet = 0.0
+    speaking = False
+    for chunk in chunks:
+        mono = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if not len(mono):
+            continue
+        parts.append(mono)
+        seconds = len(mono) / float(sample_rate)
+        elapsed += seconds
+        if float(np.sqrt(np.mean(np.square(mono, dtype=np.float64)))) >= rms_threshold:
+            speaking = True
+            quiet = 0.0
+        elif speaking:
+            quiet += seconds
+            if quiet >= silence_sec:
+                break
+        elif elapsed * 1000.0 >= wait_ms:
+            return None
+        if elapsed >= max_sec:
+            break
+    if not speaking:
+        return None
+    audio = np.clip(np.concatenate(parts), -1.0, 1.0)
+    return (audio * 32767.0).astype(np.int16).tobytes()
+
+
 class SherpaOnnxWakeDetector(WakeDetector):
     """Always-on local KWS using an explicitly provisioned sherpa-onnx model.
 
@@ -11,6 +112,23 @@ class SherpaOnnxWakeDetector(WakeDetector):
     them at runtime and does not assume the public pretrained KWS models support
     Japanese. Detection only opens the command-listening gate; it has no action
     authority.
+
+    With ``trailing_ms`` above zero a hit keeps listening for a command spoken
+    in the same breath: if speech starts within ``trailing_ms`` it is captured
+    until ``trailing_silence_sec`` of quiet (at most ``trailing_max_sec``) and
+    returned as ``WakeResult.audio``.
+
+    The decoder stream is created once and only reset between wakes; the
+    shared-capture subscription (or, with ``keep_device_open``, the input
+    device) also stays open, and audio queued while Babbly handled a command
+    is discarded on re-arm. ``keyword_tuning`` maps a keyword's ``@label`` in
+    the keyword file to its own ``threshold`` / ``boost``.
+
+    With a ``verifier`` (``babbly.wake.verify.WakeVerifier``) the last
+    ``verify_window_ms`` of audio is kept in a ring. A hit is confirmed by
+    decoding that window plus ``verify_tail_ms`` after the hit, which catches
+    a particle that follows the keyword; a rejected hit is ignored and its tail
+    is spotted again.
     """
 
     def __init__(
@@ -26,11 +144,27 @@ class SherpaOnnxWakeDetector(WakeDetector):
         num_threads: int = 2,
         provider: str = "cpu",
         device=None,
+        capture=None,
+        keywords_threshold: float | None = None,
+        keywords_score: float | None = None,
+        microphone: bool = True,
+        trailing_ms: int = 0,
+        trailing_silence_sec: float = 0.8,
+        trailing_max_sec: float = 8.0,
+        trailing_rms: float = 0.012,
+        keyword_tuning: Mapping[str, Mapping[str, object]] | None = None,
+        keep_device_open: bool = False,
+        verifier=None,
+        verify_window_ms: int = 2000,
+        verify_tail_ms: int = 400,
     ):
         try:
             import numpy as np
             import sherpa_onnx
-            import sounddevice as sd
+
+            sd = None
+            if capture is None and microphone:
+                import sounddevice as sd
         except ImportError as exc:
             raise RuntimeError(
                 "sherpa-onnx wake backend requested but sherpa-onnx, numpy, or sounddevice is unavailable"
@@ -52,39 +186,256 @@ class SherpaOnnxWakeDetector(WakeDetector):
         self.sample_rate = max(8000, int(sample_rate))
         self.samples_per_read = max(1, int(self.sample_rate * max(20, int(chunk_ms)) / 1000))
         self.device = device
-        self.kws = sherpa_onnx.KeywordSpotter(
-            tokens=str(Path(tokens).expanduser()),
-            encoder=str(Path(encoder).expanduser()),
-            decoder=str(Path(decoder).expanduser()),
-            joiner=str(Path(joiner).expanduser()),
-            keywords_file=str(Path(keywords_file).expanduser()),
-            num_threads=max(1, int(num_threads)),
-            provider=str(provider or "cpu"),
+        # Optional shared AudioCaptureBus; otherwise wait() opens the device.
+        self.capture = capture
+        # Unset thresholds keep the model's defaults (and any per-keyword
+        # values in the keyword file).
+        tuning = {}
+        if keywords_threshold is not None:
+            tuning["keywords_threshold"] = float(keywords_threshold)
+        if keywords_score is not None:
+            tuning["keywords_score"] = float(keywords_score)
+        self.keywords_threshold = tuning.get("keywords_threshold")
+        self.trailing_ms = max(0, int(trailing_ms or 0))
+        self.trailing_silence_sec = max(0.0, float(trailing_silence_sec))
+        self.trailing_max_sec = max(0.0, float(trailing_max_sec))
+        self.trailing_rms = max(0.0, float(trailing_rms))
+        # Keywords passed to create_stream() are added to the file's, so tuned
+        # lines go in a keyword file of their own, read while the spotter loads.
+        with tempfile.TemporaryDirectory(prefix="babbly-kws-") as tuned_dir:
+            keywords_path = Path(keywords_file).expanduser()
+            if keyword_tuning:
+                lines = keywords_path.read_text(encoding="utf-8").splitlines()
+                keywords_path = Path(tuned_dir) / "keywords.txt"
+                keywords_path.write_text(tune_keywords(lines, keyword_tuning), encoding="utf-8")
+            self.kws = sherpa_onnx.KeywordSpotter(
+                tokens=str(Path(tokens).expanduser()),
+                encoder=str(Path(encoder).expanduser()),
+                decoder=str(Path(decoder).expanduser()),
+                joiner=str(Path(joiner).expanduser()),
+                keywords_file=str(keywords_path),
+                num_threads=max(1, int(num_threads)),
+                provider=str(provider or "cpu"),
+                **tuning,
+            )
+        self.keep_device_open = bool(keep_device_open)
+        self._stream = None
+        self._frames = None
+        self._input = None
+        self.rearm_latency = LatencyStats()
+        self.decode_latency = LatencyStats()
+        self.audio_sec = 0.0
+        self.decode_sec = 0.0
+        self.wakes = 0
+        self.verifier = verifier
+        self.verify_window_ms = max(0, int(verify_window_ms))
+        self.verify_tail_ms = max(0, int(verify_tail_ms))
+        self._preroll = None
+        if verifier is not None:
+            chunk_ms = 1000.0 * self.samples_per_read / self.sample_rate
+            self._preroll = ChunkRing(
+                max(1, math.ceil(self.verify_window_ms / chunk_ms)), 2 * self.samples_per_read
+            )
+
+    def _new_stream(self):
+        return self.kws.create_stream()
+
+    def _accept(self, stream, sample_rate: int, mono) -> WakeResult | None:
+        started = time.perf_counter()
+        try:
+            stream.accept_waveform(sample_rate, mono)
+            while self.kws.is_ready(stream):
+                self.kws.decode_stream(stream)
+                result = self.kws.get_result(stream)
+                if result:
+                    self.kws.reset_stream(stream)
+                    return WakeResult(
+                        triggered=True,
+                        keyword=str(getattr(result, "keyword", result)),
+                        backend="sherpa-onnx-kws",
+                        confidence=_keyword_score(result),
+                    )
+            return None
+        finally:
+            elapsed = time.perf_counter() - started
+            self.decode_sec += elapsed
+            self.audio_sec += len(mono) / float(sample_rate)
+            self.decode_latency.record(elapsed * 1000.0)
+
+    def scan(self, samples, sample_rate: int | None = None) -> list[tuple[float, WakeResult]]:
+        """Run a recording through a fresh stream as fast as it decodes.
+
+        Returns ``(offset_sec, result)`` for every trigger; offsets have the
+        resolution of one ``KWS_CHUNK_MS`` read.
+        """
+        rate = int(sample_rate or self.sample_rate)
+        audio = self.np.asarray(samples, dtype=self.np.float32).reshape(-1)
+        # Trailing silence flushes a keyword spoken at the very end.
+        audio = self.np.concatenate([audio, self.np.zeros(rate // 2, dtype=self.np.float32)])
+        step = max(1, rate * self.samples_per_read // self.sample_rate)
+        stream = self._new_stream()
+        window = rate * self.verify_window_ms // 1000
+        tail = rate * self.verify_tail_ms // 1000
+        hits = []
+        for start in range(0, len(audio), step):
+            chunk = audio[start:start + step]
+            result = self._accept(stream, rate, chunk)
+            if result is None:
+                continue
+            end = start + len(chunk)
+            if self.verifier is not None:
+                pcm = self._pcm16(audio[max(0, end - window):end + tail])
+                result = self._verify(result, pcm, rate)
+            if result is not None:
+                hits.append((end / float(rate), result))
+        return hits
+
+    def _pcm16(self, samples) -> bytes:
+        np = self.np
+        return (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16).tobytes()
+
+    def _verify(self, result: WakeResult, pcm: bytes, sample_rate: int) -> WakeResult | None:
+        if self.verifier.verify(pcm, sample_rate) is None:
+            logger.info("KWS hit %s rejected by verification", result.keyword)
+            return None
+        return result
+
+    def _tail(self, blocks) -> list:
+        """Blocks covering ``verify_tail_ms`` after a hit."""
+        chunks = []
+        needed_ms = float(self.verify_tail_ms)
+        if needed_ms <= 0:
+            return chunks
+        for sample_rate, mono in blocks:
+            chunks.append(mono)
+            needed_ms -= 1000.0 * len(mono) / sample_rate
+            if needed_ms <= 0:
+                break
+        return chunks
+
+    def _with_trailing(self, result: WakeResult, chunks, sample_rate: int) -> WakeResult:
+        if not self.trailing_ms:
+            return result
+        audio = collect_trailing(
+            chunks,
+            sample_rate,
+            wait_ms=self.trailing_ms,
+            silence_sec=self.trailing_silence_sec,
+            max_sec=self.trailing_max_sec,
+            rms_threshold=self.trailing_rms,
         )
+        if audio is None:
+            return result
+        return replace(result, audio=audio, sample_rate=sample_rate)
+
+    def _rearm(self) -> None:
+        """Reset the decoder and make sure audio flows, keeping both open."""
+        started = time.perf_counter()
+        if self._stream is None:
+            self._stream = self._new_stream()
+        else:
+            self.kws.reset_stream(self._stream)
+        if self._preroll is not None:
+            self._preroll.clear()
+        # Audio that queued up while Babbly handled a command is stale.
+        if self.capture is not None:
+            if self._frames is None:
+                self._frames = self.capture.subscribe()
+            else:
+                while self._frames.read(timeout=0) is not None:
+                    pass
+        elif self._input is None:
+            kwargs = {
+                "channels": 1,
+                "dtype": "float32",
+                "samplerate": self.sample_rate,
+            }
+            if self.device is not None:
+                kwargs["device"] = self.device
+            self._input = self.sd.InputStream(**kwargs)
+            self._input.start()
+        else:
+            available = self._input.read_available
+            if available:
+                self._input.read(available)
+        self.rearm_latency.record((time.perf_counter() - started) * 1000.0)
+
+    def _blocks(self):
+        if self.capture is not None:
+            for frame in self._frames:
+                yield frame.sample_rate, frame.samples
+            return
+        while True:
+            samples, _overflowed = self._input.read(self.samples_per_read)
+            yield self.sample_rate, self.np.asarray(samples, dtype=self.np.float32).reshape(-1)
+
+    @staticmethod
+    def _replay(backlog: deque, blocks):
+        """``blocks``, after the ones put back in ``backlog``."""
+        while True:
+            if backlog:
+                yield backlog.popleft()
+                continue
+            try:
+                yield next(blocks)
+            except StopIteration:
+                return
 
     def wait(self) -> WakeResult:
-        stream = self.kws.create_stream()
-        kwargs = {
-            "channels": 1,
-            "dtype": "float32",
-            "samplerate": self.sample_rate,
+        self._rearm()
+        blocks = self._blocks()
+        backlog = deque()
+        source = self._replay(backlog, blocks)
+        try:
+            for sample_rate, mono in source:
+                if self._preroll is not None:
+                    self._preroll.push(self._pcm16(mono))
+                result = self._accept(self._stream, sample_rate, mono)
+                if result is None:
+                    continue
+                tail = []
+                if self.verifier is not None:
+                    tail = self._tail(source)
+                    pcm = self._preroll.drain() + b"".join(self._pcm16(chunk) for chunk in tail)
+                    result = self._verify(result, pcm, sample_rate)
+                    if result is None:
+                        # The real wake may follow the rejected one inside the tail.
+                        backlog.extendleft((sample_rate, chunk) for chunk in reversed(tail))
+                        continue
+                self.wakes += 1
+                # The tail read for verification may start a one-shot command.
+                trailing = itertools.chain(tail, (samples for _rate, samples in source))
+                return self._with_trailing(result, trailing, sample_rate)
+        finally:
+            blocks.close()
+            if self.capture is None and not self.keep_device_open:
+                self._close_input()
+        return WakeResult(triggered=False, backend="sherpa-onnx-kws")
+
+    def stats(self) -> dict:
+        """Re-arm and decode latency plus the decode load while idle.
+
+        ``decode_load`` is decoder time per second of audio, i.e. the share of
+        one core the always-on spotter uses.
+        """
+        return {
+            "wakes": self.wakes,
+            "rearm": self.rearm_latency.to_dict(),
+            "decode_chunk": self.decode_latency.to_dict(),
+            "audio_sec": self.audio_sec,
+            "decode_sec": self.decode_sec,
+            "decode_load": self.decode_sec / self.audio_sec if self.audio_sec else None,
+            "verify": self.verifier.stats() if self.verifier is not None else None,
         }
-        if self.device is not None:
-            kwargs["device"] = self.device
-
-        with self.sd.InputStream(**kwargs) as audio:
-            while True:
-                samples, _overflowed = audio.read(self.samples_per_read)
-                mono = self.np.asarray(samples, dtype=self.np.float32).reshape(-1)
-                stream.accept_waveform(self.sample_rate, mono)
-                while self.kws.is_ready(stream):
-                    self.kws.decode_stream(stream)
-                    result = self.kws.get_result(stream)
-                    if result:
-                        self.kws.reset_stream(stream)
-                        return WakeResult(
-                            triggered=True,
-                            keyword=str(result),
-                            backend="sherpa-onnx-kws",
-                            confidence=None,
-                        )
+
+    def _close_input(self) -> None:
+        stream, self._input = self._input, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+    def close(self) -> None:
+        frames, self._frames = self._frames, None
+        if frames is not None:
+            frames.close()
+        self._close_input()
@@ -0,0 +1,175 @@
+"""Staged ASR wake gate: energy VAD, phonetic screen, full ASR verification.
+
+The plain ASR gate decodes everything the microphone hears with the full
+recognizer. ``StagedWakeDetector`` spends less while idle:
+
+1. ``vad``: the backend captures one ``EnergyVad`` bounded utterance without
+   decoding it, so silence never reaches a recognizer.
+2. ``screen``: the utterance is decoded in the ``wake`` state (a Vosk wake
+   grammar or a small Whisper tier) and its kana are compared with the wake
+   phrases. A fuzzy match is enough to pass.
+3. ``verify``: only candidates are decoded again with the open vocabulary
+   (no dialogue state, so a Vosk ``command`` grammar, which has no wake
+   phrase, never applies) and matched like the plain gate.
+
+Each stage counts what passed it and how long it decoded, so a replay of
+negative audio yields false accepts per hour for every stage.
+"""
+
+from __future__ import annotations
+
+import time
+import unicodedata
+from collections.abc import Sequence
+
+from babbly.asr.tiers import transcribe_in_state
+from babbly.core.latency import LatencyStats
+from babbly.wake.asr_backend import ASRWakeDetector
+from babbly.wake.types import WakeResult
+
+
+STAGES = ("vad", "screen", "verify")
+
+# Verification decodes outside any dialogue state: the backend's open
+# vocabulary (Vosk) or default tier (faster-whisper).
+VERIFY_STATE = None
+
+_SMALL_KANA = str.maketrans("ァィゥェォッャュョヮヵヶ", "アイウエオツヤユヨワカケ")
+
+
+def kana_fold(text: str) -> str:
+    """Comparable reading form: katakana, full-size kana, no long marks.
+
+    Hiragana become katakana and ASCII is lower-cased; spaces, punctuation and
+    ``ー`` are dropped. Kanji pass through unchanged and simply do not match.
+    """
+    folded = []
+    for char in unicodedata.normalize("NFKC", text or "").lower():
+        if "ぁ" <= char <= "ゖ":
+            char = chr(ord(char) + 0x60)
+        if char == "ー" or not char.isalnum():
+            continue
+        folded.append(char)
+    return "".join(folded).translate(_SMALL_KANA)
+
+
+def phonetic_similarity(text: str, phrase: str) -> float:
+    """How well the closest stretch of ``text`` spells ``phrase``, in [0, 1].
+
+    One minus the edit distance of the best-matching substring, relative to
+    the phrase length (approximate substring matching).
+    """
+    target = kana_fold(phrase)
+    heard = kana_fold(text)
+    if not target or not heard:
+        return 0.0
+    # previous[j]: cost of matching target[:i] ending anywhere before heard[j].
+    previous = [0] * (len(heard) + 1)
+    for i, expected in enumerate(target, 1):
+        current = [i] + [0] * len(heard)
+        for j, char in enumerate(heard, 1):
+            current[j] = min(
+                previous[j - 1] + (expected != char),
+                previous[j] + 1,
+                current[j - 1] + 1,
+            )
+        previous = current
+    return max(0.0, 1.0 - min(previous) / len(target))
+
+
+class StagedWakeDetector(ASRWakeDetector):
+    """ASR wake gate that decodes only speech, and fully only candidates.
+
+    The backend must provide ``capture_pcm16()`` (Vosk and faster-whisper
+    do). ``screen_threshold`` is the phonetic similarity a wake-state
+    transcript needs to reach verification. With ``verify=False`` the screen
+    transcript is matched directly; use it when the backend has no cheaper
+    wake tier or grammar, so the same audio is not decoded twice.
+    """
+
+    def __init__(
+        self,
+        asr,
+        phrases: str | Sequence[str],
+        aliases=None,
+        *,
+        screen_threshold: float = 0.6,
+        verify: bool = True,
+    ):
+        super().__init__(asr, phrases, aliases)
+        self.screen_threshold = min(1.0, max(0.0, float(screen_threshold)))
+        self.verify = bool(verify)
+        self.listened_sec = 0.0
+        self.speech_sec = 0.0
+        self.segments = 0
+        self.screen_passes = 0
+        self.wakes = 0
+        self.screen_latency = LatencyStats()
+        self.verify_latency = LatencyStats()
+        self.screen_sec = 0.0
+        self.verify_sec = 0.0
+
+    def screen_score(self, text: str) -> float:
+        return max((phonetic_similarity(text, phrase) for phrase in self.phrases), default=0.0)
+
+    def _decode(self, pcm: bytes, sample_rate: int, state: str | None):
+        started = time.perf_counter()
+        result = transcribe_in_state(self.asr, pcm, sample_rate, state)
+        elapsed = time.perf_counter() - started
+        if state == "wake":
+            self.screen_sec += elapsed
+            self.screen_latency.record(elapsed * 1000.0)
+        else:
+            self.verify_sec += elapsed
+            self.verify_latency.record(elapsed * 1000.0)
+        return result
+
+    def check(self, pcm: bytes, sample_rate: int) -> WakeResult | None:
+        """Run one VAD utterance through the screen and the verification."""
+        if not pcm:
+            return None
+        self.segments += 1
+        self.speech_sec += len(pcm) / 2.0 / sample_rate
+        result = self._decode(pcm, sample_rate, "wake")
+        if self.screen_score(result.text) < self.screen_threshold:
+            return None
+        self.screen_passes += 1
+        if self.verify:
+            result = self._decode(pcm, sample_rate, VERIFY_STATE)
+        wake = self.match(result)
+        if wake is not None:
+            self.wakes += 1
+        return wake
+
+    def wait(self) -> WakeResult:
+        started = time.monotonic()
+        try:
+            while True:
+                pcm, sample_rate = self.asr.capture_pcm16()
+                wake = self.check(pcm, sample_rate)
+                if wake is not None:
+                    return wake
+        finally:
+            self.listened_sec += time.monotonic() - started
+
+    def stage_counts(self) -> dict[str, int]:
+        """Utterances that passed each stage so far."""
+        return {"vad": self.segments, "screen": self.screen_passes, "verify": self.wakes}
+
+    def stats(self) -> dict:
+        """Per-stage counts, decode latency and decode load while listening.
+
+        A stage's load is its decode time per second listened, i.e. the share
+        of one core it used.
+        """
+        listened = self.listened_sec
+        return {
+            "wakes": self.wakes,
+            "listened_sec": listened,
+            "speech_sec": self.speech_sec,
+            "stages": self.stage_counts(),
+            "screen": self.screen_latency.to_dict(),
+            "verify": self.verify_latency.to_dict(),
+            "screen_load": self.screen_sec / listened if listened else None,
+            "verify_load": self.verify_sec / listened if listened else None,
+        }
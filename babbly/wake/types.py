@@ -8,3 +8,9 @@ class WakeResult:
     keyword: str = ""
     backend: str = "unknown"
     confidence: Optional[float] = None
+    # What followed the wake phrase in the same breath, for one-shot
+    # "wake + command" utterances: the ASR text after the phrase, or (KWS)
+    # the trailing speech as mono int16 PCM at ``sample_rate``.
+    remainder: str = ""
+    audio: Optional[bytes] = None
+    sample_rate: int = 0
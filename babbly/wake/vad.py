@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable, Sequence
+from typing import Any, Iterable, List, Sequence
 
 
 class VadEvent(str, Enum):
@@ -60,10 +60,26 @@ class EnergyVad:
             return 0.0
         return math.sqrt(total / count)
 
+    @staticmethod
+    def rms_block(frames: Any) -> Any:
+        """RMS of every row of a 2-D ``(n_frames, frame_len)`` block at once.
+
+        Accumulates in float64 like the scalar path. Empty frames give 0.0.
+        """
+        import numpy as np
+
+        block = np.asarray(frames, dtype=np.float64)
+        if block.ndim == 1:
+            block = block.reshape(1, -1)
+        if block.shape[1] == 0:
+            return np.zeros(block.shape[0], dtype=np.float64)
+        return np.sqrt(np.einsum("ij,ij->i", block, block) / block.shape[1])
+
     def observe_rms(self, rms: float) -> VadEvent:
         """Advance the state machine by one frame given its RMS level."""
-        loud = float(rms) >= self.rms_threshold
+        return self._advance(float(rms) >= self.rms_threshold)
 
+    def _advance(self, loud: bool) -> VadEvent:
         if not self._in_speech:
             if loud:
                 self._loud_run += 1
@@ -88,6 +104,19 @@ class EnergyVad:
             return VadEvent.SPEECH_END
         return VadEvent.SPEECH
 
+    def observe_block(self, frames: Any) -> List[VadEvent]:
+        """Advance over a 2-D block of frames; same events as ``observe_frame``
+        called row by row, with the RMS of the whole block computed in one call.
+        """
+        loud = (self.rms_block(frames) >= self.rms_threshold).tolist()
+        if not loud:
+            return []
+        if not self._in_speech and not any(loud):
+            # Idle fast path: an all-quiet block outside speech is all SILENCE.
+            self._loud_run = 0
+            return [VadEvent.SILENCE] * len(loud)
+        return [self._advance(value) for value in loud]
+
     def observe_frame(self, samples: Sequence[float]) -> VadEvent:
         return self.observe_rms(self.rms(samples))
 
@@ -95,8 +124,14 @@ class EnergyVad:
         """True if any utterance opens across a sequence of frames.
 
         Convenience for an idle gate: if this returns False for a window of
-        captured frames, full ASR does not need to run.
+        captured frames, full ASR does not need to run. A 2-D NumPy block is
+        evaluated with one vectorized RMS call.
         """
+        if getattr(frames, "ndim", None) == 2:
+            for loud in (self.rms_block(frames) >= self.rms_threshold).tolist():
+                if self._advance(loud) in (VadEvent.SPEECH_START, VadEvent.SPEECH):
+                    return True
+            return False
         for frame in frames:
             event = self.observe_frame(frame)
             if event in (VadEvent.SPEECH_START, VadEvent.SPEECH):
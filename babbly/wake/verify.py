@@ -0,0 +1,72 @@
+"""Second-stage verification of keyword-spotter hits.
+
+A spotter fires on the sound of the keyword alone, so "プログラムを終了して"
+(talking *about* a program) triggers like "プログラム" (addressing Babbly).
+``WakeVerifier`` decodes just the audio around a hit in the ``wake`` state
+(a small Whisper tier or a Vosk wake grammar) and keeps the hit only when the
+transcript contains a wake phrase used as an address: one that is not
+followed by a particle. The spotter stays the only always-on model; the ASR
+runs once per hit.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Sequence
+
+from babbly.asr.tiers import transcribe_in_state
+from babbly.core.latency import LatencyStats
+from babbly.wake.asr_backend import ASRWakeDetector
+from babbly.wake.types import WakeResult
+
+
+logger = logging.getLogger(__name__)
+
+# A wake phrase followed by one of these is an argument, not an address.
+PARTICLES = frozenset(
+    ("を", "が", "に", "は", "の", "で", "と", "も", "へ", "や", "から", "まで", "より", "って")
+)
+
+# Address words that happen to start with a particle's kana.
+ADDRESS_WORDS = ("はい", "もしもし")
+
+
+def addressed(remainder: str) -> bool:
+    """True unless the text after a wake phrase starts with a particle.
+
+    Checked on the text itself rather than on tokens: the simple tokenizer
+    keeps a hiragana run such as "をしゅうりょうして" as one word.
+    """
+    text = remainder.lstrip(" \u3000、，,。．.!！?？")
+    if not text or text.startswith(ADDRESS_WORDS):
+        return True
+    return not text.startswith(tuple(PARTICLES))
+
+
+class WakeVerifier:
+    """Check a hit against an ASR transcript of the audio around it."""
+
+    def __init__(self, asr, phrases: str | Sequence[str], aliases=None, *, state: str = "wake"):
+        self.asr = asr
+        self.state = state
+        self.gate = ASRWakeDetector(asr, phrases, aliases)
+        self.latency = LatencyStats()
+        self.accepted = 0
+        self.rejected = 0
+
+    def verify(self, pcm: bytes, sample_rate: int) -> WakeResult | None:
+        """The wake phrase heard in ``pcm``, or None to reject the hit."""
+        started = time.perf_counter()
+        result = transcribe_in_state(self.asr, pcm, sample_rate, self.state)
+        self.latency.record((time.perf_counter() - started) * 1000.0)
+        wake = self.gate.match(result)
+        if wake is None or not addressed(wake.remainder):
+            self.rejected += 1
+            logger.info("wake verification rejected text=%s", result.text)
+            return None
+        self.accepted += 1
+        return wake
+
+    def stats(self) -> dict:
+        return {"accepted": self.accepted, "rejected": self.rejected, "latency": self.latency.to_dict()}
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+from array import array
+from pathlib import Path
+
+import pytest
+
+from babbly.asr.types import ASRResult
+from babbly.benchmark.asr_replay import load_manifest, read_wav_pcm16, replay, summarize
+from wav_helpers import write_wav
+
+
+class EchoASR:
+    """Reports the sample count and the pid that handled the file."""
+
+    def __init__(self, config):
+        self.sample_rate = int(config.get("SAMPLE_RATE", 16000))
+
+    def transcribe_pcm16(self, pcm, sample_rate):
+        if sample_rate != self.sample_rate:
+            raise ValueError("sample rate mismatch")
+        return ASRResult(text=f"{len(pcm) // 2}:{os.getpid()}", confidence=0.5, backend="echo")
+
+
+def _manifest(tmp_path, lengths):
+    entries = []
+    for index, length in enumerate(lengths):
+        name = f"utt-{index}.wav"
+        write_wav(tmp_path / name, [index] * length)
+        entries.append({"id": f"utt-{index}", "audio": name})
+    entries.append({"id": "text-only", "utterance": "スキャンして"})
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps(entries), encoding="utf-8")
+    return manifest
+
+
+def test_read_wav_keeps_first_channel(tmp_path):
+    path = tmp_path / "stereo.wav"
+    write_wav(path, [1, -1, 2, -2, 3, -3], channels=2, rate=8000)
+
+    pcm, rate, duration = read_wav_pcm16(path)
+
+    assert rate == 8000
+    assert list(array("h", pcm)) == [1, 2, 3]
+    assert duration == 3 / 8000
+
+
+def test_load_manifest_resolves_audio_relative_to_manifest(tmp_path):
+    items = load_manifest(_manifest(tmp_path, [10, 20]))
+
+    assert [item["id"] for item in items] == ["utt-0", "utt-1"]
+    assert items[0]["audio"] == str(tmp_path / "utt-0.wav")
+
+
+def test_replay_in_process_emits_evaluator_rows(tmp_path):
+    items = load_manifest(_manifest(tmp_path, [1600, 800]))
+    items.append({"id": "missing", "audio": str(tmp_path / "missing.wav")})
+
+    rows = replay(items, {"ASR_BACKEND": "vosk", "MODEL_PATH": "models/ja-small"}, factory=EchoASR, device="bench")
+
+    assert [row["id"] for row in rows] == ["utt-0", "utt-1", "missing"]
+    assert rows[0]["recognized_text"].startswith("1600:")
+    assert rows[0]["backend"] == "echo" and rows[0]["model"] == "ja-small" and rows[0]["device"] == "bench"
+    assert abs(rows[0]["audio_sec"] - 0.1) < 1e-9
+    assert abs(rows[0]["rtf"] - rows[0]["latency_ms"] / 1000.0 / rows[0]["audio_sec"]) < 1e-9
+    assert rows[2]["error"] and rows[2]["recognized_text"] == ""
+    assert summarize(rows)["errors"] == 1
+
+
+def test_replay_worker_pool_preserves_manifest_order(tmp_path):
+    items = load_manifest(_manifest(tmp_path, [400, 300, 200, 100]))
+
+    rows = replay(items, {}, workers=2, factory=EchoASR)
+
+    assert [row["recognized_text"].split(":")[0] for row in rows] == ["400", "300", "200", "100"]
+    assert all(int(row["recognized_text"].split(":")[1]) != os.getpid() for row in rows)
+
+
+@pytest.mark.parametrize("tool", ["replay_asr_benchmark.py", "replay_wake_benchmark.py", "benchmark_one_shot.py"])
+def test_offline_tools_run_without_an_audio_stack(tool):
+    # The offline runners are for headless hosts: config loading must not
+    # import sounddevice or vosk.
+    root = Path(__file__).resolve().parents[1]
+    completed = subprocess.run(
+        [sys.executable, f"tools/{tool}", "--help"],
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": str(root)},
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
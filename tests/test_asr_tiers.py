@@ -0,0 +1,67 @@
+from babbly.asr.tiers import WhisperTier, listen_in_state, parse_whisper_tiers
+from babbly.asr.types import ASRResult
+from babbly.core.latency import LatencyStats
+from babbly.wake.asr_backend import ASRWakeDetector
+
+
+class TieredASR:
+    def __init__(self, text):
+        self.text = text
+        self.states = []
+
+    def listen_for(self, state):
+        self.states.append(state)
+        return ASRResult(self.text, None, "fake")
+
+    def listen(self):
+        return self.listen_for("command")
+
+
+class PlainASR:
+    def listen(self):
+        return ASRResult("はい", None, "plain")
+
+
+def test_default_is_one_command_tier_on_whisper_model():
+    assert parse_whisper_tiers({"WHISPER_MODEL": "small"}) == (WhisperTier("command", "small", 5),)
+
+
+def test_configured_tiers_keep_beam_and_fall_back_to_a_command_tier():
+    tiers = parse_whisper_tiers(
+        {
+            "WHISPER_MODEL": "small",
+            "WHISPER_TIERS": {
+                "Confirm": {"model": "tiny", "beam_size": 1},
+                "wake": "tiny",
+                "broken": {"beam_size": "wide"},
+            },
+        }
+    )
+
+    assert tiers == (
+        WhisperTier("confirm", "tiny", 1),
+        WhisperTier("wake", "tiny", 5),
+        WhisperTier("command", "small", 5),
+    )
+
+
+def test_dialogue_state_reaches_tiered_backends_only():
+    tiered = TieredASR("プログラム")
+
+    assert ASRWakeDetector(tiered, "プログラム").wait().triggered is True
+    assert listen_in_state(tiered, "confirm").text == "プログラム"
+    assert tiered.states == ["wake", "confirm"]
+    assert listen_in_state(PlainASR(), "confirm").backend == "plain"
+
+
+def test_latency_stats_summarize_recent_window():
+    stats = LatencyStats(window=3)
+    for value in (100.0, 10.0, 20.0, 30.0):
+        stats.record(value)
+
+    summary = stats.to_dict()
+    assert summary["count"] == 4
+    assert summary["max_ms"] == 100.0
+    assert summary["p50_ms"] == 20.0
+    assert summary["mean_ms"] == 40.0
+    assert LatencyStats().to_dict()["p95_ms"] is None
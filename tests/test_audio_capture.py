@@ -0,0 +1,69 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from babbly.audio import AudioCaptureBus, CallbackStream, create_audio_capture
+
+
+def _block(value, size=1600):
+    return np.full((size, 1), value, dtype=np.float32)
+
+
+def test_one_copy_is_shared_read_only_by_every_subscriber():
+    bus = AudioCaptureBus(sample_rate=16000, block_ms=100, preroll_ms=0)
+    wake = bus.subscribe()
+    vad = bus.subscribe()
+    source = _block(0.25)
+
+    bus._callback(source, 1600, None, None)
+    source[:] = 0.0  # PortAudio reuses its buffer after the callback.
+
+    first, second = wake.read(timeout=0), vad.read(timeout=0)
+    assert first is second
+    assert float(first.samples[0]) == 0.25
+    assert first.samples.flags.writeable is False
+    assert first.int16 is second.int16
+    assert int(first.int16[0]) == int(0.25 * 32767)
+
+
+def test_late_subscriber_receives_preroll_from_the_ring():
+    bus = AudioCaptureBus(sample_rate=16000, block_ms=100, preroll_ms=300)
+    for value in (0.1, 0.2, 0.3, 0.4):
+        bus.publish(_block(value)[:, 0])
+
+    command = bus.subscribe(preroll_ms=200)
+    bus.publish(_block(0.5)[:, 0])
+
+    values = [round(float(command.read(timeout=0).samples[0]), 2) for _ in range(3)]
+    assert values == [0.3, 0.4, 0.5]
+    assert command.read(timeout=0) is None
+
+
+def test_stalled_subscriber_drops_its_oldest_frames_only():
+    bus = AudioCaptureBus(sample_rate=16000, block_ms=100, preroll_ms=0, queue_ms=200)
+    slow = bus.subscribe()
+    fast = bus.subscribe()
+    for index in range(4):
+        bus.publish(_block(index / 10.0)[:, 0])
+        fast.read(timeout=0)
+
+    assert slow.dropped == 2
+    assert [frame.index for frame in (slow.read(timeout=0), slow.read(timeout=0))] == [2, 3]
+    assert fast.dropped == 0
+
+
+def test_callback_stream_feeds_int16_bytes_like_a_raw_input_stream():
+    bus = AudioCaptureBus(sample_rate=16000, block_ms=100, preroll_ms=0)
+    received = []
+    stream = CallbackStream(bus, lambda data, frames, time, status: received.append(bytes(data)))
+    stream.start()
+    bus.publish(_block(0.5)[:, 0])
+    stream.stop()
+
+    assert stream.active is False
+    assert len(received) == 1 and len(received[0]) == 1600 * 2
+
+
+def test_shared_capture_is_disabled_by_default():
+    assert create_audio_capture({}) is None
+    assert create_audio_capture({"AUDIO_CAPTURE_SHARED": True, "AUDIO_PREROLL_MS": 500}).preroll_ms == 500.0
@@ -0,0 +1,121 @@
+import logging
+
+import pytest
+
+from babbly.adapters.audio import AudioHealthAdapter
+from babbly.adapters.factory import create_audio_health_adapter, create_situation_engine
+from babbly.audio.ring import AudioQueueStats, ChunkRing, XrunLog
+from babbly.ja.vosk_asr_module import MicrophoneStream
+
+
+def test_ring_drops_oldest_by_default_and_counts_overflows():
+    ring = ChunkRing(3, 4)
+    for chunk in (b"aaaa", b"bbbb", b"cccc", b"dddd", b"ee"):
+        ring.push(chunk)
+
+    assert len(ring) == 3 and ring.overflows == 2 and ring.high_water == 3
+    assert ring.drain() == b"ccccddddee"
+    assert len(ring) == 0
+
+
+def test_ring_newest_policy_keeps_the_start_and_splits_large_blocks():
+    ring = ChunkRing(2, 4, policy="newest")
+    assert ring.push(b"aaaabbbbcccc") == 1
+
+    assert ring.overflows == 1
+    assert ring.drain() == b"aaaabbbb"
+
+
+def test_ring_reuses_its_preallocated_buffer():
+    ring = ChunkRing(2, 4)
+    buffer = ring._buffer
+    for _ in range(10):
+        ring.push(b"abcd")
+        ring.drain()
+
+    assert ring._buffer is buffer and len(buffer) == 8
+
+
+def test_ring_trim_is_not_an_overflow_and_policy_is_validated():
+    ring = ChunkRing(4, 2)
+    for chunk in (b"aa", b"bb", b"cc"):
+        ring.push(chunk)
+    ring.trim(1)
+
+    assert ring.drain() == b"cc" and ring.overflows == 0
+    with pytest.raises(ValueError):
+        ChunkRing(4, 2, policy="random")
+
+
+class Status:
+    input_underflow = True
+
+    def __bool__(self):
+        return True
+
+    def __str__(self):
+        return "input underflow"
+
+
+def test_xrun_log_counts_every_event_but_logs_once_per_interval(caplog):
+    now = [0.0]
+    log = XrunLog(interval_sec=5.0, clock=lambda: now[0])
+    with caplog.at_level(logging.WARNING, logger="babbly.audio.ring"):
+        for t in (0.0, 1.0, 2.0, 6.0):
+            now[0] = t
+            log.record(Status())
+        log.record(None)
+
+    assert log.xruns == 4 and log.underruns == 4
+    assert len(caplog.records) == 2
+    assert "(3 since last report)" in caplog.records[1].getMessage()
+
+
+def test_microphone_stream_bounds_armed_audio_and_reports_stats():
+    # 100 ms chunks, at most 300 ms queued.
+    mic = MicrophoneStream(16000, 1600, max_seconds=0.3)
+    mic.arm()
+    for index in range(5):
+        mic.callback(bytes([index]) * 3200, 1600, None, Status() if index == 4 else None)
+
+    stats = mic.stats()
+    assert (stats.depth, stats.capacity, stats.overflows, stats.xruns) == (3, 3, 2, 1)
+    assert next(mic.generator()) == bytes([2]) * 3200 + bytes([3]) * 3200 + bytes([4]) * 3200
+    assert mic.stats().depth == 0
+
+
+def _stats(overflows=0, xruns=0):
+    return AudioQueueStats(depth=1, capacity=10, high_water=2, overflows=overflows, xruns=xruns, underruns=0)
+
+
+def test_audio_health_adapter_warns_only_on_new_losses():
+    current = [_stats()]
+    adapter = AudioHealthAdapter(lambda: current[0])
+
+    assert [obs.severity for obs in adapter.observations()] == ["info"]
+    current[0] = _stats(overflows=3, xruns=1)
+    (obs,) = adapter.observations()
+    assert obs.severity == "warning" and obs.category == "audio.capture"
+    assert obs.source == adapter.name == "audio"
+    assert obs.data["new_overflows"] == 3 and obs.data["overflows"] == 3
+    assert adapter.observations()[0].severity == "info"
+
+
+def test_audio_health_adapter_is_off_by_default():
+    class ASR:
+        def audio_stats(self):
+            return _stats()
+
+    assert create_audio_health_adapter({}, ASR()) is None
+    assert create_audio_health_adapter({"AUDIO_HEALTH_ADAPTER": True}, object()) is None
+    assert isinstance(create_audio_health_adapter({"AUDIO_HEALTH_ADAPTER": True}, ASR()), AudioHealthAdapter)
+
+
+def test_situation_engine_is_built_with_the_audio_health_adapter():
+    class ASR:
+        def audio_stats(self):
+            return _stats()
+
+    assert create_situation_engine({}, ASR()).adapters == []
+    (adapter,) = create_situation_engine({"AUDIO_HEALTH_ADAPTER": True}, ASR()).adapters
+    assert isinstance(adapter, AudioHealthAdapter)
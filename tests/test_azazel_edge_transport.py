@@ -104,6 +104,21 @@ def test_status_view_flows_into_situation_engine_as_read_only_advice():
     assert snapshot.recommendations[0].advisory_only is True
 
 
+def test_one_collection_cycle_is_one_round_trip_without_cache():
+    opener = FakeOpener(json.dumps(status_payload()).encode("utf-8"))
+    provider = AzazelEdgeStatusProvider("http://127.0.0.1:8084", cache_ttl_sec=0.0, opener=opener)
+    engine = SituationEngine([AzazelAdapter(provider)])
+
+    snapshot = engine.collect()
+
+    assert len(opener.calls) == 1
+    assert snapshot.recommendations[0].action == "review evidence"
+    assert any(item.category == "health.suricata" for item in snapshot.observations)
+
+    engine.collect()
+    assert len(opener.calls) == 2
+
+
 def test_native_edge_state_is_supported_only_as_compatibility_fallback():
     translated = translate_edge_state(
         {"user_state": "NORMAL", "suricata_critical": 0, "suricata_warning": 0}
@@ -30,3 +30,13 @@ def test_missing_backend_confidence_uses_deterministic_intent_score():
     policy = IntentPolicy(execute_threshold=0.90, clarify_threshold=0.60)
     result = policy.evaluate(IntentResult("network.scan", 0.98, "ネットワークをスキャン"), None)
     assert result.decision == Decision.EXECUTE
+
+
+def test_read_only_threshold_applies_only_with_measured_confidence():
+    policy = IntentPolicy(read_only={"situation.report"}, read_only_execute_threshold=0.80)
+    report = IntentResult("situation.report", 0.98, "状況報告")
+    scan = IntentResult("network.scan", 0.98, "ネットワークをスキャン")
+
+    assert policy.evaluate(report, 0.85).decision == Decision.EXECUTE
+    assert policy.evaluate(scan, 0.85).decision == Decision.CLARIFY
+    assert policy.evaluate(IntentResult("situation.report", 0.85, "状況")).decision == Decision.CLARIFY
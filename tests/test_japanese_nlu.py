@@ -1,7 +1,26 @@
-from babbly.nlu.japanese import IntentResolver, normalize_japanese
+import json
+from pathlib import Path
+
+from babbly.nlu.japanese import IntentResolver, IntentResult, _basic_normalize, normalize_japanese
+from babbly.nlu.matcher import TermAutomaton
 from babbly.nlu.vocabulary import build_aliases
 
 
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _linear_resolve(resolver, text):
+    """First-match reference: the resolver's original rule walk."""
+    normalized = normalize_japanese(text, resolver.aliases)
+    for intent, alternatives in resolver.rules:
+        for required_terms in alternatives:
+            if all(_basic_normalize(term) in normalized for term in required_terms):
+                confidence = 0.98 if len(required_terms) > 1 else 0.90
+                terms = tuple(sorted({term for term in map(_basic_normalize, required_terms) if term}))
+                return IntentResult(intent, confidence, normalized, terms)
+    return IntentResult("unknown", 0.0, normalized)
+
+
 def test_normalize_ignores_whitespace_and_punctuation():
     assert normalize_japanese(" ネットワーク を スキャンして。 ") == "ネットワークをスキャンして"
 
@@ -17,6 +36,12 @@ def test_network_scan_intent_does_not_depend_on_tokenization():
     assert result.confidence >= 0.9
 
 
+def test_resolved_intent_reports_the_terms_that_matched():
+    result = IntentResolver().resolve("状況を報告して")
+    assert result.matched_terms == ("報告", "状況")
+    assert IntentResolver().resolve("なにか").matched_terms == ()
+
+
 def test_target_show_intent_accepts_natural_phrase():
     resolver = IntentResolver()
     assert resolver.resolve("ターゲットを表示して").name == "target.show"
@@ -36,3 +61,59 @@ def test_azazel_vocabulary_does_not_create_unregistered_action():
     assert "edge" in result.normalized_text
     assert "shield" in result.normalized_text
     assert result.name == "unknown"
+
+
+def test_indexed_resolver_matches_first_match_reference_on_command_corpus():
+    corpus = json.loads((ROOT / "benchmarks" / "ja_command_corpus.json").read_text(encoding="utf-8"))
+    for packs in (("core",), ("core", "kali"), ("azazel",)):
+        resolver = IntentResolver(build_aliases(*packs))
+        for case in corpus:
+            assert resolver.resolve(case["utterance"]) == _linear_resolve(resolver, case["utterance"])
+
+
+def test_indexed_resolver_keeps_rule_order_with_overlapping_and_repeated_terms():
+    rules = (
+        ("late.pair", (("スキャン", "ネットワーク"),)),
+        ("repeat", (("状況", "状況"),)),
+        ("single", (("スキャン",),)),
+        ("substring", (("ネット",),)),
+        ("empty", (("",),)),
+    )
+    resolver = IntentResolver(rules=rules)
+    for text in ("ネットワークをスキャン", "状況", "スキャン", "ネット", "なにか", ""):
+        assert resolver.resolve(text) == _linear_resolve(resolver, text)
+    assert resolver.resolve("状況").confidence == 0.98
+    assert resolver.resolve("なにか").name == "empty"
+
+
+def test_term_automaton_reports_overlapping_terms():
+    automaton = TermAutomaton(["he", "she", "his", "hers", "", "he"])
+    found = {automaton.terms[index] for index in automaton.find("ushers")}
+    assert found == {"he", "she", "hers"}
+
+
+def test_simple_tokenizer_splits_script_runs():
+    from babbly.nlu.tokenizer import simple_tokenize
+
+    assert simple_tokenize("ターゲット1を192.168.0.1に設定して") == (
+        "ターゲット",
+        "1",
+        "を",
+        "192.168.0.1",
+        "に",
+        "設定",
+        "して",
+    )
+
+
+def test_tokenizer_service_memoizes_and_rejects_unknown_backend():
+    import pytest
+
+    from babbly.nlu.tokenizer import TokenizerService
+
+    service = TokenizerService("simple", cache_size=8).warm()
+    first = service.tokenize("ネットワークをスキャン")
+    assert service.tokenize("ネットワークをスキャン") is first
+    assert service.loaded is True
+    with pytest.raises(ValueError):
+        TokenizerService("mecab")
@@ -0,0 +1,273 @@
+import json
+import os
+import sys
+import time
+import types
+from collections import deque
+
+import pytest
+
+from babbly.asr.types import ASRResult
+from babbly.benchmark.runtime import _load_fresh_stats
+from babbly.nlu.tokenizer import TokenizerService, get_tokenizer, set_tokenizer
+from babbly.profiles import apply_profile_to_config, load_profile
+from babbly.wake.factory import _keyword_tuning, create_wake_detector
+from babbly.wake.sherpa_onnx_backend import _keyword_score, tune_keywords
+from babbly.wake.verify import WakeVerifier, addressed
+
+
+def test_tune_keywords_replaces_boost_and_threshold_of_labelled_lines():
+    lines = [
+        "# comment",
+        "b a b u r i :1.0 #0.3 @バブリー",
+        "p u r o g u r a m u @プログラム",
+        "",
+    ]
+
+    keywords = tune_keywords(lines, {"バブリー": {"threshold": 0.2, "boost": 2.5}, "プログラム": {"threshold": 0.4}})
+
+    assert keywords.splitlines() == ["b a b u r i :2.5 #0.2 @バブリー", "p u r o g u r a m u #0.4 @プログラム"]
+
+
+def test_tuning_for_an_unlabelled_keyword_is_logged(caplog):
+    keywords = tune_keywords(["b a b u r i @バブリー"], {"ミオ": {"threshold": 0.2}})
+
+    assert keywords == "b a b u r i @バブリー\n"
+    assert "ミオ" in caplog.text
+
+
+def test_keyword_score_is_exposed_only_when_reported():
+    assert _keyword_score("バブリー") is None
+    assert _keyword_score(types.SimpleNamespace(keyword="バブリー", score=0.83)) == 0.83
+
+
+def test_profile_wake_tuning_is_validated_and_projected(tmp_path):
+    payload = json.loads(open("profiles/generic.json", encoding="utf-8").read())
+    payload["identity"]["wake_tuning"] = {"バブリー": {"threshold": 0.25, "boost": 1.5}}
+    (tmp_path / "generic.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    config = apply_profile_to_config({}, load_profile("generic", tmp_path))
+    assert config["KWS_KEYWORD_TUNING"] == {"バブリー": {"threshold": 0.25, "boost": 1.5}}
+    assert _keyword_tuning(config) == {"バブリー": {"threshold": 0.25, "boost": 1.5}}
+    assert "KWS_KEYWORD_TUNING" not in apply_profile_to_config({}, load_profile("generic"))
+
+    payload["identity"]["wake_tuning"] = {"ミオ": {"threshold": 0.25}}
+    (tmp_path / "generic.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_profile("generic", tmp_path)
+    payload["identity"]["wake_tuning"] = {"バブリー": {"threshold": 1.5}}
+    (tmp_path / "generic.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_profile("generic", tmp_path)
+
+
+def test_runtime_stats_from_an_earlier_run_are_ignored(tmp_path):
+    path = tmp_path / "wake-stats.json"
+    path.write_text(json.dumps({"wakes": 2}), encoding="utf-8")
+
+    assert _load_fresh_stats(str(path), time.time() - 60) == {"wakes": 2}
+    os.utime(path, (0, 0))
+    assert _load_fresh_stats(str(path), time.time() - 60) is None
+    assert _load_fresh_stats(str(tmp_path / "missing.json"), 0) is None
+
+
+class FakeStream:
+    def __init__(self, keywords):
+        self.keywords = keywords
+        self.pending = []
+        self.hit = False
+
+    def accept_waveform(self, sample_rate, samples):
+        self.pending.append(samples)
+
+
+class FakeSpotter:
+    """Triggers on a block whose first sample is 1.0."""
+
+    def __init__(self, **kwargs):
+        with open(kwargs["keywords_file"], encoding="utf-8") as handle:
+            self.keywords = handle.read()
+        self.created = []
+        self.resets = 0
+
+    def create_stream(self, keywords=None):
+        stream = FakeStream(keywords)
+        self.created.append(stream)
+        return stream
+
+    def is_ready(self, stream):
+        return bool(stream.pending)
+
+    def decode_stream(self, stream):
+        stream.hit = stream.pending.pop(0)[0] == 1.0
+
+    def get_result(self, stream):
+        return types.SimpleNamespace(keyword="バブリー", score=0.9) if stream.hit else ""
+
+    def reset_stream(self, stream):
+        self.resets += 1
+
+
+class FakeSubscription:
+    """``frames`` were queued before the read; ``live`` arrives while reading."""
+
+    def __init__(self, live):
+        self.frames = deque()
+        self.live = deque(live)
+        self.closed = False
+
+    def read(self, timeout=None):
+        return self.frames.popleft() if self.frames else None
+
+    def __iter__(self):
+        while self.frames or self.live:
+            yield (self.frames or self.live).popleft()
+
+    def close(self):
+        self.closed = True
+
+
+def test_detector_keeps_one_stream_and_subscription_across_wakes(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setitem(sys.modules, "sherpa_onnx", types.SimpleNamespace(KeywordSpotter=FakeSpotter))
+    from babbly.wake.sherpa_onnx_backend import SherpaOnnxWakeDetector
+
+    files = {}
+    for name in ("tokens", "encoder", "decoder", "joiner", "keywords_file"):
+        files[name] = str(tmp_path / name)
+        (tmp_path / name).write_text("b a b u r i @バブリー\n", encoding="utf-8")
+
+    def frame(value):
+        return types.SimpleNamespace(sample_rate=16000, samples=np.full(1600, value, dtype=np.float32))
+
+    subscription = FakeSubscription([frame(0.0), frame(1.0)])
+    subscribes = []
+
+    class Capture:
+        def subscribe(self):
+            subscribes.append(1)
+            return subscription
+
+    detector = SherpaOnnxWakeDetector(
+        **files, capture=Capture(), keyword_tuning={"バブリー": {"threshold": 0.3, "boost": None}}
+    )
+
+    first = detector.wait()
+    assert first.triggered and first.keyword == "バブリー" and first.confidence == 0.9
+
+    # Audio queued while the command ran is dropped on re-arm.
+    subscription.frames.extend([frame(1.0), frame(1.0)])
+    subscription.live.extend([frame(0.0), frame(0.0), frame(1.0)])
+    assert detector.wait().triggered
+    assert not subscription.live
+
+    # Tuned lines replace the file's keywords rather than adding to them.
+    assert detector.kws.keywords == "b a b u r i #0.3 @バブリー\n"
+    assert len(detector.kws.created) == 1 and detector.kws.created[0].keywords is None
+    assert len(subscribes) == 1
+    stats = detector.stats()
+    assert stats["wakes"] == 2 and stats["rearm"]["count"] == 2
+    assert stats["audio_sec"] == pytest.approx(0.5) and stats["decode_load"] is not None
+    detector.close()
+    assert subscription.closed
+
+
+class ScriptedVerifyASR:
+    def __init__(self, *texts):
+        self.texts = list(texts)
+        self.heard = []
+
+    def transcribe_pcm16(self, pcm, sample_rate):
+        self.heard.append(len(pcm))
+        return ASRResult(self.texts.pop(0), None, "scripted")
+
+
+def test_wake_verifier_rejects_the_phrase_used_as_an_argument():
+    asr = ScriptedVerifyASR("プログラムを終了して", "ねえプログラム", "プログラム状況報告", "こんにちは")
+    verifier = WakeVerifier(asr, "プログラム")
+
+    assert verifier.verify(b"\0\0", 16000) is None
+    assert verifier.verify(b"\0\0", 16000).keyword == "プログラム"
+    assert verifier.verify(b"\0\0", 16000).remainder == "状況報告"
+    assert verifier.verify(b"\0\0", 16000) is None
+    assert addressed("") and addressed("はい") and not addressed("を終了して")
+    stats = verifier.stats()
+    assert stats["accepted"] == 2 and stats["rejected"] == 2 and stats["latency"]["count"] == 4
+
+
+def test_particle_check_does_not_depend_on_segmentation():
+    previous = get_tokenizer()
+    set_tokenizer(TokenizerService("simple"))
+    try:
+        # The simple tokenizer keeps each hiragana run as one word.
+        assert not addressed("をしゅうりょうして")
+        assert not addressed("、からきどうして")
+        assert addressed("はい") and addressed("じょうきょうほうこく") and addressed("状況報告")
+    finally:
+        set_tokenizer(previous)
+
+
+def _detector(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.setitem(sys.modules, "sherpa_onnx", types.SimpleNamespace(KeywordSpotter=FakeSpotter))
+    from babbly.wake.sherpa_onnx_backend import SherpaOnnxWakeDetector
+
+    files = {}
+    for name in ("tokens", "encoder", "decoder", "joiner", "keywords_file"):
+        files[name] = str(tmp_path / name)
+        (tmp_path / name).write_text("p u r o g u r a m u @プログラム\n", encoding="utf-8")
+    return SherpaOnnxWakeDetector(**files, **kwargs)
+
+
+def test_unverified_hits_are_ignored_and_the_window_includes_the_tail(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    def frame(value):
+        return types.SimpleNamespace(sample_rate=16000, samples=np.full(1600, value, dtype=np.float32))
+
+    # 100 ms blocks: a rejected hit, then an accepted one, each with 400 ms of tail.
+    subscription = FakeSubscription([frame(v) for v in (0.0, 1.0, 0, 0, 0, 0, 0.0, 1.0, 0, 0, 0, 0)])
+    capture = types.SimpleNamespace(subscribe=lambda: subscription)
+    asr = ScriptedVerifyASR("プログラムを終了して", "プログラム")
+    detector = _detector(tmp_path, monkeypatch, capture=capture, verifier=WakeVerifier(asr, "プログラム"))
+
+    assert detector.wait().triggered
+    # Two pre-roll blocks plus four tail blocks; the rejected tail is spotted
+    # again, so it is also in the second window.
+    assert asr.heard == [6 * 3200, 10 * 3200]
+    stats = detector.stats()
+    assert stats["wakes"] == 1 and stats["verify"]["rejected"] == 1
+
+
+def test_a_wake_inside_the_tail_of_a_rejected_hit_is_heard(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    def frame(value):
+        return types.SimpleNamespace(sample_rate=16000, samples=np.full(1600, value, dtype=np.float32))
+
+    # A confusable at the second block, the real wake two blocks later.
+    subscription = FakeSubscription([frame(v) for v in (0.0, 1.0, 0.0, 1.0, 0, 0, 0, 0)])
+    capture = types.SimpleNamespace(subscribe=lambda: subscription)
+    asr = ScriptedVerifyASR("プログラムを終了して", "プログラム")
+    detector = _detector(tmp_path, monkeypatch, capture=capture, verifier=WakeVerifier(asr, "プログラム"))
+
+    assert detector.wait().triggered
+    # The second window restarts at the rejected hit's tail.
+    assert asr.heard == [6 * 3200, 6 * 3200]
+    assert detector.stats()["verify"]["rejected"] == 1
+
+
+def test_replay_scan_verifies_each_hit_on_its_window(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    asr = ScriptedVerifyASR("プログラムを終了して")
+    detector = _detector(tmp_path, monkeypatch, microphone=False, verifier=WakeVerifier(asr, "プログラム"))
+    audio = np.zeros(16000, dtype=np.float32)
+    audio[8000:9600] = 1.0
+
+    assert detector.scan(audio, 16000) == []
+    # 2 s window clipped at the start, plus 400 ms after the hit.
+    assert asr.heard == [2 * (9600 + 6400)]
+
+
+def test_factory_needs_an_asr_to_verify_kws_hits():
+    with pytest.raises(ValueError):
+        create_wake_detector({"WAKE_BACKEND": "sherpa-onnx", "KWS_VERIFY": True}, None)
@@ -0,0 +1,36 @@
+from babbly.benchmark import micro
+from babbly.nlu.japanese import IntentResolver
+
+
+def test_snapshot_scaling_reports_each_size_in_order():
+    result = micro.snapshot_scaling((200, 20), repeat=1)
+
+    assert result["benchmark"] == "situation.snapshot_scaling"
+    assert [row["observations"] for row in result["rows"]] == [20, 200]
+    assert all(row["add_ms"] >= 0 and row["extend_ms"] >= 0 for row in result["rows"])
+    assert result["summary"]["per_item_ratio"] is not None
+
+
+def test_resolver_throughput_agrees_with_linear_reference():
+    result = micro.resolver_throughput(50, repeat=1)
+
+    assert result["rows"][0]["rules"] == 50 + len(IntentResolver.RULES)
+    assert result["summary"]["mismatches"] == 0
+
+
+def test_tokenizer_latency_reports_cold_and_warm_per_backend():
+    result = micro.tokenizer_latency(("simple",), repeat=1)
+
+    row = result["rows"][0]
+    assert row["backend"] == "simple"
+    assert row["cold_ms"] >= 0 and row["warm_ms"] >= 0 and row["memoized_ms"] >= 0
+
+
+def test_vad_throughput_reports_both_paths_with_identical_events():
+    import pytest
+
+    pytest.importorskip("numpy")
+    result = micro.vad_throughput(200, repeat=1)
+
+    assert [row["path"] for row in result["rows"]] == ["scalar", "vectorized"]
+    assert result["summary"]["events_match"] is True
@@ -0,0 +1,214 @@
+import json
+import math
+import os
+
+import pytest
+
+from babbly.asr import vosk_backend
+from babbly.asr.grammar import VoskGrammar
+from babbly.asr.types import ASRAlternative, ASRResult
+from babbly.ja.vosk_asr_module import recognize_pcm16, recognize_pcm16_alternatives
+from babbly.modules.registry import RegistryService
+from babbly.nlu.japanese import IntentResolver
+from babbly.nlu.nbest import NBestReranker, create_nbest_reranker, hypothesis_confidence, hypothesis_priors
+from babbly.nlu.policy import Decision, IntentPolicy
+from tools.evaluate_asr_results import evaluate
+
+
+READ_ONLY = {"situation.report", "recommendation.explain", "attention.status"}
+
+
+def _result(*hypotheses, confidence=None):
+    return ASRResult(
+        text=hypotheses[0][0],
+        confidence=confidence,
+        backend="fake",
+        alternatives=tuple(ASRAlternative(text, score) for text, score in hypotheses),
+    )
+
+
+def test_priors_are_a_softmax_of_scores_or_fall_off_with_rank():
+    assert hypothesis_priors([0.0, 0.0]) == (0.5, 0.5)
+    high, low = hypothesis_priors([-1.0, -2.0])
+    assert high + low == pytest.approx(1.0) and high > low
+    assert hypothesis_priors([None, None, None]) == pytest.approx((6 / 11, 3 / 11, 2 / 11))
+
+
+def test_a_lower_ranked_hypothesis_is_judged_by_its_own_score():
+    scored = _result(("状況方向", -0.05), ("状況報告", -0.3), confidence=0.95)
+
+    assert hypothesis_confidence(scored, 0) == 0.95
+    assert hypothesis_confidence(scored, 1) == pytest.approx(math.exp(-0.3))
+    # Never above the top, and unknown without a comparable score.
+    assert hypothesis_confidence(_result(("a", -1.0), ("b", 0.5), confidence=0.4), 1) == 0.4
+    assert hypothesis_confidence(_result(("a", 200.0), ("b", 195.5)), 1) is None
+    assert hypothesis_confidence(_result(("a", None), ("b", None), confidence=0.9), 1) is None
+
+
+def test_lower_ranked_intent_beats_an_unresolvable_top_hypothesis():
+    reranker = NBestReranker(IntentResolver(), read_only=READ_ONLY)
+
+    choice = reranker.rerank(_result(("ネットワークおすきやん", -1.0), ("ネットワークをスキャン", -1.5)))
+
+    assert choice.rank == 1 and choice.intent.name == "network.scan"
+    assert reranker.stats() == {"reranked": 1, "kept": 0}
+
+
+def test_ties_and_improbable_alternatives_keep_the_top_hypothesis():
+    reranker = NBestReranker(IntentResolver(), min_prior=0.2)
+
+    assert reranker.rerank(_result(("状況報告", -1.0), ("状況報告して", -1.0))).rank == 0
+    assert reranker.rerank(_result(("状況方向", 0.0), ("状況報告", -5.0))).rank == 0
+
+
+def test_alternatives_never_select_exit():
+    reranker = NBestReranker(IntentResolver())
+
+    choice = reranker.rerank(_result(("しゅうりょう", -1.0), ("終了", -1.0)))
+
+    assert choice.rank == 0 and choice.intent.name == "unknown"
+
+
+def test_executable_intent_from_an_alternative_is_confirmed():
+    reranker = NBestReranker(IntentResolver(), read_only=READ_ONLY)
+    policy = IntentPolicy()
+
+    scan = reranker.rerank(_result(("ネットワークおすきやん", -1.0), ("ネットワークをスキャン", -1.2)))
+    report = reranker.rerank(_result(("状況方向", -1.0), ("状況報告", -1.2)))
+
+    assert reranker.gate(scan, policy.evaluate(scan.intent)).decision == Decision.CLARIFY
+    assert reranker.gate(report, policy.evaluate(report.intent)).decision == Decision.EXECUTE
+
+
+def _registry(tmp_path, alias):
+    paths = []
+    for name, payload in (
+        ("commands.json", {"1": {"ID": "a", "VoiceAlias": alias, "Command": "ls", "Arg_flg": 0}}),
+        ("targets.json", {}),
+        ("sop.json", {}),
+    ):
+        path = tmp_path / name
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        paths.append(path)
+    return RegistryService(*(str(path) for path in paths)), paths[0]
+
+
+def test_registry_names_fit_and_follow_registry_changes(tmp_path):
+    registry, commands = _registry(tmp_path, "テスト")
+    reranker = NBestReranker(IntentResolver(), registry)
+    hypotheses = _result(("てすと実行", -1.0), ("テスト実行", -1.2), ("デルタ実行", -1.2))
+
+    assert reranker.rerank(hypotheses).text == "テスト実行"
+
+    commands.write_text(
+        json.dumps({"1": {"ID": "d", "VoiceAlias": "デルタ", "Command": "ls", "Arg_flg": 0}}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.utime(commands, ns=(2 * 10**9, 2 * 10**9))
+    registry.refresh()
+    assert reranker.rerank(hypotheses).text == "デルタ実行"
+
+
+def test_reranker_is_off_unless_alternatives_are_requested():
+    assert create_nbest_reranker({}, IntentResolver()) is None
+    reranker = create_nbest_reranker({"ASR_ALTERNATIVES": 5, "NBEST_MIN_PRIOR": 0.1}, IntentResolver())
+    assert reranker.min_prior == 0.1
+
+
+class NBestRecognizer:
+    """Finalizes one segment per payload; the last payload repeats."""
+
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+
+    def AcceptWaveform(self, data):
+        return len(self.payloads) > 1
+
+    def Result(self):
+        payload = self.payloads.pop(0) if len(self.payloads) > 1 else self.payloads[0]
+        return json.dumps(payload, ensure_ascii=False)
+
+    def FinalResult(self):
+        return self.Result()
+
+
+def test_vosk_alternatives_keep_earlier_segments_and_scores():
+    recognizer = NBestRecognizer(
+        {"alternatives": [{"text": "ネットワーク を", "confidence": 210.0}]},
+        {"alternatives": [{"text": "スキャン", "confidence": 200.0}, {"text": "すき やん", "confidence": 195.5}]},
+    )
+
+    hypotheses = recognize_pcm16_alternatives(recognizer, b"\0\0" * 8000, chunk_bytes=8000)
+
+    assert hypotheses == [("ネットワークをスキャン", 200.0), ("ネットワークをすきやん", 195.5)]
+    assert recognize_pcm16(NBestRecognizer({"text": "はい"}), b"\0\0") == "はい"
+
+
+def test_vosk_asr_keeps_grammar_states_other_than_command_one_best(monkeypatch):
+    created = []
+
+    def fake_recognizer(model, sample_rate, grammar=None, alternatives=0, words=False):
+        created.append(alternatives)
+        return NBestRecognizer(
+            {"alternatives": [{"text": "状況 報告", "confidence": 5.0}, {"text": "状況 方向", "confidence": 4.0}]}
+        )
+
+    monkeypatch.setattr(vosk_backend, "load_vosk_model", lambda path: "model")
+    monkeypatch.setattr(vosk_backend, "create_recognizer", fake_recognizer)
+    grammar = VoskGrammar(resolver=IntentResolver(), states=("confirm", "command"))
+    asr = vosk_backend.VoskASR("model", microphone=False, grammar=grammar, alternatives=3)
+
+    result = asr.transcribe_pcm16(b"\0\0" * 100, 16000, state="command")
+    asr.transcribe_pcm16(b"\0\0" * 100, 16000, state="confirm")
+
+    assert result.text == "状況報告"
+    assert [alternative.text for alternative in result.alternatives] == ["状況報告", "状況方向"]
+    assert created == [3, 0]
+
+
+def test_evaluator_compares_top_and_nbest_turns():
+    corpus = [
+        {"id": "a", "utterance": "ネットワークをスキャン", "expected_intent": "network.scan"},
+        {"id": "b", "utterance": "状況報告", "expected_intent": "situation.report"},
+    ]
+    results = [
+        {
+            "id": "a",
+            "recognized_text": "ネットワークおすきやん",
+            "audio_sec": 2.0,
+            "latency_ms": 500.0,
+            "alternatives": [
+                {"text": "ネットワークおすきやん", "score": -1.0},
+                {"text": "ネットワークをスキャン", "score": -1.2},
+            ],
+        },
+        {"id": "b", "recognized_text": "状況報告", "audio_sec": 1.0, "latency_ms": 500.0},
+    ]
+
+    summary, rows = evaluate(corpus, results, confirm_turn_sec=2.0, repeat_turn_sec=4.0)
+
+    assert summary["intent_accuracy"] == 0.5 and summary["nbest_intent_accuracy"] == 1.0
+    assert summary["top_repeat_rate"] == 0.5 and summary["nbest_repeat_rate"] == 0.0
+    assert summary["nbest_clarification_rate"] == 0.5
+    assert rows[0]["top_turn"] == "repeat" and rows[0]["nbest_turn"] == "clarify"
+    assert summary["top_mean_task_sec"] == pytest.approx((2.5 + 4.0 + 1.5) / 2)
+    assert summary["nbest_mean_task_sec"] == pytest.approx((2.5 + 2.0 + 1.5) / 2)
+
+
+def test_evaluator_does_not_execute_a_rank_one_choice_on_the_top_confidence():
+    corpus = [{"id": "a", "utterance": "状況報告", "expected_intent": "situation.report"}]
+    results = [
+        {
+            "id": "a",
+            "recognized_text": "状況方向",
+            "confidence": 0.95,
+            "audio_sec": 1.0,
+            "latency_ms": 500.0,
+            "alternatives": [{"text": "状況方向", "score": -0.05}, {"text": "状況報告", "score": -0.3}],
+        }
+    ]
+
+    _summary, rows = evaluate(corpus, results, read_only_execute_threshold=0.9)
+
+    # exp(-0.3) is below the read-only threshold; the top's 0.95 is not.
+    assert rows[0]["nbest_intent"] == "situation.report" and rows[0]["nbest_turn"] == "clarify"
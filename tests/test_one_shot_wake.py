@@ -0,0 +1,107 @@
+import pytest
+
+from babbly.asr.types import ASRResult
+from babbly.benchmark.one_shot import compare_one_shot, summarize_one_shot
+from babbly.nlu.japanese import IntentResolver
+from babbly.wake import WakeResult, resolve_one_shot
+from babbly.wake.asr_backend import ASRWakeDetector
+from wav_helpers import RATE, tone, write_wav
+
+
+class ScriptedASR:
+    """Recognizes an utterance by its duration and records the dialogue state."""
+
+    def __init__(self, by_duration_ms):
+        self.by_duration_ms = by_duration_ms
+        self.states = []
+
+    def listen_for(self, state):
+        raise AssertionError("offline only")
+
+    def transcribe_pcm16(self, pcm, sample_rate, state=None):
+        self.states.append(state)
+        duration_ms = round(len(pcm) / 2 / sample_rate * 10) * 100
+        return ASRResult(self.by_duration_ms.get(duration_ms, ""), None, "scripted")
+
+
+def test_asr_gate_keeps_the_text_after_the_wake_phrase():
+    gate = ASRWakeDetector(None, ["バブリー"])
+
+    wake = gate.match(ASRResult("バブリー 状況 報告", 0.9, "vosk"))
+
+    assert wake.remainder == "状況報告"
+    assert gate.match(ASRResult("バブリー", None, "vosk")).remainder == ""
+
+
+def test_one_shot_resolves_a_known_command_and_skips_noise():
+    resolver = IntentResolver()
+
+    command = resolve_one_shot(WakeResult(True, "バブリー", "asr:vosk", 0.9, remainder="状況報告"), resolver)
+    assert (command.text, command.backend, command.confidence) == ("状況報告", "vosk", 0.9)
+    assert resolve_one_shot(WakeResult(True, "バブリー", "asr:vosk", remainder="えーと"), resolver) is None
+    assert resolve_one_shot(WakeResult(True, "バブリー", "asr:vosk"), resolver) is None
+
+
+def test_one_shot_transcribes_trailing_kws_audio_in_command_state():
+    asr = ScriptedASR({1000: "ネットワークをスキャン"})
+    wake = WakeResult(True, "バブリー", "sherpa-onnx-kws", audio=b"\0\0" * RATE, sample_rate=RATE)
+
+    command = resolve_one_shot(wake, IntentResolver(), asr)
+
+    assert command.text == "ネットワークをスキャン" and asr.states == ["command"]
+
+
+def test_trailing_capture_waits_briefly_then_ends_on_silence():
+    np = pytest.importorskip("numpy")
+    from babbly.wake.sherpa_onnx_backend import collect_trailing
+
+    quiet = np.zeros(1600, dtype=np.float32)
+    loud = np.full(1600, 0.1, dtype=np.float32)
+
+    # Speech starts within the wait and ends after 300 ms of quiet.
+    chunks = [quiet, loud, loud, quiet, quiet, quiet, loud]
+    pcm = collect_trailing(iter(chunks), RATE, wait_ms=600, silence_sec=0.3)
+    assert len(pcm) == 6 * 1600 * 2
+    # Nobody spoke within the wait.
+    assert collect_trailing(iter([quiet] * 10 + [loud]), RATE, wait_ms=600) is None
+
+
+def test_benchmark_times_one_shot_against_two_turns(tmp_path):
+    write_wav(tmp_path / "wake.wav", tone(500))
+    write_wav(tmp_path / "report.wav", tone(1000))
+    write_wav(tmp_path / "scan.wav", tone(1500))
+    asr = ScriptedASR(
+        {
+            500: "バブリー",
+            1000: "状況報告",
+            1500: "ネットワークをスキャン",
+            1700: "バブリー状況報告",
+            2200: "バブリーネット",
+        }
+    )
+    items = [
+        {"id": "report", "audio": str(tmp_path / "report.wav"), "expected_intent": "situation.report"},
+        {"id": "scan", "audio": str(tmp_path / "scan.wav"), "expected_intent": "network.scan"},
+        {"id": "missing", "audio": str(tmp_path / "missing.wav"), "expected_intent": "network.scan"},
+    ]
+
+    rows = compare_one_shot(
+        items,
+        asr,
+        str(tmp_path / "wake.wav"),
+        gate=ASRWakeDetector(asr, ["バブリー"]),
+        resolver=IntentResolver(),
+        ack_sec=1.0,
+        prompt_sec=0.8,
+        endpoint_sec=0.8,
+        gap_sec=0.2,
+    )
+
+    report, scan, missing = rows
+    assert report["one_shot_ok"] and report["one_shot_intent"] == "situation.report"
+    # ack + prompt + one extra endpoint - gap, plus or minus recognizer time.
+    assert report["saved_ms"] == pytest.approx(2400.0, abs=100.0)
+    assert not scan["one_shot_ok"] and scan["two_turn_intent"] == "network.scan"
+    assert "error" in missing
+    summary = summarize_one_shot(rows)
+    assert summary["errors"] == 1 and summary["one_shot_accuracy"] == 0.5 and summary["two_turn_accuracy"] == 1.0
@@ -42,6 +42,23 @@ def test_situation_report_uses_same_core_path_for_voice_and_web():
     assert voice.payload["snapshot"]["status"] == "warning"
 
 
+def test_situation_result_carries_typed_snapshot_and_serializes_lazily():
+    engine = StaticSituationEngine()
+    engine.snapshot.freeze()
+    runtime = OperatorIntentRuntime(engine, dry_run=True)
+
+    result = runtime.submit(OperatorIntent("recommendation.explain", SourceModality.VOICE))
+
+    assert result.snapshot is engine.snapshot
+    assert result.situation() is engine.snapshot
+    assert "_dict_cache" not in vars(engine.snapshot)
+    wire = result.to_dict()
+    assert wire["payload"]["recommendation"]["action"] == "Shield維持"
+    assert wire["payload"]["snapshot"]["status"] == "warning"
+    # Frozen snapshots serialize once per revision.
+    assert engine.snapshot.to_dict() is wire["payload"]["snapshot"]
+
+
 def test_registered_operation_has_same_semantics_from_voice_and_eud_under_dry_run():
     voice_intent = OperatorIntent(
         "operation.run",
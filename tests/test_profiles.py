@@ -1,3 +1,4 @@
+import re
 from pathlib import Path
 
 import pytest
@@ -73,3 +74,14 @@ def test_builtin_profiles_are_discoverable():
     assert "generic" in names
     assert "kali" in names
     assert "azazel-edge" in names
+
+
+def test_documented_profile_example_loads(tmp_path):
+    doc = Path("docs/agent-profiles.md").read_text(encoding="utf-8")
+    schema = doc.split("## Profile schema", 1)[1]
+    example = re.search(r"```json\n(.*?)```", schema, re.S).group(1)
+    (tmp_path / "azazel-edge.json").write_text(example, encoding="utf-8")
+
+    profile = load_profile("azazel-edge", tmp_path)
+
+    assert apply_profile_to_config({}, profile)["KWS_KEYWORD_TUNING"] == {"ミオ": {"threshold": 0.3, "boost": 1.5}}
@@ -0,0 +1,77 @@
+import json
+import os
+
+from babbly.modules.phonetic import PHONETIC_CODES
+from babbly.modules.registry import RegistryService
+from babbly.nlu.japanese import IntentResolver
+
+
+def _write(path, payload, mtime_ns):
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _registry(tmp_path):
+    commands = tmp_path / "commands.json"
+    targets = tmp_path / "targets.json"
+    sop = tmp_path / "sop.json"
+    _write(commands, {"1": {"ID": "a", "VoiceAlias": "テスト", "Command": "ls", "Arg_flg": 0}}, 10**9)
+    _write(targets, {"1": {"ID": "b", "VoiceAlias": "ターゲットブラボー", "IP": "192.0.2.2"}}, 10**9)
+    _write(sop, {"1": {"ID": "c", "VoiceAlias": "オペレーションチャーリー", "Info": "", "File": "opc.lst"}}, 10**9)
+    return RegistryService(str(commands), str(targets), str(sop)), commands, targets
+
+
+def test_registry_loads_once_and_reloads_only_changed_files(tmp_path):
+    registry, commands, targets = _registry(tmp_path)
+    command_mgr, target_mgr = registry.commands, registry.targets
+
+    assert registry.refresh() is False
+    assert registry.commands is command_mgr
+
+    _write(targets, {"1": {"ID": "b", "VoiceAlias": "ターゲットブラボー", "IP": "192.0.2.20"}}, 2 * 10**9)
+    assert registry.refresh() is True
+    assert registry.commands is command_mgr
+    assert registry.targets is not target_mgr
+    assert registry.targets.get_target_values("ブラボー") == ("ターゲットブラボー", "192.0.2.20")
+
+
+def test_registry_keeps_last_good_version_when_a_file_breaks(tmp_path):
+    registry, commands, _ = _registry(tmp_path)
+    command_mgr = registry.commands
+
+    commands.write_text("{broken", encoding="utf-8")
+    os.utime(commands, ns=(3 * 10**9, 3 * 10**9))
+
+    assert registry.refresh() is False
+    assert registry.commands is command_mgr
+    assert registry.commands.get_command_values("alpha") == ("テスト", 0)
+
+
+def test_explicit_reload_rebuilds_every_registry(tmp_path):
+    registry, _, _ = _registry(tmp_path)
+    operations, generation = registry.operations, registry.generation
+
+    assert registry.reload() == ()
+    assert registry.operations is not operations
+    assert registry.generation == generation + 1
+
+
+def test_explicit_reload_reports_registries_kept_at_the_old_version(tmp_path):
+    registry, commands, _ = _registry(tmp_path)
+    command_mgr = registry.commands
+
+    commands.write_text("{broken", encoding="utf-8")
+
+    assert registry.reload() == ("commands",)
+    assert registry.commands is command_mgr
+
+
+def test_managers_share_one_phonetic_index(tmp_path):
+    registry, _, _ = _registry(tmp_path)
+
+    assert PHONETIC_CODES["c"] == ("charlie", "チャーリー")
+    assert registry.operations.get_search_dict()["チャーリー"]["File"] == "opc.lst"
+
+
+def test_reload_intent_is_recognized():
+    assert IntentResolver().resolve("登録情報を再読み込みして").name == "registry.reload"
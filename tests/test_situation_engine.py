@@ -1,5 +1,8 @@
-from babbly.adapters.base import BabblyAdapter
-from babbly.core import Observation
+import threading
+import time
+
+from babbly.adapters.base import AdapterReport, BabblyAdapter
+from babbly.core import Observation, Recommendation
 from babbly.core.engine import SituationEngine
 
 
@@ -22,3 +25,134 @@ def test_one_failed_adapter_does_not_drop_healthy_context():
     assert snapshot.systems["failing"] == "error"
     assert snapshot.systems["healthy"] == "online"
     assert any(item.source == "healthy" for item in snapshot.observations)
+
+
+class SlowAdapter(BabblyAdapter):
+    def __init__(self, name, delay, severity="info", timeout_sec=None):
+        self.name = name
+        self.delay = delay
+        self.severity = severity
+        self.release = threading.Event()
+        if timeout_sec is not None:
+            self.timeout_sec = timeout_sec
+
+    def observations(self):
+        self.release.wait(self.delay)
+        return [Observation(self.name, "status", self.name, severity=self.severity)]
+
+
+def test_parallel_collection_matches_serial_order():
+    adapters = [SlowAdapter("first", 0.05), FailingAdapter(), SlowAdapter("last", 0.0, severity="warning")]
+    serial = SituationEngine(adapters).collect()
+    parallel = SituationEngine(adapters, max_workers=3).collect()
+
+    assert [item.source for item in parallel.observations] == ["first", "last"]
+    assert parallel.to_dict()["observations"][0]["source"] == serial.observations[0].source
+    assert parallel.systems == serial.systems
+    assert parallel.status == "warning"
+
+
+def test_slow_adapter_is_reported_as_timeout_without_blocking():
+    slow = SlowAdapter("slow", 5.0)
+    engine = SituationEngine([slow, HealthyAdapter()], max_workers=2, adapter_timeout_sec=0.05)
+
+    started = time.monotonic()
+    snapshot = engine.collect()
+    elapsed = time.monotonic() - started
+    slow.release.set()
+    engine.close()
+
+    assert elapsed < 1.0
+    assert snapshot.systems == {"slow": "timeout", "healthy": "online"}
+    assert [item.source for item in snapshot.observations] == ["healthy"]
+
+
+def test_collection_deadline_bounds_every_adapter():
+    slow = SlowAdapter("slow", 5.0, timeout_sec=10.0)
+    engine = SituationEngine([slow], max_workers=1, collection_timeout_sec=0.05)
+
+    snapshot = engine.collect()
+    slow.release.set()
+    engine.close()
+
+    assert snapshot.systems["slow"] == "timeout"
+
+
+def test_hung_adapter_is_not_resubmitted_while_in_flight():
+    slow = SlowAdapter("slow", 5.0)
+    calls = []
+    original = slow.observations
+
+    def counted():
+        calls.append(1)
+        return original()
+
+    slow.observations = counted
+    engine = SituationEngine([slow], max_workers=2, adapter_timeout_sec=0.02)
+
+    assert engine.collect().systems["slow"] == "timeout"
+    assert engine.collect().systems["slow"] == "timeout"
+    slow.release.set()
+    engine.close()
+
+    assert len(calls) == 1
+
+
+def test_concurrent_collections_submit_a_hung_adapter_once():
+    slow = SlowAdapter("slow", 5.0)
+    calls = []
+    original = slow.observations
+
+    def counted():
+        calls.append(1)
+        return original()
+
+    slow.observations = counted
+    engine = SituationEngine([slow], max_workers=8, adapter_timeout_sec=0.05)
+    start = threading.Barrier(8)
+
+    def collect():
+        start.wait()
+        engine.collect()
+
+    threads = [threading.Thread(target=collect) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    slow.release.set()
+    engine.close()
+
+    assert len(calls) == 1
+
+
+class BatchedAdapter(BabblyAdapter):
+    name = "batched"
+
+    def observations(self):
+        raise AssertionError("engine must use collect()")
+
+    def collect(self):
+        return AdapterReport(
+            observations=(Observation("batched", "status", "degraded", severity="caution"),),
+            recommendations=(Recommendation("batched", "observe", "degraded", priority=5),),
+            health="degraded",
+        )
+
+
+class DuckTypedAdapter:
+    name = "duck"
+
+    def observations(self):
+        return [Observation("duck", "status", "ok")]
+
+    def recommendations(self):
+        return [Recommendation("duck", "review", "ok", priority=1)]
+
+
+def test_engine_prefers_batched_collect_and_falls_back_to_two_calls():
+    snapshot = SituationEngine([BatchedAdapter(), DuckTypedAdapter()]).collect()
+
+    assert snapshot.systems == {"batched": "degraded", "duck": "online"}
+    assert [item.source for item in snapshot.recommendations] == ["duck", "batched"]
+    assert snapshot.status == "caution"
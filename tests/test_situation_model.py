@@ -18,3 +18,53 @@ def test_recommendations_are_sorted_by_priority():
 def test_recommendations_are_advisory_by_default():
     recommendation = Recommendation("azazel", "maintain shield", "suspicious scan")
     assert recommendation.advisory_only is True
+
+
+def test_equal_priorities_keep_insertion_order():
+    snapshot = SituationSnapshot()
+    for source, priority in (("a", 20), ("b", 10), ("c", 20), ("d", 10)):
+        snapshot.add_recommendation(Recommendation(source, "observe", "r", priority=priority))
+    assert [item.source for item in snapshot.recommendations] == ["b", "d", "a", "c"]
+
+
+def test_extend_matches_incremental_assembly():
+    observations = [
+        Observation("s", "c", "one", severity="caution"),
+        Observation("s", "c", "two", severity="bogus"),
+        Observation("s", "c", "three", severity="critical"),
+        Observation("s", "c", "four", severity="info"),
+    ]
+    recommendations = [Recommendation(str(p), "a", "r", priority=p) for p in (30, 10, 20, 10)]
+
+    incremental = SituationSnapshot()
+    for item in observations:
+        incremental.add_observation(item)
+    for item in recommendations:
+        incremental.add_recommendation(item)
+    bulk = SituationSnapshot()
+    bulk.extend(observations[:2], recommendations[:2])
+    bulk.extend(observations[2:], recommendations[2:])
+
+    assert bulk.status == incremental.status == "critical"
+    assert bulk.recommendations == incremental.recommendations
+
+
+def test_empty_extend_keeps_unknown_status():
+    snapshot = SituationSnapshot()
+    snapshot.extend()
+    assert snapshot.status == "unknown"
+
+
+def test_from_dict_keeps_wire_status_and_priority_order():
+    decoded = SituationSnapshot.from_dict(
+        {
+            "status": "critical",
+            "observations": [{"source": "s", "summary": "quiet", "severity": "info"}],
+            "recommendations": [
+                {"source": "late", "priority": 50},
+                {"source": "early", "priority": 5},
+            ],
+        }
+    )
+    assert decoded.status == "critical"
+    assert [item.source for item in decoded.recommendations] == ["early", "late"]
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from babbly.adapters.factory import create_situation_poller
+from babbly.core.engine import SituationEngine
+from babbly.core.operator_runtime import OperatorIntentRuntime
+from babbly.core.poller import SituationPoller
+from babbly.core.session import CoreSessionEndpoint
+from babbly.core.situation import Observation, SituationSnapshot
+from babbly.web.server import SituationWebApp
+
+
+class CountingEngine:
+    def __init__(self):
+        self.calls = 0
+
+    def collect(self):
+        self.calls += 1
+        snapshot = SituationSnapshot()
+        snapshot.set_system_state("azazel", "online")
+        snapshot.add_observation(
+            Observation("azazel", "alert", f"collection {self.calls}", severity="warning")
+        )
+        return snapshot
+
+
+def test_refresh_publishes_frozen_snapshot_with_monotonic_revision():
+    poller = SituationPoller(CountingEngine())
+
+    first = poller.refresh()
+    second = poller.refresh()
+
+    assert (first.revision, second.revision) == (1, 2)
+    assert poller.revision == 2
+    assert second.snapshot.frozen is True
+    with pytest.raises(RuntimeError):
+        second.snapshot.add_observation(Observation("x", "y", "z"))
+    with pytest.raises(TypeError):
+        second.snapshot.systems["other"] = "online"
+
+
+def test_readers_share_cached_snapshot_without_collecting():
+    engine = CountingEngine()
+    poller = SituationPoller(engine)
+
+    first = poller.collect()  # first read primes the cache synchronously
+    for _ in range(10):
+        assert poller.collect() is first
+    assert engine.calls == 1
+
+
+def test_many_surfaces_cost_one_collection_per_cycle():
+    engine = CountingEngine()
+    poller = SituationPoller(engine)
+    poller.refresh()
+    runtime = OperatorIntentRuntime(situation_engine=poller)
+    apps = [SituationWebApp(endpoint=CoreSessionEndpoint(runtime)) for _ in range(5)]
+
+    for app in apps:
+        status, _content_type, _body = app.handle("GET", "/api/situation")
+        assert status == 200
+
+    assert engine.calls == 1
+    envelope = apps[0].current_envelope()
+    assert envelope["situation_revision"] == 1
+    assert envelope["view"]["status"] == "warning"
+
+
+def test_background_thread_refreshes_on_cadence():
+    engine = CountingEngine()
+    poller = SituationPoller(engine, interval_sec=0.1).start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while poller.revision < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        poller.stop()
+
+    assert poller.revision >= 2
+    assert poller.running is False
+
+
+def test_factory_only_builds_poller_when_interval_is_configured():
+    engine = SituationEngine()
+    assert create_situation_poller({}, engine) is None
+    assert create_situation_poller({"SITUATION_POLL_INTERVAL_SEC": "bad"}, engine) is None
+    poller = create_situation_poller({"SITUATION_POLL_INTERVAL_SEC": 5}, engine)
+    assert poller.engine is engine
+    assert poller.interval_sec == 5.0
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from babbly.asr.types import ASRResult
+from babbly.core.engine import SituationEngine
+from babbly.core.operator_intent import OperatorIntent, SourceModality
+from babbly.core.operator_runtime import OperatorIntentRuntime
+from babbly.core.situation import SituationSnapshot
+from babbly.nlu.japanese import IntentResolver
+from babbly.nlu.policy import IntentPolicy
+from babbly.nlu.speculative import SpeculativeIntentPipeline
+
+
+def _hypotheses(*partials, final):
+    for text in partials:
+        yield ASRResult(text=text, backend="vosk", partial=True)
+    yield ASRResult(text=final, backend="vosk")
+
+
+def _pipeline(prefetch):
+    return SpeculativeIntentPipeline(
+        IntentResolver(),
+        IntentPolicy(),
+        {"situation.report": prefetch},
+        read_only=OperatorIntentRuntime.READ_ONLY_INTENTS,
+    )
+
+
+def test_prefetch_starts_on_a_clear_partial_and_commits_when_final_agrees():
+    calls = []
+    pipeline = _pipeline(lambda intent: calls.append(intent.name) or "snapshot")
+
+    outcome = pipeline.run(_hypotheses("状況", "状況報告", "状況報告して", final="状況報告して"))
+
+    assert outcome.intent.name == "situation.report"
+    assert outcome.committed and outcome.prefetched == "snapshot"
+    assert outcome.partials == 3
+    # One prefetch: the later partial resolved to the same intent.
+    assert calls == ["situation.report"]
+    assert (pipeline.speculations, pipeline.commits, pipeline.discards) == (1, 1, 0)
+    pipeline.close()
+
+
+def test_speculation_is_discarded_when_the_final_intent_differs():
+    pipeline = _pipeline(lambda intent: "snapshot")
+
+    outcome = pipeline.run(_hypotheses("状況報告", final="ネットワークをスキャン"))
+
+    assert outcome.intent.name == "network.scan"
+    assert outcome.speculated == "situation.report"
+    assert not outcome.committed and outcome.prefetched is None
+    assert pipeline.discards == 1
+    pipeline.close()
+
+
+def test_a_failed_prefetch_falls_back_to_the_normal_path():
+    def broken(intent):
+        raise RuntimeError("adapter down")
+
+    pipeline = _pipeline(broken)
+    outcome = pipeline.run(_hypotheses("状況報告", final="状況報告"))
+
+    assert outcome.intent.name == "situation.report" and not outcome.committed
+    pipeline.close()
+
+
+def test_no_speculation_without_partials_or_for_unregistered_intents():
+    calls = []
+    pipeline = _pipeline(lambda intent: calls.append(intent) or "snapshot")
+
+    assert pipeline.run(_hypotheses(final="状況報告")).speculated is None
+    assert pipeline.run(_hypotheses("ネットワークスキャン", final="ネットワークスキャン")).speculated is None
+    assert calls == []
+    # A stream that closes before its final result yields no outcome.
+    assert pipeline.run(iter([ASRResult(text="状況報告", partial=True)])) is None
+    pipeline.close()
+
+
+def test_only_read_only_intents_can_be_prefetched():
+    with pytest.raises(ValueError):
+        SpeculativeIntentPipeline(
+            IntentResolver(),
+            IntentPolicy(),
+            {"network.scan": lambda intent: None},
+            read_only=OperatorIntentRuntime.READ_ONLY_INTENTS,
+        )
+
+
+def test_runtime_uses_a_prefetched_snapshot_instead_of_collecting():
+    class CountingEngine(SituationEngine):
+        collects = 0
+
+        def collect(self):
+            self.collects += 1
+            return super().collect()
+
+    engine = CountingEngine()
+    runtime = OperatorIntentRuntime(engine)
+    prefetched = SituationSnapshot()
+
+    intent = OperatorIntent(intent_id="situation.report", source_modality=SourceModality.VOICE)
+    result = runtime.submit(intent, snapshot=prefetched)
+
+    assert result.snapshot is prefetched and engine.collects == 0
+    runtime.submit(intent)
+    assert engine.collects == 1
+
+
+def test_prefetch_runs_off_the_listening_thread():
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(intent):
+        started.set()
+        release.wait(5)
+        return "snapshot"
+
+    pipeline = _pipeline(slow)
+
+    def hypotheses():
+        yield ASRResult(text="状況報告", partial=True)
+        # The prefetch is already running while more speech streams in.
+        assert started.wait(5)
+        release.set()
+        yield ASRResult(text="状況報告")
+
+    assert pipeline.run(hypotheses()).prefetched == "snapshot"
+    pipeline.close()
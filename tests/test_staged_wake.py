@@ -0,0 +1,212 @@
+import json
+from array import array
+from collections import namedtuple
+
+import pytest
+
+from babbly.asr import vosk_backend
+from babbly.asr.grammar import VoskGrammar
+from babbly.asr.types import ASRResult
+from babbly.benchmark.asr_replay import load_manifest
+from babbly.benchmark.wake_replay import StagedGateScanner, replay_wake, stage_rates
+from babbly.ja.vosk_asr_module import MicrophoneStream, capture_utterance
+from babbly.nlu.japanese import IntentResolver
+from babbly.wake.factory import create_wake_detector
+from babbly.wake.staged import StagedWakeDetector, kana_fold, phonetic_similarity
+from wav_helpers import RATE, silence, tone, write_wav
+
+
+class StateASR:
+    """Transcribes by dialogue state; records which states decoded."""
+
+    def __init__(self, by_state, utterances=()):
+        self.by_state = by_state
+        self.utterances = iter(utterances)
+        self.states = []
+
+    def listen_for(self, state):
+        raise AssertionError("the staged gate must not stream-decode")
+
+    def capture_pcm16(self):
+        return next(self.utterances), RATE
+
+    def transcribe_pcm16(self, pcm, sample_rate, state="command"):
+        self.states.append(state)
+        text = self.by_state.get(state, "")
+        return ASRResult(text(pcm) if callable(text) else text, 0.8, "scripted")
+
+
+def test_kana_fold_ignores_script_size_and_long_marks():
+    assert kana_fold("ばぶりー") == kana_fold("バブリ") == "バブリ"
+    assert kana_fold("キャッシュ") == "キヤツシユ"
+    assert kana_fold(" M I O。") == "mio"
+
+
+def test_phonetic_similarity_finds_the_closest_stretch():
+    assert phonetic_similarity("ねえばぶりーさん", "バブリー") == 1.0
+    assert phonetic_similarity("バグリー", "バブリー") == pytest.approx(2 / 3)
+    assert phonetic_similarity("こんにちは", "バブリー") == 0.0
+    assert phonetic_similarity("", "バブリー") == 0.0
+
+
+def test_screen_rejects_before_full_verification():
+    asr = StateASR({"wake": "こんにちは", None: "バブリー"})
+    detector = StagedWakeDetector(asr, "バブリー")
+
+    assert detector.check(b"\0\0" * 100, RATE) is None
+    assert asr.states == ["wake"]
+    assert detector.stage_counts() == {"vad": 1, "screen": 0, "verify": 0}
+
+
+def test_candidate_is_verified_by_the_open_vocabulary_decode():
+    asr = StateASR({"wake": "ばぐりー", None: "バブリー状況報告"})
+    detector = StagedWakeDetector(asr, "バブリー")
+
+    wake = detector.check(b"\0\0" * 100, RATE)
+
+    assert wake.triggered and wake.keyword == "バブリー"
+    assert wake.remainder == "状況報告"
+    assert asr.states == ["wake", None]
+    assert detector.stage_counts() == {"vad": 1, "screen": 1, "verify": 1}
+
+
+class GrammarRecognizer:
+    """Hears "バブリー 状況 報告"; words outside its grammar decode as [unk]."""
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+
+    def AcceptWaveform(self, data):
+        return False
+
+    def FinalResult(self):
+        words = ["バブリー", "状況", "報告"]
+        if self.grammar is not None:
+            words = [word if word in self.grammar else "[unk]" for word in words]
+        return json.dumps({"text": " ".join(words)}, ensure_ascii=False)
+
+
+def test_verification_escapes_the_command_grammar(monkeypatch):
+    monkeypatch.setattr(vosk_backend, "load_vosk_model", lambda path: "model")
+    monkeypatch.setattr(
+        vosk_backend,
+        "create_recognizer",
+        lambda model, rate, grammar=None, alternatives=0, words=False: GrammarRecognizer(grammar),
+    )
+    grammar = VoskGrammar(resolver=IntentResolver(), wake_phrases=["バブリー"], states=("wake", "command"))
+    asr = vosk_backend.VoskASR("model", microphone=False, grammar=grammar)
+    assert "バブリー" not in grammar.phrases("command")
+
+    wake = StagedWakeDetector(asr, "バブリー").check(b"\0\0" * 100, RATE)
+
+    assert wake is not None and wake.remainder == "状況報告"
+
+
+def test_screen_pass_can_still_fail_verification():
+    asr = StateASR({"wake": "バブリー", None: "ハブリー"})
+    detector = StagedWakeDetector(asr, "バブリー")
+
+    assert detector.check(b"\0\0" * 100, RATE) is None
+    assert detector.stage_counts() == {"vad": 1, "screen": 1, "verify": 0}
+
+
+def test_without_verify_the_screen_transcript_is_matched_once():
+    asr = StateASR({"wake": "バブリー"})
+    detector = StagedWakeDetector(asr, "バブリー", verify=False)
+
+    assert detector.check(b"\0\0" * 100, RATE).triggered
+    assert asr.states == ["wake"]
+
+
+def test_wait_skips_empty_captures_and_reports_stage_stats():
+    asr = StateASR({"wake": "バブリー", None: "バブリー"}, [b"", b"\0\0" * RATE])
+    detector = StagedWakeDetector(asr, "バブリー")
+
+    assert detector.wait().triggered
+    stats = detector.stats()
+    assert stats["stages"] == {"vad": 1, "screen": 1, "verify": 1}
+    assert stats["speech_sec"] == 1.0
+    assert stats["screen"]["count"] == 1 and stats["verify"]["count"] == 1
+
+
+def test_factory_builds_staged_gate_only_when_enabled():
+    asr = StateASR({})
+    config = {"WAKEUP_PHRASE": "バブリー", "WAKE_STAGED": True, "WAKE_SCREEN_THRESHOLD": 0.8}
+    detector = create_wake_detector(config, asr)
+    assert isinstance(detector, StagedWakeDetector)
+    assert detector.screen_threshold == 0.8
+    assert not isinstance(create_wake_detector({"WAKEUP_PHRASE": "バブリー"}, asr), StagedWakeDetector)
+
+
+def test_factory_rejects_staged_gate_without_utterance_capture():
+    class ListenOnly:
+        def listen(self):
+            return ASRResult("", None, "fake")
+
+    with pytest.raises(ValueError):
+        create_wake_detector({"WAKEUP_PHRASE": "バブリー", "WAKE_STAGED": True}, ListenOnly())
+
+
+def test_staged_replay_reports_passes_per_stage_and_hour(tmp_path):
+    pytest.importorskip("numpy")
+    # Negative: two utterances, one of which sounds like the wake phrase.
+    write_wav(tmp_path / "neg.wav", silence(500) + tone(400) + silence(600) + tone(700) + silence(600))
+    write_wav(tmp_path / "pos.wav", silence(300) + tone(700) + silence(600))
+    manifest = tmp_path / "wake.json"
+    manifest.write_text(
+        json.dumps(
+            [
+                {"id": "neg", "audio": "neg.wav", "expected_trigger": False},
+                {"id": "pos", "audio": "pos.wav", "expected_trigger": True},
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    def heard(pcm):
+        # Utterance spans include the VAD lead-in and hangover frames.
+        return "バブリ" if len(pcm) / 2 / RATE > 0.9 else "はい"
+
+    asr = StateASR({"wake": heard, None: "ハブリー"})
+    detector = StagedWakeDetector(asr, "バブリー")
+
+    rows = replay_wake(load_manifest(manifest), StagedGateScanner(detector))
+
+    assert rows[0]["stages"] == {"vad": 2, "screen": 1, "verify": 0}
+    assert rows[1]["stages"] == {"vad": 1, "screen": 1, "verify": 0}
+    vad, screen, verify = stage_rates(rows)
+    negative_hours = rows[0]["audio_sec"] / 3600.0
+    assert vad["stage"] == "vad" and vad["passes_per_hour"] == pytest.approx(2 / negative_hours)
+    assert screen["negative_passes"] == 1 and screen["positive_recall"] == 1.0
+    assert verify["negative_passes"] == 0 and verify["positive_recall"] == 0.0
+    assert detector.stats()["listened_sec"] == pytest.approx(rows[0]["audio_sec"] + rows[1]["audio_sec"])
+
+
+class FakeInputStream:
+    active = True
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_vosk_capture_keeps_lead_in_and_drops_idle_silence():
+    pytest.importorskip("numpy")
+    # 100 ms chunks; 300 ms of silence ends the utterance.
+    mic = MicrophoneStream(16000, 1600, max_seconds=5)
+    mic.input_stream = FakeInputStream()
+    engine = namedtuple("Engine", ["microphone_stream"])(mic)
+    quiet = array("h", [0] * 1600).tobytes()
+    loud = array("h", [8000] * 1600).tobytes()
+    mic.arm()
+    for chunk in [quiet] * 5 + [loud] * 3 + [quiet] * 5:
+        mic.callback(chunk, 1600, None, None)
+
+    pcm = capture_utterance(engine, silence_sec=0.3)
+
+    assert pcm == quiet + loud * 3 + quiet * 3
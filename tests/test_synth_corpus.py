@@ -0,0 +1,70 @@
+import json
+import math
+import wave
+
+import pytest
+
+from babbly.benchmark.asr_replay import load_manifest, read_wav_pcm16
+from babbly.benchmark.synth_corpus import build_corpus, mix_noise, variant_grid
+
+
+np = pytest.importorskip("numpy")
+
+
+def tone_synthesizer(text, speed_rate, half_tone):
+    """50 ms per character at 16 kHz divided by the speed; peak 1.0."""
+    length = int(16000 * 0.05 * len(text) / speed_rate)
+    return np.sin(2 * math.pi * 440 * np.arange(length) / 16000), 16000
+
+
+def test_variant_grid_crosses_voice_settings_with_noise_beds():
+    variants = variant_grid([0.9, 1.1], [0.0], [0.5], ["white"], [10.0, 0.0])
+
+    assert len(variants) == 2 * 3
+    assert variants[0].noise is None and variants[0].tag == "s0.9-p+0-v0.5"
+    assert variants[1].tag == "s0.9-p+0-v0.5-white10db"
+    assert all(v.noise for v in variant_grid([1.0], [0.0], [0.5], ["white"], [5.0], clean=False))
+
+
+def test_mix_noise_hits_the_requested_snr():
+    rng = np.random.default_rng(0)
+    speech = np.sin(np.arange(16000) / 5.0)
+    noise = rng.standard_normal(4000)
+
+    mixed = mix_noise(speech, noise, 10.0, rng)
+
+    residual = mixed - speech
+    snr = 10 * math.log10(np.mean(speech ** 2) / np.mean(residual ** 2))
+    assert abs(snr - 10.0) < 1e-6
+
+
+def test_build_corpus_writes_a_replayable_manifest(tmp_path):
+    corpus = [
+        {"id": "scan-001", "utterance": "スキャンして", "expected_intent": "network.scan"},
+        {"id": "empty", "utterance": ""},
+    ]
+    variants = variant_grid([1.0, 2.0], [0.0], [0.5], ["white"], [20.0])
+
+    manifest = build_corpus(corpus, tmp_path, variants, synthesize=tone_synthesizer, workers=2)
+
+    assert [entry["id"] for entry in manifest] == [
+        "scan-001~s1-p+0-v0.5",
+        "scan-001~s1-p+0-v0.5-white20db",
+        "scan-001~s2-p+0-v0.5",
+        "scan-001~s2-p+0-v0.5-white20db",
+    ]
+    assert all(entry["expected_intent"] == "network.scan" for entry in manifest)
+    assert manifest[0]["duration_sec"] == pytest.approx(0.3)
+    assert manifest[2]["duration_sec"] == pytest.approx(0.15)
+
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    items = load_manifest(tmp_path / "manifest.json")
+    pcm, rate, _duration = read_wav_pcm16(items[0]["audio"])
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    assert rate == 16000 and abs(int(samples.max()) - 16383) <= 1
+
+    again = build_corpus(corpus, tmp_path / "again", variants[:2], synthesize=tone_synthesizer)
+    with wave.open(str(tmp_path / "again" / again[1]["audio"]), "rb") as first, wave.open(
+        items[1]["audio"], "rb"
+    ) as second:
+        assert first.readframes(first.getnframes()) == second.readframes(second.getnframes())
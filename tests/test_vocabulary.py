@@ -18,3 +18,26 @@ def test_azazel_pack_normalizes_product_terms():
 def test_unknown_pack_is_ignored_but_core_normalization_remains():
     aliases = build_aliases("does-not-exist")
     assert normalize_japanese("ネットワーク スキャン", aliases) == "ネットワークをスキャン"
+
+
+def test_normalizer_is_compiled_once_per_alias_set_and_shared():
+    from babbly.nlu.japanese import IntentResolver, Normalizer
+    from babbly.wake.asr_backend import ASRWakeDetector
+
+    aliases = build_aliases("core", "kali")
+    resolver = IntentResolver(aliases)
+    detector = ASRWakeDetector(asr=None, phrases="バブリー", aliases=build_aliases("core", "kali"))
+
+    assert resolver.normalizer is Normalizer.for_aliases(aliases)
+    assert detector.normalizer is resolver.normalizer
+
+
+def test_normalizer_prefers_longest_alias_and_resolves_chains():
+    from babbly.nlu.japanese import Normalizer
+
+    normalizer = Normalizer({"エッ": "x", "エッヂ": "エッジ", "エッジ": "edge", "": "ignored"})
+
+    assert normalizer("エッヂ エッ") == "edgex"
+    assert normalizer("エッヂ エッ") == normalizer.normalize("エッヂ エッ")
+    # Alias cycles terminate instead of rewriting forever.
+    assert len(Normalizer({"a": "b", "b": "a"})("ab")) == 2
@@ -0,0 +1,102 @@
+import json
+import os
+
+from babbly.asr import vosk_backend
+from babbly.asr.grammar import FUNCTION_WORDS, UNKNOWN_WORD, VoskGrammar, create_vosk_grammar
+from babbly.modules.registry import RegistryService
+from babbly.nlu.japanese import CONFIRM_YES, IntentResolver
+from babbly.nlu.tokenizer import simple_tokenize
+
+
+def _write(path, payload, mtime_ns):
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _registry(tmp_path):
+    commands = tmp_path / "commands.json"
+    targets = tmp_path / "targets.json"
+    sop = tmp_path / "sop.json"
+    _write(commands, {"1": {"ID": "a", "VoiceAlias": "テスト", "Command": "ls", "Arg_flg": 0}}, 10**9)
+    _write(targets, {"1": {"ID": "b", "VoiceAlias": "ターゲットブラボー", "IP": "192.0.2.2"}}, 10**9)
+    _write(sop, {"1": {"ID": "c", "VoiceAlias": "オペレーションチャーリー", "Info": "", "File": "opc.lst"}}, 10**9)
+    return RegistryService(str(commands), str(targets), str(sop)), targets
+
+
+def test_grammar_per_state_covers_only_what_the_state_can_use(tmp_path):
+    registry, _ = _registry(tmp_path)
+    grammar = VoskGrammar(
+        resolver=IntentResolver(),
+        registry=registry,
+        wake_phrases=["バブリー"],
+        states=("wake", "confirm", "command"),
+        segment=simple_tokenize,
+    )
+
+    wake = grammar.phrases("wake")
+    assert wake[0] == "バブリー" and wake[-1] == UNKNOWN_WORD
+    # Particles let KWS verification tell "バブリーを…" from the bare phrase.
+    assert set(FUNCTION_WORDS) <= set(wake) and "スキャン" not in wake
+    confirm = grammar.phrases("confirm")
+    assert set(CONFIRM_YES) <= set(confirm) and "スキャン" not in confirm
+    command = grammar.phrases("command")
+    for phrase in ("スキャン", "ネットワークスキャン", "ターゲットブラボー", "アルファ", "を", "はい"):
+        assert phrase in command
+    # Mixed-script terms are also offered word by word.
+    assert "再読 み 込 み" in command and "再読み込み" in command
+    assert command[-1] == UNKNOWN_WORD and len(command) == len(set(command))
+
+
+def test_grammar_rebuilds_when_a_registry_changes(tmp_path):
+    registry, targets = _registry(tmp_path)
+    grammar = VoskGrammar(resolver=IntentResolver(), registry=registry)
+    before = grammar.phrases("command")
+    assert grammar.phrases("command") is before
+    assert grammar.phrases("wake") is None
+
+    _write(targets, {"1": {"ID": "d", "VoiceAlias": "ターゲットデルタ", "IP": "192.0.2.4"}}, 2 * 10**9)
+    registry.refresh()
+
+    after = grammar.phrases("command")
+    assert "ターゲットデルタ" in after and "ターゲットブラボー" not in after
+
+
+def test_create_vosk_grammar_is_off_by_default():
+    assert create_vosk_grammar({}) is None
+
+
+def test_vosk_asr_caches_one_recognizer_per_state_and_grammar_version(tmp_path, monkeypatch):
+    created = []
+
+    def fake_recognizer(model, sample_rate, grammar=None, alternatives=0, words=False):
+        created.append((sample_rate, grammar))
+        return object()
+
+    monkeypatch.setattr(vosk_backend, "load_vosk_model", lambda path: "model")
+    monkeypatch.setattr(vosk_backend, "create_recognizer", fake_recognizer)
+    registry, targets = _registry(tmp_path)
+    asr = vosk_backend.VoskASR("model", microphone=False, grammar=VoskGrammar(resolver=IntentResolver(), registry=registry))
+
+    first = asr._recognizer_for("command", 16000)
+    assert asr._recognizer_for("command", 16000) is first
+    open_vocab = asr._recognizer_for("wake", 16000)
+    assert open_vocab is asr._recognizer_for(None, 16000) and open_vocab is not first
+    assert [grammar is None for _, grammar in created] == [False, True]
+
+    _write(targets, {"1": {"ID": "d", "VoiceAlias": "ターゲットデルタ", "IP": "192.0.2.4"}}, 2 * 10**9)
+    registry.refresh()
+    assert asr._recognizer_for("command", 16000) is not first
+    assert "ターゲットデルタ" in created[-1][1]
+
+
+def test_out_of_grammar_words_are_dropped_from_the_transcript():
+    from babbly.ja.vosk_asr_module import recognize_pcm16
+
+    class Recognizer:
+        def AcceptWaveform(self, data):
+            return False
+
+        def FinalResult(self):
+            return json.dumps({"text": "[unk] スキャン し て"})
+
+    assert recognize_pcm16(Recognizer(), b"\0\0" * 10) == "スキャンして"
@@ -0,0 +1,82 @@
+import json
+from collections import namedtuple
+
+from babbly.ja.vosk_asr_module import MicrophoneStream, get_asr_result, stream_asr_results
+
+
+Engine = namedtuple("Engine", ["microphone_stream", "recognizer"])
+
+
+class FakeInputStream:
+    def __init__(self):
+        self.active = False
+        self.starts = 0
+
+    def start(self):
+        self.active = True
+        self.starts += 1
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        pass
+
+
+class ScriptedRecognizer:
+    """Final result once the word "end" arrives; partials echo audio so far."""
+
+    def __init__(self):
+        self.heard = []
+
+    def AcceptWaveform(self, data):
+        self.heard.extend(data.decode().split())
+        return "end" in self.heard
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.heard)})
+
+    def Result(self):
+        text, self.heard = " ".join(word for word in self.heard if word != "end"), []
+        return json.dumps({"text": text})
+
+
+def _stream(preroll_ms):
+    # 100 ms chunks at 16 kHz.
+    mic = MicrophoneStream(16000, 1600, preroll_ms=preroll_ms)
+    mic.input_stream = FakeInputStream()
+    return mic
+
+
+def _feed(mic, *words):
+    for word in words:
+        mic.callback(f"{word} ".encode(), 1600, None, None)
+
+
+def test_idle_audio_is_trimmed_to_preroll_and_delivered_on_rearm():
+    mic = _stream(preroll_ms=200)
+    _feed(mic, "old", "stale", "ネット", "ワーク")
+    engine = Engine(mic, ScriptedRecognizer())
+
+    # Only the last two 100 ms chunks survive while disarmed.
+    mic.arm()
+    _feed(mic, "end")
+
+    assert get_asr_result(engine) == "ネットワーク"
+    assert mic.input_stream.starts == 1
+
+
+def test_stream_yields_changing_partials_then_final_and_keeps_device_open():
+    mic = _stream(preroll_ms=0)
+    engine = Engine(mic, ScriptedRecognizer())
+    mic.arm()
+    _feed(mic, "状況")
+    stream = stream_asr_results(engine)
+
+    assert next(stream) == ("状況", False)
+    _feed(mic, "報告")
+    assert next(stream) == ("状況報告", False)
+    _feed(mic, "end")
+    assert next(stream) == ("状況報告", True)
+    assert list(stream) == []
+    assert mic.input_stream.active is True
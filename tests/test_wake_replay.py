@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from babbly.asr.types import ASRResult
+from babbly.benchmark.asr_replay import load_manifest
+from babbly.benchmark.wake_replay import AsrGateScanner, curve_point, replay_wake, sweep_scores
+from babbly.wake.asr_backend import ASRWakeDetector
+from tools.evaluate_wake_results import evaluate
+from wav_helpers import silence, tone, write_wav
+
+
+class ScriptedASR:
+    """Recognizes an utterance by its duration: one scripted result per length."""
+
+    def __init__(self, by_duration_ms):
+        self.by_duration_ms = by_duration_ms
+
+    def transcribe_pcm16(self, pcm, sample_rate):
+        duration_ms = round(len(pcm) / 2 / sample_rate * 10) * 100
+        text, confidence = self.by_duration_ms.get(duration_ms, ("", None))
+        return ASRResult(text, confidence, "scripted")
+
+
+def test_curve_point_counts_every_negative_hit_per_hour():
+    rows = [
+        {"expected_trigger": False, "audio_sec": 1800.0, "hits": [{"score": 0.4}, {"score": 0.9}, {"score": None}]},
+        {"expected_trigger": True, "audio_sec": 2.0, "hits": [{"score": 0.6}]},
+        {"expected_trigger": True, "audio_sec": 2.0, "hits": []},
+    ]
+
+    loose, strict = sweep_scores(rows, [0.95, 0.5])
+
+    assert loose["threshold"] == 0.5
+    assert loose["false_accepts"] == 2 and loose["false_accepts_per_hour"] == 4.0
+    assert loose["false_reject_rate"] == 0.5
+    assert strict["false_accepts"] == 1 and strict["false_rejects"] == 2
+    assert curve_point(rows)["false_accepts"] == 3
+
+
+def test_asr_gate_replay_logs_hits_and_feeds_wake_evaluator(tmp_path):
+    pytest.importorskip("numpy")
+    # Long negative: chatter that happens to contain the wake phrase once.
+    write_wav(tmp_path / "neg.wav", silence(500) + tone(400) + silence(600) + tone(700) + silence(600))
+    write_wav(tmp_path / "pos.wav", silence(300) + tone(700) + silence(600))
+    manifest = tmp_path / "wake.json"
+    manifest.write_text(
+        json.dumps(
+            [
+                {"id": "neg", "audio": "neg.wav", "expected_trigger": False},
+                {"id": "pos", "audio": "pos.wav", "expected_trigger": True},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    # Utterance spans include the VAD lead-in and hangover frames.
+    asr = ScriptedASR({700: ("こんにちは", 0.9), 1000: ("バブリー", 0.7)})
+    scanner = AsrGateScanner(ASRWakeDetector(asr, "バブリー"))
+
+    rows = replay_wake(load_manifest(manifest), scanner)
+
+    assert [row["actual_trigger"] for row in rows] == [True, True]
+    neg_hits = rows[0]["hits"]
+    assert len(neg_hits) == 1 and neg_hits[0]["keyword"] == "バブリー" and neg_hits[0]["score"] == 0.7
+    assert 2.0 < neg_hits[0]["offset_sec"] < 2.5
+    summary, _rows = evaluate(
+        [{"id": "neg", "expected_trigger": False}, {"id": "pos", "expected_trigger": True}], rows
+    )
+    assert summary["false_positive"] == 1 and summary["true_positive"] == 1
+    assert sweep_scores(rows, [0.8])[0]["false_rejects"] == 1
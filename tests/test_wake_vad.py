@@ -70,3 +70,64 @@ def test_capture_parity_appends_until_hangover():
     # frames 0,1 are pre-speech silence (skipped); 2,3 speech; 4 quiet(1); 5 quiet(2)->end
     assert appended == [2, 3, 4, 5]
     assert broke_at == 5
+
+
+def _random_block(np, rng, n_frames, frame_len):
+    # Segments of silence and speech-level noise so every transition occurs.
+    levels = rng.choice([0.0, 0.005, 0.02, 0.2], size=n_frames)
+    return rng.standard_normal((n_frames, frame_len)) * levels[:, None]
+
+
+def test_vectorized_block_matches_scalar_event_sequence():
+    import pytest
+
+    np = pytest.importorskip("numpy")
+    for seed in range(25):
+        rng = np.random.default_rng(seed)
+        params = dict(
+            rms_threshold=float(rng.choice([0.004, 0.012, 0.05])),
+            start_frames=int(rng.integers(1, 4)),
+            hangover_frames=int(rng.integers(1, 6)),
+        )
+        block = _random_block(np, rng, int(rng.integers(1, 200)), int(rng.choice([0, 160, 320])))
+        scalar = EnergyVad(**params)
+        vectorized = EnergyVad(**params)
+
+        expected = [scalar.observe_frame(frame.tolist()) for frame in block]
+        split = int(rng.integers(0, len(block) + 1))
+        # An empty block between the halves must not change the state.
+        actual = (
+            vectorized.observe_block(block[:split])
+            + vectorized.observe_block(block[:0])
+            + vectorized.observe_block(block[split:])
+        )
+
+        assert actual == expected, f"seed={seed}"
+        assert vectorized.in_speech == scalar.in_speech
+
+        assert EnergyVad(**params).speech_present(block) == EnergyVad(**params).speech_present(block.tolist())
+
+
+def test_empty_block_between_loud_frames_keeps_the_onset_count():
+    import pytest
+
+    np = pytest.importorskip("numpy")
+    loud = np.full((1, 160), 0.2)
+    scalar = EnergyVad(start_frames=2)
+    vectorized = EnergyVad(start_frames=2)
+
+    expected = [scalar.observe_frame(frame.tolist()) for frame in np.concatenate([loud, loud])]
+    actual = vectorized.observe_block(loud) + vectorized.observe_block(loud[:0]) + vectorized.observe_block(loud)
+
+    assert actual == expected == [VadEvent.SILENCE, VadEvent.SPEECH_START]
+
+
+def test_rms_block_matches_scalar_rms():
+    import pytest
+
+    np = pytest.importorskip("numpy")
+    block = np.array([[0.5, -0.5, 0.5, -0.5], [0.0, 0.0, 0.0, 0.0], [0.3, 0.4, 0.0, 0.0]])
+
+    for row, value in zip(block, EnergyVad.rms_block(block)):
+        assert math.isclose(value, EnergyVad.rms(row.tolist()))
+    assert EnergyVad.rms_block(np.zeros((3, 0))).tolist() == [0.0, 0.0, 0.0]
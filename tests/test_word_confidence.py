@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from babbly.asr import vosk_backend
+from babbly.asr.types import ASRResult, ASRWord
+from babbly.ja.vosk_asr_module import merge_results
+from babbly.nlu.confidence import utterance_confidence
+from babbly.nlu.japanese import IntentResolver
+from tools.evaluate_asr_results import calibration, evaluate
+
+
+def _words(*pairs):
+    return [
+        {"word": word, "conf": conf, "start": 0.1 * index, "end": 0.1 * index + 0.1}
+        for index, (word, conf) in enumerate(pairs)
+    ]
+
+
+def test_merge_results_collects_word_confidences_across_segments():
+    payloads = [
+        {"text": "状況 を", "result": _words(("状況", 0.9), ("を", 0.4))},
+        {"text": "報告 [unk]", "result": _words(("報告", 0.8), ("[unk]", 0.2))},
+    ]
+
+    hypotheses, words = merge_results(payloads)
+
+    assert hypotheses == [("状況を報告", None)]
+    assert [(word, conf) for word, conf, _, _ in words] == [("状況", 0.9), ("を", 0.4), ("報告", 0.8)]
+    # N-best results carry timings without confidences.
+    assert merge_results([{"alternatives": [{"text": "はい", "result": [{"word": "はい"}]}]}])[1] == []
+
+
+class WordRecognizer:
+    def AcceptWaveform(self, data):
+        return False
+
+    def FinalResult(self):
+        return json.dumps({"text": "状況 を 報告", "result": _words(("状況", 0.9), ("を", 0.3), ("報告", 0.9))})
+
+
+def test_vosk_asr_reports_words_and_their_mean(monkeypatch):
+    flags = []
+
+    def fake_recognizer(model, sample_rate, grammar=None, alternatives=0, words=False):
+        flags.append(words)
+        return WordRecognizer()
+
+    monkeypatch.setattr(vosk_backend, "load_vosk_model", lambda path: "model")
+    monkeypatch.setattr(vosk_backend, "create_recognizer", fake_recognizer)
+    asr = vosk_backend.VoskASR("model", microphone=False, word_confidence=True)
+
+    result = asr.transcribe_pcm16(b"\0\0" * 100, 16000)
+
+    assert flags == [True]
+    assert [word.text for word in result.words] == ["状況", "を", "報告"]
+    assert result.confidence == pytest.approx(0.7)
+
+
+def test_intent_term_words_dominate_the_utterance_confidence():
+    resolver = IntentResolver()
+    words = (ASRWord("状況", 0.9), ASRWord("を", 0.3), ASRWord("報告", 0.9))
+    result = ASRResult("状況を報告", 0.7, "vosk", words=words)
+    intent = resolver.resolve(result.text)
+
+    weighted = utterance_confidence(result, intent, term_weight=3.0, normalize=resolver.normalizer)
+
+    assert weighted == pytest.approx((0.9 * 3 + 0.3 + 0.9 * 3) / 7)
+    assert utterance_confidence(result, intent, term_weight=1.0) == pytest.approx(0.7)
+    assert utterance_confidence(ASRResult("状況を報告", 0.5), intent) == 0.5
+
+
+def test_calibration_bins_and_expected_error():
+    table, error = calibration([(0.95, True), (0.92, False), (0.35, False)], bins=10)
+
+    assert [(row["low"], row["count"]) for row in table] == [(0.3, 1), (0.9, 2)]
+    assert table[1]["intent_accuracy"] == 0.5
+    assert error == pytest.approx((2 * abs(0.935 - 0.5) + 0.35) / 3)
+    assert calibration([]) == ([], None)
+
+
+def test_evaluator_uses_word_confidence_for_policy_and_calibration():
+    corpus = [{"id": "r", "utterance": "状況を報告", "expected_intent": "situation.report"}]
+    results = [
+        {
+            "id": "r",
+            "recognized_text": "状況を報告",
+            "confidence": 0.7,
+            "words": _words(("状況", 0.9), ("を", 0.3), ("報告", 0.9)),
+        }
+    ]
+
+    strict, rows = evaluate(corpus, results)
+    relaxed, _ = evaluate(corpus, results, read_only_execute_threshold=0.8)
+
+    assert rows[0]["asr_confidence"] == pytest.approx(0.8142857)
+    assert strict["top_clarification_rate"] == 1.0 and relaxed["top_clarification_rate"] == 0.0
+    assert strict["confidence_coverage"] == 1.0 and strict["calibration"][0]["count"] == 1
@@ -0,0 +1,25 @@
+"""Synthetic 16-bit WAV fixtures shared by the offline replay tests."""
+
+import math
+import wave
+from array import array
+
+
+RATE = 16000
+
+
+def tone(ms, rate=RATE):
+    """A 220 Hz tone loud enough to pass the energy VAD."""
+    return [int(8000 * math.sin(2 * math.pi * 220 * n / rate)) for n in range(rate * ms // 1000)]
+
+
+def silence(ms, rate=RATE):
+    return [0] * (rate * ms // 1000)
+
+
+def write_wav(path, samples, *, rate=RATE, channels=1):
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(channels)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(array("h", samples).tobytes())
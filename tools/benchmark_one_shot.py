@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+
+from babbly.benchmark.asr_replay import create_offline_asr, load_manifest
+from babbly.benchmark.one_shot import compare_one_shot, summarize_one_shot
+from babbly.benchmark.runtime import write_json_atomic
+from babbly.modules.utils import load_config
+from babbly.nlu.japanese import IntentResolver
+from babbly.nlu.vocabulary import build_aliases
+from babbly.wake.asr_backend import ASRWakeDetector
+
+
+def _spoken_seconds(text: str) -> float:
+    from babbly.ja.japanese_tts import Japanese_TTS
+
+    wave, sample_rate, _settings = Japanese_TTS().synthesize(text)
+    return len(wave) / float(sample_rate)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time one-shot wake+command utterances against the two-turn flow")
+    parser.add_argument("manifest", help='Command recordings: JSON list of {"id", "audio", "expected_intent"}')
+    parser.add_argument("--wake-audio", required=True, help="WAV of the wake phrase, same speaker and sample rate")
+    parser.add_argument("--config", default="babbly/ja/config_ja.yaml", help="Babbly configuration YAML")
+    parser.add_argument("--backend", help="Override ASR_BACKEND (vosk, faster-whisper)")
+    parser.add_argument("--ack-sec", type=float, default=1.0, help="Spoken acknowledgement duration")
+    parser.add_argument("--prompt-sec", type=float, default=1.0, help="Spoken command prompt duration")
+    parser.add_argument("--tts", action="store_true", help="Measure both durations with the local pyopenjtalk voice")
+    parser.add_argument("--output", help="Per-recording results JSON")
+    args = parser.parse_args()
+
+    config = dict(load_config(args.config) or {})
+    if args.backend:
+        config["ASR_BACKEND"] = args.backend
+    ack_sec, prompt_sec = args.ack_sec, args.prompt_sec
+    if args.tts:
+        ack_sec = _spoken_seconds("はい、ボス")
+        prompt_sec = _spoken_seconds("指示をどうぞ")
+
+    aliases = build_aliases(*config.get("DOMAIN_VOCABULARY", ["core", "kali"]))
+    phrases = config.get("WAKEUP_PHRASES")
+    if not isinstance(phrases, list) or not phrases:
+        phrases = [str(config.get("WAKEUP_PHRASE") or "")]
+    asr = create_offline_asr(config)
+    items = [item for item in load_manifest(args.manifest) if item.get("expected_intent") != "wake"]
+    rows = compare_one_shot(
+        items,
+        asr,
+        args.wake_audio,
+        gate=ASRWakeDetector(asr, phrases, aliases),
+        resolver=IntentResolver(aliases),
+        ack_sec=ack_sec,
+        prompt_sec=prompt_sec,
+        endpoint_sec=float(config.get("ASR_SILENCE_SECONDS", 0.8)),
+    )
+    if args.output:
+        write_json_atomic(args.output, rows)
+        print(f"wrote: {args.output}")
+    summary = {"ack_sec": ack_sec, "prompt_sec": prompt_sec, **summarize_one_shot(rows)}
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
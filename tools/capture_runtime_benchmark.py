@@ -28,6 +28,10 @@ def main() -> int:
         "--evaluation-json",
         help="Optional JSON object from evaluate_asr_results.py/evaluate_wake_results.py to embed",
     )
+    parser.add_argument(
+        "--stats-json",
+        help="JSON the child writes on exit (e.g. WAKE_STATS_PATH) to embed as runtime_stats",
+    )
     parser.add_argument("command", nargs=argparse.REMAINDER, help="Command after --")
     args = parser.parse_args()
 
@@ -48,6 +52,7 @@ def main() -> int:
             backend=args.backend,
             model=args.model,
             evaluation_json=args.evaluation_json,
+            stats_json=args.stats_json,
         )
         write_json_atomic(args.output, payload)
     except KeyboardInterrupt:
@@ -69,6 +74,9 @@ def main() -> int:
         print(f"peak rss: {summary['rss_bytes_peak'] / (1024 * 1024):.1f} MiB")
     if summary.get("temperature_c_peak") is not None:
         print(f"peak temperature: {summary['temperature_c_peak']:.1f} C")
+    rearm = (payload.get("runtime_stats") or {}).get("rearm") or {}
+    if rearm.get("p50_ms") is not None:
+        print(f"wake re-arm: p50={rearm['p50_ms']:.1f}ms p95={rearm['p95_ms']:.1f}ms over {rearm['count']} arms")
     return 0 if payload["status"] in {"ok", "completed_window"} else 1
 
 
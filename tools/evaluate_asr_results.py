@@ -3,24 +3,123 @@ import argparse
 import json
 from pathlib import Path
 
+from babbly.asr.types import ASRAlternative, ASRResult, ASRWord
+from babbly.core.operator_runtime import OperatorIntentRuntime
+from babbly.nlu.confidence import utterance_confidence
 from babbly.nlu.japanese import IntentResolver, normalize_japanese
+from babbly.nlu.nbest import NBestReranker, hypothesis_confidence
+from babbly.nlu.policy import Decision, IntentPolicy
 from babbly.nlu.vocabulary import build_aliases
 
+# Seconds an operator spends on one extra turn: answering a confirmation
+# prompt, or hearing the retry prompt and saying the command again.
+CONFIRM_TURN_SEC = 2.5
+REPEAT_TURN_SEC = 4.0
+CALIBRATION_BINS = 10
+
 
 def load_json(path):
     with open(path, "r", encoding="utf-8") as handle:
         return json.load(handle)
 
 
-def evaluate(corpus, results):
+def _as_asr_result(result):
+    alternatives = tuple(
+        ASRAlternative(item.get("text", ""), item.get("score")) for item in result.get("alternatives") or ()
+    )
+    words = tuple(
+        ASRWord(item.get("word", ""), float(item["conf"]), item.get("start"), item.get("end"))
+        for item in result.get("words") or ()
+        if item.get("conf") is not None
+    )
+    return ASRResult(
+        text=result.get("recognized_text", ""),
+        confidence=result.get("confidence"),
+        alternatives=alternatives,
+        words=words,
+    )
+
+
+def _turn(decision, intent_name, expected_intent):
+    """What the dialogue does next: execute, clarify, or ask for a repeat."""
+    if decision == Decision.EXECUTE:
+        return "execute"
+    if decision == Decision.CLARIFY:
+        return "clarify"
+    # Rejecting speech that was not a command is the right outcome.
+    return "execute" if expected_intent == "unknown" and intent_name == "unknown" else "repeat"
+
+
+def _task_sec(result, turn, confirm_turn_sec, repeat_turn_sec):
+    latency = result.get("latency_ms")
+    seconds = float(result.get("audio_sec") or 0.0) + (float(latency) / 1000.0 if latency is not None else 0.0)
+    if turn == "clarify":
+        seconds += confirm_turn_sec
+    elif turn == "repeat":
+        seconds += repeat_turn_sec
+    return seconds
+
+
+def calibration(pairs, bins=CALIBRATION_BINS):
+    """Reliability table of ``(confidence, correct)`` pairs and its ECE.
+
+    Each bin reports how many utterances fell in it, their mean confidence
+    and their intent accuracy. The expected calibration error is the
+    count-weighted gap between the two.
+    """
+    bins = max(1, int(bins))
+    table = []
+    gap = 0.0
+    for index in range(bins):
+        low, high = index / bins, (index + 1) / bins
+        members = [
+            (confidence, correct)
+            for confidence, correct in pairs
+            if low <= confidence < high or (index == bins - 1 and confidence == high)
+        ]
+        if not members:
+            continue
+        mean_confidence = sum(confidence for confidence, _ in members) / len(members)
+        accuracy = sum(1 for _, correct in members if correct) / len(members)
+        gap += len(members) * abs(mean_confidence - accuracy)
+        table.append(
+            {
+                "low": low,
+                "high": high,
+                "count": len(members),
+                "mean_confidence": mean_confidence,
+                "intent_accuracy": accuracy,
+            }
+        )
+    return table, (gap / len(pairs) if pairs else None)
+
+
+def evaluate(
+    corpus,
+    results,
+    *,
+    confirm_turn_sec=CONFIRM_TURN_SEC,
+    repeat_turn_sec=REPEAT_TURN_SEC,
+    read_only_execute_threshold=None,
+    calibration_bins=CALIBRATION_BINS,
+):
     aliases = build_aliases("core", "kali", "azazel")
     resolver = IntentResolver(aliases)
+    policy = IntentPolicy(
+        read_only=OperatorIntentRuntime.READ_ONLY_INTENTS,
+        read_only_execute_threshold=read_only_execute_threshold,
+    )
+    reranker = NBestReranker(resolver, read_only=OperatorIntentRuntime.READ_ONLY_INTENTS)
     by_id = {item["id"]: item for item in results}
 
     total = 0
     transcript_exact = 0
     intent_correct = 0
+    nbest_correct = 0
     false_execution = 0
+    turns = {"top": {"clarify": 0, "repeat": 0}, "nbest": {"clarify": 0, "repeat": 0}}
+    task_sec = {"top": 0.0, "nbest": 0.0}
+    calibration_pairs = []
     rows = []
 
     for expected in corpus:
@@ -43,6 +142,33 @@ def evaluate(corpus, results):
         intent_ok = actual_intent == expected["expected_intent"]
         intent_correct += int(intent_ok)
 
+        # Top hypothesis vs intent-aware N-best choice, through the policy.
+        asr_result = _as_asr_result(result)
+        confidence = None
+        if expected["expected_intent"] == "wake":
+            nbest_intent = actual_intent
+            outcomes = {"top": "execute", "nbest": "execute"}
+        else:
+            top = resolver.resolve(asr_result.text)
+            confidence = utterance_confidence(asr_result, top, normalize=resolver.normalizer)
+            if confidence is not None:
+                calibration_pairs.append((max(0.0, min(1.0, float(confidence))), intent_ok))
+            choice = reranker.rerank(asr_result)
+            nbest_intent = choice.intent.name
+            # Word confidences and the utterance score describe the top hypothesis only.
+            nbest_confidence = confidence if choice.rank == 0 else hypothesis_confidence(asr_result, choice.rank)
+            top_decision = policy.evaluate(top, confidence).decision
+            nbest_decision = reranker.gate(choice, policy.evaluate(choice.intent, nbest_confidence)).decision
+            outcomes = {
+                "top": _turn(top_decision, top.name, expected["expected_intent"]),
+                "nbest": _turn(nbest_decision, nbest_intent, expected["expected_intent"]),
+            }
+        nbest_correct += int(nbest_intent == expected["expected_intent"])
+        for key, turn in outcomes.items():
+            if turn in turns[key]:
+                turns[key][turn] += 1
+            task_sec[key] += _task_sec(result, turn, confirm_turn_sec, repeat_turn_sec)
+
         expected_nonexec = expected["expected_intent"] in {"unknown", "wake"}
         actual_exec = actual_intent not in {"unknown", "wake"}
         false_exec = expected_nonexec and actual_exec
@@ -58,11 +184,16 @@ def evaluate(corpus, results):
                 "transcript_exact": exact,
                 "intent_correct": intent_ok,
                 "false_execution": false_exec,
+                "nbest_intent": nbest_intent,
+                "top_turn": outcomes["top"],
+                "nbest_turn": outcomes["nbest"],
+                "asr_confidence": confidence,
                 "latency_ms": result.get("latency_ms"),
             }
         )
 
     denominator = max(total, 1)
+    reliability, calibration_error = calibration(calibration_pairs, calibration_bins)
     latencies = [row["latency_ms"] for row in rows if isinstance(row.get("latency_ms"), (int, float))]
     summary = {
         "evaluated": total,
@@ -70,6 +201,16 @@ def evaluate(corpus, results):
         "intent_accuracy": intent_correct / denominator,
         "false_execution_rate": false_execution / denominator,
         "mean_latency_ms": (sum(latencies) / len(latencies)) if latencies else None,
+        "nbest_intent_accuracy": nbest_correct / denominator,
+        "top_clarification_rate": turns["top"]["clarify"] / denominator,
+        "nbest_clarification_rate": turns["nbest"]["clarify"] / denominator,
+        "top_repeat_rate": turns["top"]["repeat"] / denominator,
+        "nbest_repeat_rate": turns["nbest"]["repeat"] / denominator,
+        "top_mean_task_sec": task_sec["top"] / denominator,
+        "nbest_mean_task_sec": task_sec["nbest"] / denominator,
+        "confidence_coverage": len(calibration_pairs) / denominator,
+        "expected_calibration_error": calibration_error,
+        "calibration": reliability,
     }
     return summary, rows
 
@@ -83,9 +224,39 @@ def main():
         help="Expected utterance corpus JSON",
     )
     parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    parser.add_argument(
+        "--confirm-turn-sec",
+        type=float,
+        default=CONFIRM_TURN_SEC,
+        help="Seconds a confirmation turn adds to the estimated task time",
+    )
+    parser.add_argument(
+        "--repeat-turn-sec",
+        type=float,
+        default=REPEAT_TURN_SEC,
+        help="Seconds a repeated command adds to the estimated task time",
+    )
+    parser.add_argument(
+        "--read-only-execute-threshold",
+        type=float,
+        help="Score at which read-only intents execute when the ASR reports a confidence",
+    )
+    parser.add_argument(
+        "--calibration-bins",
+        type=int,
+        default=CALIBRATION_BINS,
+        help="Equal-width confidence bins of the calibration table",
+    )
     args = parser.parse_args()
 
-    summary, rows = evaluate(load_json(args.corpus), load_json(args.results))
+    summary, rows = evaluate(
+        load_json(args.corpus),
+        load_json(args.results),
+        confirm_turn_sec=args.confirm_turn_sec,
+        repeat_turn_sec=args.repeat_turn_sec,
+        read_only_execute_threshold=args.read_only_execute_threshold,
+        calibration_bins=args.calibration_bins,
+    )
     if args.json:
         print(json.dumps({"summary": summary, "rows": rows}, ensure_ascii=False, indent=2))
         return
@@ -96,6 +267,26 @@ def main():
     print(f"false execution rate: {summary['false_execution_rate']:.3f}")
     if summary["mean_latency_ms"] is not None:
         print(f"mean latency ms: {summary['mean_latency_ms']:.1f}")
+    print(f"N-best intent accuracy: {summary['nbest_intent_accuracy']:.3f}")
+    print(
+        f"clarification rate top/N-best: {summary['top_clarification_rate']:.3f}"
+        f" / {summary['nbest_clarification_rate']:.3f}"
+    )
+    print(f"repeat rate top/N-best: {summary['top_repeat_rate']:.3f} / {summary['nbest_repeat_rate']:.3f}")
+    print(
+        f"mean task sec top/N-best: {summary['top_mean_task_sec']:.2f}"
+        f" / {summary['nbest_mean_task_sec']:.2f}"
+    )
+    if summary["expected_calibration_error"] is not None:
+        print(
+            f"confidence coverage: {summary['confidence_coverage']:.3f}"
+            f" expected calibration error: {summary['expected_calibration_error']:.3f}"
+        )
+        for row in summary["calibration"]:
+            print(
+                f"  [{row['low']:.1f}, {row['high']:.1f}) n={row['count']}"
+                f" confidence={row['mean_confidence']:.3f} accuracy={row['intent_accuracy']:.3f}"
+            )
     for row in rows:
         if row.get("status") == "missing" or not row.get("intent_correct", True):
             print(json.dumps(row, ensure_ascii=False))
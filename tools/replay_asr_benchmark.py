@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+
+from babbly.benchmark.asr_replay import load_manifest, replay, summarize
+from babbly.benchmark.runtime import write_json_atomic
+from babbly.modules.utils import load_config
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded WAV files through a Babbly ASR backend")
+    parser.add_argument("manifest", help='JSON list of {"id": ..., "audio": "file.wav"} entries')
+    parser.add_argument("--config", default="babbly/ja/config_ja.yaml", help="Babbly configuration YAML")
+    parser.add_argument("--backend", help="Override ASR_BACKEND (vosk, faster-whisper)")
+    parser.add_argument("--model", help="Override MODEL_PATH (vosk) or WHISPER_MODEL (faster-whisper)")
+    parser.add_argument("--state", help="Decode as this dialogue state (wake, confirm, command)")
+    parser.add_argument(
+        "--grammar",
+        choices=("on", "off"),
+        help="Override VOSK_GRAMMAR; run both to compare open and grammar decoding",
+    )
+    parser.add_argument("--alternatives", type=int, help="Override ASR_ALTERNATIVES (N-best hypotheses per command)")
+    parser.add_argument(
+        "--word-confidence",
+        action="store_true",
+        help="Set VOSK_WORD_CONFIDENCE so rows carry word confidences for calibration",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes; 0 runs in-process")
+    parser.add_argument("--device", help="Device label recorded in every row (default: hostname)")
+    parser.add_argument("--output", help="Results JSON for tools/evaluate_asr_results.py")
+    args = parser.parse_args()
+
+    config = dict(load_config(args.config) or {})
+    if args.backend:
+        config["ASR_BACKEND"] = args.backend
+    if args.model:
+        backend = str(config.get("ASR_BACKEND", "vosk")).strip().lower()
+        config["WHISPER_MODEL" if backend in {"faster-whisper", "whisper"} else "MODEL_PATH"] = args.model
+    if args.grammar:
+        config["VOSK_GRAMMAR"] = args.grammar == "on"
+    if args.alternatives:
+        config["ASR_ALTERNATIVES"] = args.alternatives
+    if args.word_confidence:
+        config["VOSK_WORD_CONFIDENCE"] = True
+    # A grammar only applies to dialogue states, so default to command mode.
+    state = args.state or ("command" if config.get("VOSK_GRAMMAR") else None)
+
+    rows = replay(load_manifest(args.manifest), config, workers=args.workers, device=args.device, state=state)
+    if args.output:
+        write_json_atomic(args.output, rows)
+        print(f"wrote: {args.output}")
+    print(json.dumps(summarize(rows), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
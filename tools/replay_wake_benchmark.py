@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+
+from babbly.benchmark.asr_replay import load_manifest
+from babbly.benchmark.runtime import write_json_atomic
+from babbly.benchmark.wake_replay import (
+    AsrGateScanner,
+    KwsScanner,
+    StagedGateScanner,
+    replay_wake,
+    stage_rates,
+    sweep_replays,
+    sweep_scores,
+)
+from babbly.modules.utils import load_config
+from babbly.nlu.vocabulary import build_aliases
+from babbly.wake import create_wake_detector
+from babbly.wake.staged import StagedWakeDetector
+
+
+def _thresholds(text: str) -> list[float]:
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay WAV recordings through a Babbly wake detector")
+    parser.add_argument("manifest", help='JSON list of {"id", "audio", "expected_trigger"} entries')
+    parser.add_argument("--config", default="babbly/ja/config_ja.yaml", help="Babbly configuration YAML")
+    parser.add_argument("--backend", help="Override WAKE_BACKEND (asr, sherpa-onnx)")
+    parser.add_argument("--staged", action="store_true", help="Use the staged ASR gate (WAKE_STAGED)")
+    parser.add_argument("--verify", action="store_true", help="Verify KWS hits with the ASR (KWS_VERIFY)")
+    parser.add_argument("--thresholds", type=_thresholds, default=[], help="Comma-separated thresholds to sweep")
+    parser.add_argument("--output", help="Per-recording results for tools/evaluate_wake_results.py")
+    parser.add_argument("--curve", help="Destination JSON for the FA/hour vs FRR sweep")
+    args = parser.parse_args()
+
+    config = dict(load_config(args.config) or {})
+    if args.backend:
+        config["WAKE_BACKEND"] = args.backend
+    if args.staged:
+        config["WAKE_STAGED"] = True
+    if args.verify:
+        config["KWS_VERIFY"] = True
+    backend = str(config.get("WAKE_BACKEND", "asr")).strip().lower()
+    items = load_manifest(args.manifest)
+    extra = {}
+
+    if backend in {"asr", "legacy"}:
+        from babbly.asr import create_asr
+
+        aliases = build_aliases(*config.get("DOMAIN_VOCABULARY", ["core", "kali"]))
+        detector = create_wake_detector(config, create_asr(config, offline=True), aliases, offline=True)
+        if isinstance(detector, StagedWakeDetector):
+            rows = replay_wake(items, StagedGateScanner(detector))
+            extra = {"stages": stage_rates(rows), "stats": detector.stats()}
+        else:
+            rows = replay_wake(items, AsrGateScanner(detector))
+        curve = sweep_scores(rows, args.thresholds)
+    else:
+        verify_asr = aliases = None
+        if bool(config.get("KWS_VERIFY", False)):
+            from babbly.asr import create_asr
+
+            # Hits are verified on the audio around them, as live.
+            verify_asr = create_asr(config, offline=True)
+            aliases = build_aliases(*config.get("DOMAIN_VOCABULARY", ["core", "kali"]))
+
+        def scanner_for(threshold: float | None) -> KwsScanner:
+            tuned = dict(config)
+            if threshold is not None:
+                tuned["KWS_KEYWORDS_THRESHOLD"] = threshold
+            return KwsScanner(create_wake_detector(tuned, verify_asr, aliases, offline=True))
+
+        rows = replay_wake(items, scanner_for(None))
+        curve = sweep_replays(items, scanner_for, args.thresholds)
+
+    if args.output:
+        write_json_atomic(args.output, rows)
+        print(f"wrote: {args.output}")
+    if args.curve:
+        write_json_atomic(args.curve, {"backend": backend, "points": curve, **extra})
+        print(f"wrote: {args.curve}")
+    print(json.dumps(curve, ensure_ascii=False, indent=2))
+    if extra:
+        print(json.dumps(extra["stages"], ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+
+from babbly.benchmark import micro
+from babbly.benchmark.runtime import machine_info, write_json_atomic
+
+
+def _sizes(text: str) -> list[int]:
+    return [int(value) for value in text.split(",") if value.strip()]
+
+
+def _names(text: str) -> list[str]:
+    return [value.strip() for value in text.split(",") if value.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run Babbly in-process microbenchmarks")
+    parser.add_argument("--output", help="Optional destination JSON path")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per measurement")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    snapshot = sub.add_parser("snapshot", help="SituationSnapshot assembly scaling")
+    snapshot.add_argument("--sizes", type=_sizes, default=[100, 1000, 10000])
+
+    resolver = sub.add_parser("resolver", help="IntentResolver throughput with many rules")
+    resolver.add_argument("--rules", type=int, default=1000)
+    resolver.add_argument("--corpus", default="benchmarks/ja_command_corpus.json")
+
+    tokenizer = sub.add_parser("tokenizer", help="Tokenizer cold and warm latency")
+    tokenizer.add_argument("--backends", type=_names, default=["janome", "simple"])
+    tokenizer.add_argument("--corpus", default="benchmarks/ja_command_corpus.json")
+
+    vad = sub.add_parser("vad", help="EnergyVad scalar vs NumPy block frames per second")
+    vad.add_argument("--frames", type=int, default=2000)
+    vad.add_argument("--frame-ms", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.benchmark == "snapshot":
+        result = micro.snapshot_scaling(args.sizes, repeat=args.repeat)
+    elif args.benchmark == "resolver":
+        result = micro.resolver_throughput(args.rules, repeat=args.repeat, corpus_path=args.corpus)
+    elif args.benchmark == "tokenizer":
+        result = micro.tokenizer_latency(args.backends, repeat=args.repeat, corpus_path=args.corpus)
+    elif args.benchmark == "vad":
+        result = micro.vad_throughput(args.frames, frame_ms=args.frame_ms, repeat=args.repeat)
+    else:  # pragma: no cover - argparse enforces the choices
+        parser.error(f"unknown benchmark {args.benchmark}")
+
+    result["machine"] = machine_info()
+    if args.output:
+        write_json_atomic(args.output, result)
+        print(f"wrote: {args.output}")
+    print(json.dumps({key: result[key] for key in ("benchmark", "rows", "summary")}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from babbly.benchmark.runtime import write_json_atomic
+from babbly.benchmark.synth_corpus import build_corpus, variant_grid
+
+
+def _floats(text: str) -> list[float]:
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Synthesize a WAV corpus from Babbly text corpora with pyopenjtalk")
+    parser.add_argument("corpus", nargs="+", help="Text corpus JSON (e.g. benchmarks/ja_command_corpus.json)")
+    parser.add_argument("--output-dir", required=True, help="Directory for the WAV files and manifest.json")
+    parser.add_argument("--speeds", type=_floats, default=[0.9, 1.0, 1.2])
+    parser.add_argument("--half-tones", type=_floats, default=[-2.0, 0.0, 2.0], help="Pitch shifts in semitones")
+    parser.add_argument("--volumes", type=_floats, default=[0.3, 0.8])
+    parser.add_argument(
+        "--noise",
+        action="append",
+        default=[],
+        help='Noise WAV to mix in, or "white"; repeat for several beds',
+    )
+    parser.add_argument("--snrs", type=_floats, default=[20.0, 10.0, 5.0], help="SNRs in dB for each noise bed")
+    parser.add_argument("--no-clean", action="store_true", help="Only write noisy variants")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes; 0 runs in-process")
+    args = parser.parse_args()
+
+    corpus = []
+    for path in args.corpus:
+        corpus.extend(json.loads(Path(path).read_text(encoding="utf-8")))
+    variants = variant_grid(
+        args.speeds, args.half_tones, args.volumes, args.noise, args.snrs, clean=not args.no_clean
+    )
+    manifest = build_corpus(
+        corpus,
+        args.output_dir,
+        variants,
+        workers=args.workers,
+        sample_rate=args.sample_rate,
+        seed=args.seed,
+    )
+    destination = Path(args.output_dir) / "manifest.json"
+    write_json_atomic(destination, manifest)
+    hours = sum(entry["duration_sec"] for entry in manifest) / 3600.0
+    print(f"wrote: {destination} ({len(manifest)} clips, {hours:.2f} h)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())